@@ -19,6 +19,106 @@ LLM_MODEL: str | None = (os.getenv("LLM_MODEL") or None)
 OPENAI_API_KEY: str | None = os.getenv("OPENAI_API_KEY")
 OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
 
+# Opt-in response cache for /llm/generate.
+LLM_CACHE_ENABLED: bool = os.getenv(
+    "LLM_CACHE_ENABLED", "false"
+).lower() in {"1", "true", "yes"}
+LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+LLM_CACHE_TTL_SECONDS: float = float(os.getenv("LLM_CACHE_TTL_SECONDS", "300"))
+# Treat prompts differing only in whitespace/casing as the same key.
+LLM_CACHE_NORMALIZE: bool = os.getenv(
+    "LLM_CACHE_NORMALIZE", "false"
+).lower() in {"1", "true", "yes"}
+# Optional JSON file to persist the cache across restarts.
+LLM_CACHE_PATH: str | None = os.getenv("LLM_CACHE_PATH") or None
+
+# Coalesce concurrent identical LLM calls into one upstream request.
+LLM_SINGLE_FLIGHT_ENABLED: bool = os.getenv(
+    "LLM_SINGLE_FLIGHT_ENABLED", "true"
+).lower() in {"1", "true", "yes"}
+
+# Per-provider admission control for upstream LLM calls.
+LLM_MAX_IN_FLIGHT: int = int(os.getenv("LLM_MAX_IN_FLIGHT", "32"))
+# Callers beyond this many waiting are rejected with 503.
+LLM_MAX_QUEUE: int = int(os.getenv("LLM_MAX_QUEUE", "128"))
+
+# Micro-batch concurrent /llm/generate calls for providers with a batch API.
+LLM_BATCH_ENABLED: bool = os.getenv(
+    "LLM_BATCH_ENABLED", "false"
+).lower() in {"1", "true", "yes"}
+LLM_BATCH_MAX_SIZE: int = int(os.getenv("LLM_BATCH_MAX_SIZE", "8"))
+LLM_BATCH_MAX_WAIT_MS: float = float(os.getenv("LLM_BATCH_MAX_WAIT_MS", "10"))
+
+# /llm/stream: tokens buffered per response before the provider is paused,
+# and how tokens are coalesced into SSE frames.
+LLM_STREAM_QUEUE_SIZE: int = int(os.getenv("LLM_STREAM_QUEUE_SIZE", "64"))
+LLM_STREAM_FRAME_MAX_CHARS: int = int(os.getenv("LLM_STREAM_FRAME_MAX_CHARS", "256"))
+LLM_STREAM_FRAME_MAX_DELAY_MS: float = float(os.getenv("LLM_STREAM_FRAME_MAX_DELAY_MS", "25"))
+LLM_STREAM_HEARTBEAT_SECONDS: float = float(os.getenv("LLM_STREAM_HEARTBEAT_SECONDS", "15"))
+
+# Retries for transient upstream LLM errors (full-jitter exponential backoff).
+LLM_RETRY_MAX_ATTEMPTS: int = int(os.getenv("LLM_RETRY_MAX_ATTEMPTS", "3"))
+LLM_RETRY_BASE_DELAY: float = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.25"))
+LLM_RETRY_MAX_DELAY: float = float(os.getenv("LLM_RETRY_MAX_DELAY", "4.0"))
+# Open the circuit after this many consecutive upstream failures.
+LLM_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+LLM_BREAKER_RESET_SECONDS: float = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+# Send a second request when a call runs past the recent p95 latency.
+LLM_HEDGE_ENABLED: bool = os.getenv(
+    "LLM_HEDGE_ENABLED", "false"
+).lower() in {"1", "true", "yes"}
+LLM_HEDGE_MIN_SAMPLES: int = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+
+# LLM_PROVIDER=router: comma-separated backends, each "provider" or "provider@base_url",
+# e.g. "openai@https://eu.example.com/v1,openai@https://us.example.com/v1".
+LLM_ROUTES: str = os.getenv("LLM_ROUTES", "").strip()
+# Last-resort backends, tried only when every route above has failed.
+LLM_ROUTES_FALLBACK: str = os.getenv("LLM_ROUTES_FALLBACK", "dummy").strip()
+LLM_ROUTER_EWMA_ALPHA: float = float(os.getenv("LLM_ROUTER_EWMA_ALPHA", "0.3"))
+# Routes above this error rate are skipped until they cool down.
+LLM_ROUTER_MAX_ERROR_RATE: float = float(os.getenv("LLM_ROUTER_MAX_ERROR_RATE", "0.5"))
+LLM_ROUTER_COOLDOWN_SECONDS: float = float(os.getenv("LLM_ROUTER_COOLDOWN_SECONDS", "10"))
+
+# LLM_PROVIDER=offline: local model server.
+# "openai" (OpenAI-compatible server), "llamacpp" (native llama.cpp API) or "stub" (no server).
+OFFLINE_LLM_BACKEND: str = os.getenv("OFFLINE_LLM_BACKEND", "openai").strip() or "openai"
+OFFLINE_LLM_BASE_URL: str = os.getenv("OFFLINE_LLM_BASE_URL", "http://127.0.0.1:8080/v1")
+OFFLINE_LLM_MODEL: str = os.getenv("OFFLINE_LLM_MODEL", "local").strip() or "local"
+OFFLINE_LLM_API_KEY: str | None = os.getenv("OFFLINE_LLM_API_KEY") or None
+# Concurrent requests sent to the local process (match its slot count).
+OFFLINE_LLM_PARALLEL: int = int(os.getenv("OFFLINE_LLM_PARALLEL", "4"))
+OFFLINE_LLM_TIMEOUT: float = float(os.getenv("OFFLINE_LLM_TIMEOUT", "120"))
+OFFLINE_LLM_MAX_TOKENS: int = int(os.getenv("OFFLINE_LLM_MAX_TOKENS", "512"))
+
+# Shared upstream HTTP client pool (used by OpenAI-compatible providers).
+HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+
+# HTTP/2 requires the optional `h2` package (pip install "httpx[http2]").
+HTTP2_ENABLED: bool = os.getenv(
+    "HTTP2_ENABLED", "false"
+).lower() in {"1", "true", "yes"}
+
+# Session store: "memory" (per-process) or "sql" (shared via DATABASE_URL).
+SESSION_BACKEND: str = os.getenv("SESSION_BACKEND", "memory").strip() or "memory"
+
+# Session store limits.
+SESSION_MAX_SESSIONS: int = int(os.getenv("SESSION_MAX_SESSIONS", "10000"))
+SESSION_IDLE_TTL_SECONDS: float = float(os.getenv("SESSION_IDLE_TTL_SECONDS", "3600"))
+SESSION_MAX_MESSAGES: int = int(os.getenv("SESSION_MAX_MESSAGES", "200"))
+SESSION_SWEEP_INTERVAL_SECONDS: float = float(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", "60"))
+# Keep system messages when trimming a session down to SESSION_MAX_MESSAGES.
+SESSION_KEEP_SYSTEM_MESSAGES: bool = os.getenv(
+    "SESSION_KEEP_SYSTEM_MESSAGES", "true"
+).lower() in {"1", "true", "yes"}
+
+# Conversation history sent to the LLM: newest messages that fit the token budget.
+PROMPT_HISTORY_TOKEN_BUDGET: int = int(os.getenv("PROMPT_HISTORY_TOKEN_BUDGET", "1024"))
+PROMPT_HISTORY_MAX_MESSAGES: int = int(os.getenv("PROMPT_HISTORY_MAX_MESSAGES", "50"))
+# "heuristic" (~4 chars/token) or "tiktoken" (requires the tiktoken package).
+PROMPT_TOKEN_ESTIMATOR: str = os.getenv("PROMPT_TOKEN_ESTIMATOR", "heuristic").strip() or "heuristic"
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("Invalid database connection string")
@@ -52,6 +152,47 @@ ENABLE_VOICE_STREAM_WS: bool = os.getenv(
 MICROSOFT_VOICE_LIVE_TTS_URL: str | None = os.getenv("MICROSOFT_VOICE_LIVE_TTS_URL")
 MICROSOFT_VOICE_LIVE_STT_URL: str | None = os.getenv("MICROSOFT_VOICE_LIVE_STT_URL")
 
+# Per-operation timeouts (seconds) for Microsoft speech calls over the pooled "speech" client.
+SPEECH_STT_TIMEOUT: float = float(os.getenv("SPEECH_STT_TIMEOUT", "15"))
+SPEECH_TTS_TIMEOUT: float = float(os.getenv("SPEECH_TTS_TIMEOUT", "15"))
+SPEECH_VOICES_TIMEOUT: float = float(os.getenv("SPEECH_VOICES_TIMEOUT", "10"))
+SPEECH_HEALTH_TIMEOUT: float = float(os.getenv("SPEECH_HEALTH_TIMEOUT", "5"))
+
+# Multi-worker metrics: each worker writes snapshots here and /metrics merges them.
+METRICS_MULTIPROC_DIR: str | None = os.getenv("METRICS_MULTIPROC_DIR") or None
+METRICS_FLUSH_SECONDS: float = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+
+# Per-stage request tracing: Server-Timing header, optional OTLP/JSON export
+# to a file (one request per line) and/or a collector's /v1/traces endpoint.
+TRACING_ENABLED: bool = os.getenv(
+    "TRACING_ENABLED", "true"
+).lower() in {"1", "true", "yes"}
+TRACE_SERVICE_NAME: str = os.getenv("TRACE_SERVICE_NAME", "bot-backend")
+TRACE_EXPORT_FILE: str | None = os.getenv("TRACE_EXPORT_FILE") or None
+TRACE_EXPORT_URL: str | None = os.getenv("TRACE_EXPORT_URL") or None
+# Requests slower than this are logged with their stage breakdown; 0 disables.
+TRACE_SLOW_MS: float = float(os.getenv("TRACE_SLOW_MS", "1000"))
+
+# Background dependency probes served by /status and /voice/health.
+HEALTH_CHECK_INTERVAL_SECONDS: float = float(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", "15"))
+HEALTH_CHECK_TIMEOUT_SECONDS: float = float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "5"))
+
+# Voice list cache for /voice/voices; older lists are served while refreshing.
+VOICE_CATALOG_TTL_SECONDS: float = float(os.getenv("VOICE_CATALOG_TTL_SECONDS", "3600"))
+
 USE_MICROSOFT_VOICE_LIVE: bool = os.getenv(
     "USE_MICROSOFT_VOICE_LIVE", "false"
 ).lower() in {"1", "true", "yes"}
+
+# Sentence-chunked TTS for streamed replies: synthesis calls in flight per response.
+TTS_PIPELINE_CONCURRENCY: int = int(os.getenv("TTS_PIPELINE_CONCURRENCY", "3"))
+
+# TTS audio cache in front of synthesize_text (memory tier, optional disk tier).
+TTS_CACHE_ENABLED: bool = os.getenv(
+    "TTS_CACHE_ENABLED", "false"
+).lower() in {"1", "true", "yes"}
+TTS_CACHE_MEMORY_MAX_BYTES: int = int(os.getenv("TTS_CACHE_MEMORY_MAX_BYTES", str(32 * 1024 * 1024)))
+TTS_CACHE_DIR: str | None = os.getenv("TTS_CACHE_DIR") or None
+TTS_CACHE_DISK_MAX_BYTES: int = int(os.getenv("TTS_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+# Optional text file of phrases (one per line) synthesized into the cache at startup.
+TTS_CACHE_PREWARM_FILE: str | None = os.getenv("TTS_CACHE_PREWARM_FILE") or None
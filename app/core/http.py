@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import importlib.util
+from typing import Any
+
+import httpx
+
+from app.core import config
+
+
+def http2_available() -> bool:
+    """Return True if the optional `h2` package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class HTTPClientPool:
+    """Process-wide registry of long-lived, pooled httpx clients.
+
+    Clients are created lazily on first use and closed at app shutdown, so
+    every upstream call reuses warm keep-alive connections instead of paying
+    TCP + TLS setup per request.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        http2: bool,
+    ) -> None:
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2 and http2_available()
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._requests: dict[str, int] = {}
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """Return the shared client for `name`, creating it if needed."""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create(name)
+            self._clients[name] = client
+        return client
+
+    def _create(self, name: str) -> httpx.AsyncClient:
+        self._requests.setdefault(name, 0)
+
+        async def count_request(_request: httpx.Request) -> None:
+            self._requests[name] += 1
+
+        return httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            # Per-operation timeouts are passed on each request.
+            timeout=30.0,
+            event_hooks={"request": [count_request]},
+        )
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return per-client pool statistics for metrics export."""
+        out: dict[str, dict[str, Any]] = {}
+        for name, client in self._clients.items():
+            # httpx does not expose pool state publicly; read httpcore's pool best-effort.
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            connections = list(getattr(pool, "connections", []) or [])
+            idle = sum(1 for c in connections if c.is_idle())
+            out[name] = {
+                "connections": len(connections),
+                "idle_connections": idle,
+                "active_connections": len(connections) - idle,
+                "requests_total": self._requests.get(name, 0),
+                "max_connections": self.max_connections,
+            }
+        return out
+
+
+http_clients = HTTPClientPool(
+    max_connections=config.HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY,
+    http2=config.HTTP2_ENABLED,
+)
@@ -0,0 +1,401 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import operator
+import os
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from app.core import config
+from app.core.tracing import CLIENT, tracer
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the default latency histogram buckets.
+LATENCY_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Upper bounds (bytes) of the response size histogram buckets.
+BYTES_BUCKETS: tuple[float, ...] = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+Labels = tuple[str, ...]
+
+# How gauge values of live workers are combined when merging snapshots.
+_GAUGE_MERGE: dict[str, Callable[[float, float], float]] = {"sum": operator.add, "max": max, "min": min}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: tuple[str, ...], values: Labels, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.values: dict[Labels, Any] = {}
+
+    def replace(self, values: dict[Labels, Any]) -> None:
+        """Swap in every series at once (collectors mirroring component state)."""
+        self.values = dict(values)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    """Gauge; across worker processes, values of live workers are combined by `merge`.
+
+    `merge` is "sum" (e.g. connections, queue depth), "max" or "min" (e.g.
+    per-worker state such as an open circuit or a failed probe).
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), merge: str = "sum") -> None:
+        if merge not in _GAUGE_MERGE:
+            raise ValueError(f"Unsupported gauge merge: {merge}")
+        super().__init__(name, help, labelnames)
+        self.merge = merge
+
+    def set(self, labels: Labels, value: float) -> None:
+        self.values[labels] = value
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dec(self, labels: Labels = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = buckets
+
+    def observe(self, labels: Labels, value: float) -> None:
+        # Per-bucket (non-cumulative) counts, then sum; the last slot is +Inf.
+        state = self.values.get(labels)
+        if state is None:
+            state = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+
+class MetricsRegistry:
+    """Process-local metrics with Prometheus text rendering.
+
+    Updates are plain dict/int operations on the event loop thread, so no
+    locks are taken on the hot path. With `multiproc_dir` set (multi-worker
+    uvicorn), each worker periodically writes a JSON snapshot there and
+    /metrics merges all snapshots: counters and histograms are summed over
+    every worker that ever wrote one, gauges over live workers only.
+
+    Collectors (`add_collector`) copy state kept by other components into
+    metrics right before each snapshot or render.
+    """
+
+    def __init__(self, *, multiproc_dir: str | None = None, flush_seconds: float = 5.0) -> None:
+        self.metrics: dict[str, _Metric] = {}
+        self.collectors: list[Callable[[], None]] = []
+        self.multiproc_dir = Path(multiproc_dir) if multiproc_dir else None
+        self.flush_seconds = flush_seconds
+        self._flusher: asyncio.Task | None = None
+
+    def _register(self, metric: _Metric) -> Any:
+        existing = self.metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: tuple[str, ...] = (), merge: str = "sum") -> Gauge:
+        return self._register(Gauge(name, help, labelnames, merge))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def add_collector(self, fn: Callable[[], None]) -> None:
+        self.collectors.append(fn)
+
+    def collect(self) -> None:
+        """Run every collector; one failing does not stop the others."""
+        for fn in self.collectors:
+            try:
+                fn()
+            except Exception:
+                logger.exception("Metrics collector %s failed", getattr(fn, "__name__", fn))
+
+    def snapshot(self) -> dict[str, list[list[Any]]]:
+        return {
+            name: [[list(labels), value] for labels, value in metric.values.items()]
+            for name, metric in self.metrics.items()
+        }
+
+    def render(self) -> str:
+        values = self._collect()
+        lines: list[str] = []
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.help}\n")
+            lines.append(f"# TYPE {name} {metric.kind}\n")
+            for labels, value in values.get(name, {}).items():
+                if metric.kind != "histogram":
+                    lines.append(f"{name}{_label_str(metric.labelnames, labels)} {_fmt(value)}\n")
+                    continue
+                cumulative = 0
+                for bound, count in zip((*metric.buckets, float("inf")), value):
+                    cumulative += count
+                    le = _label_str(metric.labelnames, labels, f'le="{_fmt(bound)}"')
+                    lines.append(f"{name}_bucket{le} {cumulative}\n")
+                label_str = _label_str(metric.labelnames, labels)
+                lines.append(f"{name}_sum{label_str} {_fmt(value[-1])}\n")
+                lines.append(f"{name}_count{label_str} {cumulative}\n")
+        return "".join(lines)
+
+    def _collect(self) -> dict[str, dict[Labels, Any]]:
+        if self.multiproc_dir is None:
+            self.collect()
+            return {name: dict(metric.values) for name, metric in self.metrics.items()}
+
+        self.write_snapshot()
+        merged: dict[str, dict[Labels, Any]] = {name: {} for name in self.metrics}
+        for path in self.multiproc_dir.glob("*.json"):
+            try:
+                pid = int(path.stem)
+                snapshot = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            alive = _pid_alive(pid)
+            for name, entries in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None or (metric.kind == "gauge" and not alive):
+                    continue
+                out = merged[name]
+                combine = _GAUGE_MERGE[metric.merge] if metric.kind == "gauge" else operator.add
+                for labels, value in entries:
+                    key = tuple(labels)
+                    prev = out.get(key)
+                    if prev is None:
+                        out[key] = value
+                    elif metric.kind == "histogram":
+                        out[key] = [a + b for a, b in zip(prev, value)]
+                    else:
+                        out[key] = combine(prev, value)
+        return merged
+
+    def write_snapshot(self) -> None:
+        if self.multiproc_dir is None:
+            return
+        self.collect()
+        self.multiproc_dir.mkdir(parents=True, exist_ok=True)
+        path = self.multiproc_dir / f"{os.getpid()}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.snapshot()), encoding="utf-8")
+        os.replace(tmp, path)
+
+    async def startup(self) -> None:
+        if self.multiproc_dir is not None and (self._flusher is None or self._flusher.done()):
+            self._flusher = asyncio.create_task(self._run_flusher())
+
+    async def aclose(self) -> None:
+        task, self._flusher = self._flusher, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        self.write_snapshot()
+
+    async def _run_flusher(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                self.write_snapshot()
+            except OSError:
+                logger.exception("Failed to write metrics snapshot")
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+registry = MetricsRegistry(
+    multiproc_dir=config.METRICS_MULTIPROC_DIR,
+    flush_seconds=config.METRICS_FLUSH_SECONDS,
+)
+
+http_requests = registry.counter(
+    "bot_backend_http_requests_served_total",
+    "HTTP requests served by method, route template and status",
+    ("method", "route", "status"),
+)
+http_latency = registry.histogram(
+    "bot_backend_http_request_duration_seconds",
+    "HTTP request duration until the response body completed",
+    ("method", "route"),
+)
+http_response_bytes = registry.histogram(
+    "bot_backend_http_response_size_bytes",
+    "HTTP response body size",
+    ("method", "route"),
+    buckets=BYTES_BUCKETS,
+)
+http_in_flight = registry.gauge(
+    "bot_backend_http_requests_in_flight",
+    "HTTP requests currently being served",
+)
+upstream_latency = registry.histogram(
+    "bot_backend_upstream_request_seconds",
+    "Upstream LLM/STT/TTS call duration",
+    ("service", "provider", "operation"),
+)
+upstream_errors = registry.counter(
+    "bot_backend_upstream_errors_total",
+    "Upstream LLM/STT/TTS calls that raised",
+    ("service", "provider", "operation"),
+)
+stream_tokens = registry.counter(
+    "bot_backend_stream_tokens_total",
+    "Tokens relayed to streaming responses (use rate() for throughput)",
+)
+stream_chars = registry.counter(
+    "bot_backend_stream_chars_total",
+    "Characters relayed to streaming responses",
+)
+ws_sessions_active = registry.gauge(
+    "bot_backend_websocket_sessions_active",
+    "Open WebSocket sessions by endpoint",
+    ("endpoint",),
+)
+ws_sessions = registry.counter(
+    "bot_backend_websocket_sessions_total",
+    "WebSocket sessions accepted by endpoint",
+    ("endpoint",),
+)
+
+
+@contextlib.contextmanager
+def observe_upstream(service: str, provider: str, operation: str) -> Iterator[None]:
+    """Record the duration (and failure) of one upstream call, as a metric and a span."""
+
+    labels = (service, provider, operation)
+    start = time.perf_counter()
+    try:
+        with tracer.span(f"{service}.{operation}", kind=CLIENT, provider=provider):
+            yield
+    except BaseException as exc:
+        # Cancellation (e.g. a client disconnect) is not an upstream error.
+        if not isinstance(exc, asyncio.CancelledError):
+            upstream_errors.inc(labels)
+        raise
+    finally:
+        upstream_latency.observe(labels, time.perf_counter() - start)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route HTTP request metrics.
+
+    Routes are labelled by their template (e.g. /sessions/{session_id}) to
+    keep cardinality bounded; requests that match no route use "unmatched".
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "websocket":
+            await self._websocket(scope, receive, send)
+            return
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            http_requests.inc((method, route, str(status)))
+            http_latency.observe((method, route), time.perf_counter() - start)
+            http_response_bytes.observe((method, route), size)
+
+    async def _websocket(self, scope, receive, send) -> None:
+        # Sessions are counted from accept until the endpoint returns.
+        labels: Labels | None = None
+
+        async def send_wrapper(message) -> None:
+            nonlocal labels
+            if message["type"] == "websocket.accept" and labels is None:
+                labels = (getattr(scope.get("route"), "path", None) or "unmatched",)
+                ws_sessions.inc(labels)
+                ws_sessions_active.inc(labels)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if labels is not None:
+                ws_sessions_active.dec(labels)
@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import re
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Iterator
+
+from app.core import config
+from app.core.http import http_clients
+from app.services.logger_service import logger as log_service
+
+logger = logging.getLogger(__name__)
+
+# OTLP span kinds.
+INTERNAL, SERVER, CLIENT = 1, 2, 3
+
+# W3C trace context: version-traceid-parentid-flags.
+_TRACEPARENT = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+# Characters not allowed in a Server-Timing metric name (an HTTP token).
+_NON_TOKEN = re.compile(r"[^!#$%&'*+\-.^_`|~0-9A-Za-z]")
+
+_current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = (
+        "name",
+        "kind",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "error",
+        "finished",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        kind: int = INTERNAL,
+        parent: Span | None = None,
+        trace_id: str | None = None,
+        parent_id: str | None = None,
+        attributes: dict[str, Any] | None = None,
+    ) -> None:
+        self.name = name
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent else (trace_id or os.urandom(16).hex())
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.attributes = attributes or {}
+        self.error: str | None = None
+        # Finished spans of the whole trace (in this process), shared with the parent.
+        self.finished: list[Span] = parent.finished if parent else []
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def to_otlp(self) -> dict[str, Any]:
+        span: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class OTLPJsonExporter:
+    """Batch finished spans and export them as OTLP/JSON trace requests.
+
+    Each flush appends one ExportTraceServiceRequest per line to `path`
+    and/or POSTs it to `url` (an OTLP/HTTP collector's /v1/traces). Spans
+    beyond `max_queue` between flushes are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        *,
+        service_name: str,
+        path: str | None = None,
+        url: str | None = None,
+        flush_seconds: float = 1.0,
+        max_queue: int = 10_000,
+    ) -> None:
+        self.service_name = service_name
+        self.path = Path(path) if path else None
+        self.url = url
+        self.flush_seconds = flush_seconds
+        self.max_queue = max_queue
+        self.exported = 0
+        self.dropped = 0
+        self._pending: list[Span] = []
+        self._task: asyncio.Task | None = None
+
+    def submit(self, span: Span) -> None:
+        if len(self._pending) >= self.max_queue:
+            self.dropped += 1
+            return
+        self._pending.append(span)
+
+    def encode(self, spans: list[Span]) -> bytes:
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [_otlp_attribute("service.name", self.service_name)]
+                    },
+                    "scopeSpans": [
+                        {"scope": {"name": __name__}, "spans": [s.to_otlp() for s in spans]}
+                    ],
+                }
+            ]
+        }
+        return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+    async def flush(self) -> None:
+        spans, self._pending = self._pending, []
+        if not spans:
+            return
+        body = self.encode(spans)
+        if self.path is not None:
+            await asyncio.to_thread(self._append, body)
+        if self.url:
+            await http_clients.get("tracing").post(
+                self.url,
+                content=body,
+                headers={"Content-Type": "application/json"},
+                timeout=5.0,
+            )
+        self.exported += len(spans)
+
+    def _append(self, body: bytes) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.write(body + b"\n")
+
+    async def startup(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Failed to export spans")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to export spans")
+
+
+class Tracer:
+    """Context-var based span API.
+
+    `with tracer.span("name", key=value):` times a block as a child of the
+    current span (or starts a new trace). Spans cross `await`s and are
+    inherited by tasks created inside them. Finished spans go to the
+    exporter, if any.
+    """
+
+    def __init__(self, *, enabled: bool, exporter: OTLPJsonExporter | None = None) -> None:
+        self.enabled = enabled
+        self.exporter = exporter
+
+    @staticmethod
+    def current() -> Span | None:
+        return _current.get()
+
+    @contextlib.contextmanager
+    def span(
+        self,
+        name: str,
+        *,
+        kind: int = INTERNAL,
+        trace_id: str | None = None,
+        parent_id: str | None = None,
+        **attributes: Any,
+    ) -> Iterator[Span | None]:
+        if not self.enabled:
+            yield None
+            return
+
+        span = Span(
+            name,
+            kind=kind,
+            parent=_current.get(),
+            trace_id=trace_id,
+            parent_id=parent_id,
+            attributes=attributes,
+        )
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.error = "cancelled" if isinstance(exc, asyncio.CancelledError) else exc.__class__.__name__
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            with contextlib.suppress(ValueError):
+                # Fails only if the span was exited from another context.
+                _current.reset(token)
+            span.finished.append(span)
+            if self.exporter is not None:
+                self.exporter.submit(span)
+
+    async def startup(self) -> None:
+        if self.exporter is not None:
+            await self.exporter.startup()
+
+    async def aclose(self) -> None:
+        if self.exporter is not None:
+            await self.exporter.aclose()
+
+
+def server_timing(root: Span, *, limit: int = 20) -> str:
+    """Summarize a request's finished child spans as a Server-Timing header value.
+
+    Spans with the same name are merged (durations summed, count in desc),
+    and `total` is the time since the request started.
+    """
+
+    totals: dict[str, list[float]] = {}
+    for span in root.finished:
+        if span is root:
+            continue
+        entry = totals.setdefault(_NON_TOKEN.sub("_", span.name), [0.0, 0])
+        entry[0] += span.duration_ms
+        entry[1] += 1
+
+    parts = []
+    for name, (ms, count) in list(totals.items())[:limit]:
+        desc = f';desc="x{count}"' if count > 1 else ""
+        parts.append(f"{name};dur={ms:.1f}{desc}")
+    parts.append(f"total;dur={root.duration_ms:.1f}")
+    return ", ".join(parts)
+
+
+def _parse_traceparent(value: str | None) -> tuple[str | None, str | None]:
+    match = _TRACEPARENT.match(value or "")
+    if match is None:
+        return None, None
+    return match.group(1), match.group(2)
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a server span per HTTP request.
+
+    Continues an incoming W3C `traceparent` trace and adds a Server-Timing
+    header listing the stages finished before the response headers were
+    sent (for streamed responses, only the stages before the first byte).
+    Requests slower than TRACE_SLOW_MS are logged with their breakdown.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        trace_id, parent_id = _parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+        method = scope["method"]
+
+        with tracer.span(
+            f"{method} {scope['path']}",
+            kind=SERVER,
+            trace_id=trace_id,
+            parent_id=parent_id,
+            **{"http.method": method, "http.target": scope["path"]},
+        ) as root:
+
+            async def send_wrapper(message) -> None:
+                if message["type"] == "http.response.start":
+                    root.attributes["http.status_code"] = message["status"]
+                    timing = server_timing(root).encode("latin-1")
+                    message = {
+                        **message,
+                        "headers": [*message.get("headers", []), (b"server-timing", timing)],
+                    }
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    root.name = f"{method} {route}"
+                    root.attributes["http.route"] = route
+
+        if config.TRACE_SLOW_MS > 0 and root.duration_ms >= config.TRACE_SLOW_MS:
+            log_service.latency(root.name, round(root.duration_ms, 1))
+            for span in root.finished:
+                if span is not root:
+                    log_service.latency(f"{root.name} > {span.name}", round(span.duration_ms, 1))
+
+
+tracer = Tracer(
+    enabled=config.TRACING_ENABLED,
+    exporter=(
+        OTLPJsonExporter(
+            service_name=config.TRACE_SERVICE_NAME,
+            path=config.TRACE_EXPORT_FILE,
+            url=config.TRACE_EXPORT_URL,
+        )
+        if config.TRACING_ENABLED and (config.TRACE_EXPORT_FILE or config.TRACE_EXPORT_URL)
+        else None
+    ),
+)
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 from app.core import config
+from app.core.http import http2_available
+from app.providers.offline_provider import OFFLINE_BACKENDS
+from app.services.prompt_history import tiktoken_available
 
 
 def validate_configuration() -> None:
@@ -9,19 +12,43 @@ def validate_configuration() -> None:
     llm_provider = (config.LLM_PROVIDER or "").strip().lower()
     llm_model = (config.LLM_MODEL or None)
 
-    if llm_provider not in {"dummy", "test", "openai", "offline", "local"}:
+    if llm_provider not in {"dummy", "test", "openai", "offline", "local", "router"}:
         raise RuntimeError(f"Unsupported LLM_PROVIDER: {config.LLM_PROVIDER}")
 
-    if llm_provider == "openai":
+    route_providers: set[str] = set()
+    if llm_provider == "router":
+        if not config.LLM_ROUTES.strip():
+            raise RuntimeError("LLM_PROVIDER=router requires LLM_ROUTES")
+        for spec in (config.LLM_ROUTES, config.LLM_ROUTES_FALLBACK):
+            for item in spec.split(","):
+                if item.strip():
+                    route_providers.add(item.partition("@")[0].strip().lower())
+        if "router" in route_providers:
+            raise RuntimeError("LLM_ROUTES cannot contain the router itself")
+
+    if llm_provider == "openai" or "openai" in route_providers:
         if not config.OPENAI_API_KEY:
             raise RuntimeError("LLM_PROVIDER=openai requires OPENAI_API_KEY")
         # model optional; OpenAI provider will default if missing.
 
-    if llm_provider in {"offline", "local"}:
-        # Explicitly fail until an offline adapter is implemented.
+    if llm_provider in {"offline", "local"} or route_providers & {"offline", "local"}:
+        if config.OFFLINE_LLM_BACKEND.strip().lower() not in OFFLINE_BACKENDS:
+            raise RuntimeError(f"Unsupported OFFLINE_LLM_BACKEND: {config.OFFLINE_LLM_BACKEND}")
+        if config.OFFLINE_LLM_PARALLEL < 1:
+            raise RuntimeError("OFFLINE_LLM_PARALLEL must be at least 1")
+
+    if config.SESSION_BACKEND.strip().lower() not in {"memory", "sql"}:
+        raise RuntimeError(f"Unsupported SESSION_BACKEND: {config.SESSION_BACKEND}")
+
+    token_estimator = config.PROMPT_TOKEN_ESTIMATOR.strip().lower()
+    if token_estimator not in {"heuristic", "tiktoken"}:
+        raise RuntimeError(f"Unsupported PROMPT_TOKEN_ESTIMATOR: {config.PROMPT_TOKEN_ESTIMATOR}")
+    if token_estimator == "tiktoken" and not tiktoken_available():
+        raise RuntimeError("PROMPT_TOKEN_ESTIMATOR=tiktoken requires the tiktoken package")
+
+    if config.HTTP2_ENABLED and not http2_available():
         raise RuntimeError(
-            "LLM_PROVIDER=offline is not implemented yet. "
-            "Select LLM_PROVIDER=dummy or openai."
+            "HTTP2_ENABLED=true requires the h2 package (pip install 'httpx[http2]')"
         )
 
     if config.USE_MICROSOFT_VOICE_LIVE:
@@ -2,11 +2,13 @@ from typing import Generator
 
 from app.core.database import SessionLocal
 from app.core import config
+from app.providers.cached_speech_provider import CachedSpeechProvider
 from app.providers.llm_provider import LLMProvider
 from app.providers.disabled_speech_provider import DisabledSpeechProvider
 from app.providers.microsoft_voice_live_provider import MicrosoftVoiceLiveProvider
 from app.providers.speech_provider import SpeechProvider
 from app.services.model_selector import model_selector
+from app.services.tts_cache import tts_cache, tts_single_flight
 
 
 def get_db() -> Generator:
@@ -23,10 +25,23 @@ def get_llm_provider() -> LLMProvider:
     return model_selector.select(config.LLM_PROVIDER, config.LLM_MODEL)
 
 
+_speech_provider: SpeechProvider | None = None
+
+
 def get_speech_provider() -> SpeechProvider:
-    """Return the active Speech (STT/TTS) provider."""
+    """Return the active Speech (STT/TTS) provider, shared by all requests."""
+
+    global _speech_provider
+    if _speech_provider is None:
+        _speech_provider = _create_speech_provider()
+    return _speech_provider
+
 
+def _create_speech_provider() -> SpeechProvider:
     if config.USE_MICROSOFT_VOICE_LIVE:
-        return MicrosoftVoiceLiveProvider()
+        provider = MicrosoftVoiceLiveProvider()
+        if tts_cache is not None:
+            return CachedSpeechProvider(provider, tts_cache, tts_single_flight)
+        return provider
 
     return DisabledSpeechProvider()
@@ -1,12 +1,27 @@
+import asyncio
+import logging
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from app.core import config
 from app.core.config import APP_NAME, ENV
 from app.core.validation import validate_configuration
 from app.core.database import Base, engine
+from app.core.http import http_clients
+from app.core.metrics import MetricsMiddleware, registry as metrics_registry
+from app.core.tracing import TracingMiddleware, tracer
+from app.dependencies import get_speech_provider
+from app.providers.resilient_provider import CircuitOpenError
+from app.services.admission import AdmissionRejected
+from app.services.context_service import context
+from app.services.llm_handler import response_cache
+from app.services.health_monitor import health_monitor
+from app.services.model_selector import model_selector
+from app.services.tts_cache import prewarm as prewarm_tts_cache, tts_cache
 from app.routers.interactions import router as interactions_router
 from app.routers.llm import router as llm_router
 from app.routers.metrics import router as metrics_router
@@ -16,6 +31,11 @@ from app.routers.transcripts import router as transcripts_router
 from app.routers.users import router as users_router
 from app.routers.voice import router as voice_router
 from app.routers.documents import router as documents_router
+logger = logging.getLogger(__name__)
+
+# Background startup work, cancelled at shutdown.
+_background_tasks: set[asyncio.Task] = set()
+
 
 def create_app() -> FastAPI:
     validate_configuration()
@@ -37,6 +57,30 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Added last, so they wrap everything else; metrics is outermost so its
+    # timings also cover the tracing layer.
+    application.add_middleware(TracingMiddleware)
+    application.add_middleware(MetricsMiddleware)
+
+    # Shed load quickly when the upstream LLM queue is full.
+    @application.exception_handler(AdmissionRejected)
+    async def admission_rejected(_request: Request, exc: AdmissionRejected):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(exc)},
+            headers={"Retry-After": "1"},
+        )
+
+    # Fail fast while the upstream LLM circuit is open.
+    @application.exception_handler(CircuitOpenError)
+    async def circuit_open(_request: Request, exc: CircuitOpenError):
+        retry_after = max(1, round(exc.retry_after or 1))
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(exc)},
+            headers={"Retry-After": str(retry_after)},
+        )
+
     # Routers
     application.include_router(users_router)
     application.include_router(interactions_router)
@@ -60,7 +104,46 @@ app = create_app()
 
 
 @app.on_event("startup")
-def on_startup():
+async def on_startup():
     # In production, run migrations instead.
     if ENV.lower() == "dev":
         Base.metadata.create_all(bind=engine)
+
+    await model_selector.startup()
+    if response_cache is not None:
+        response_cache.load()
+    await context.startup()
+
+    # One speech provider for the process; its pooled client lives until shutdown.
+    try:
+        speech = get_speech_provider()
+    except Exception:
+        logger.exception("Failed to initialize speech provider")
+        speech = None
+
+    if tts_cache is not None:
+        tts_cache.load()
+        if config.TTS_CACHE_PREWARM_FILE and speech is not None and config.USE_MICROSOFT_VOICE_LIVE:
+            # Warm in the background; requests are served meanwhile.
+            task = asyncio.create_task(prewarm_tts_cache(speech, config.TTS_CACHE_PREWARM_FILE))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+
+    await health_monitor.startup()
+    await metrics_registry.startup()
+    await tracer.startup()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    for task in list(_background_tasks):
+        task.cancel()
+    await health_monitor.aclose()
+    await metrics_registry.aclose()
+    await tracer.aclose()
+    await context.aclose()
+    if response_cache is not None:
+        response_cache.save()
+    await model_selector.aclose()
+    # Close pooled upstream connections.
+    await http_clients.aclose()
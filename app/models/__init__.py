@@ -1 +1,2 @@
 from app.models.user import User
+from app.models.session import ChatMessage, ChatSession
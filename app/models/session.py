@@ -0,0 +1,25 @@
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String, Text, func
+from app.core.database import Base
+
+class ChatSession(Base):
+    __tablename__ = "chat_sessions"
+
+    id = Column(String(64), primary_key=True)
+    state = Column(JSON, nullable=False, default=dict)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class ChatMessage(Base):
+    __tablename__ = "chat_messages"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(
+        String(64),
+        ForeignKey("chat_sessions.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    role = Column(String(16), nullable=False)
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import uuid
+from typing import Any, AsyncIterator, Optional
+
+from app.core.tracing import tracer
+from app.providers.speech_provider import SpeechProvider
+from app.schemas.voice import NormalizedTranscript
+from app.services.single_flight import SingleFlight
+from app.services.tts_cache import CachedAudio, TTSCache
+
+
+class CachedSpeechProvider(SpeechProvider):
+    """Serve synthesize_text from a TTSCache; everything else goes to `inner`.
+
+    Concurrent misses for the same phrase share one upstream synthesis.
+    Other attributes (e.g. build_realtime_ws_url) are looked up on `inner`.
+    """
+
+    def __init__(
+        self,
+        inner: SpeechProvider,
+        cache: TTSCache,
+        single_flight: SingleFlight | None = None,
+    ) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.single_flight = single_flight or SingleFlight()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.inner, name)
+
+    @property
+    def name(self) -> str:
+        return self.inner.name
+
+    async def health_check(self) -> bool:
+        return await self.inner.health_check()
+
+    async def transcribe_wav(
+        self,
+        *,
+        wav_bytes: bytes,
+        sample_rate_hz: int,
+        language: Optional[str] = None,
+        request_id: Optional[str] = None,
+    ) -> NormalizedTranscript:
+        return await self.inner.transcribe_wav(
+            wav_bytes=wav_bytes,
+            sample_rate_hz=sample_rate_hz,
+            language=language,
+            request_id=request_id,
+        )
+
+    async def transcribe_stream(
+        self,
+        *,
+        pcm: AsyncIterator[bytes],
+        sample_rate_hz: int,
+        pcm_bytes: Optional[int] = None,
+        language: Optional[str] = None,
+        request_id: Optional[str] = None,
+    ) -> NormalizedTranscript:
+        return await self.inner.transcribe_stream(
+            pcm=pcm,
+            sample_rate_hz=sample_rate_hz,
+            pcm_bytes=pcm_bytes,
+            language=language,
+            request_id=request_id,
+        )
+
+    async def list_voices(self) -> list[dict]:
+        return await self.inner.list_voices()
+
+    async def synthesize_text(
+        self,
+        *,
+        text: str,
+        language: Optional[str] = None,
+        voice: Optional[str] = None,
+        request_id: Optional[str] = None,
+        output_format: Optional[str] = None,
+    ) -> tuple[bytes, str, str | None, str]:
+        rid = request_id or str(uuid.uuid4())
+        # Keyed on the effective values, so a changed configured default
+        # voice (or language/format) does not serve stale audio.
+        resolved_voice, resolved_language, resolved_format = self.inner.resolve_synthesis(
+            language=language, voice=voice, output_format=output_format
+        )
+        key = self.cache.key(
+            self.inner.name,
+            text,
+            voice=resolved_voice,
+            language=resolved_language,
+            output_format=resolved_format,
+        )
+
+        with tracer.span("tts.cache") as span:
+            entry = await self.cache.get(key)
+            if span is not None:
+                span.attributes["hit"] = entry is not None
+        if entry is None:
+            async def synthesize() -> CachedAudio:
+                audio, mime, voice_used, _ = await self.inner.synthesize_text(
+                    text=text,
+                    language=language,
+                    voice=voice,
+                    request_id=rid,
+                    output_format=output_format,
+                )
+                result = CachedAudio(audio, mime, voice_used)
+                await self.cache.set(key, result)
+                return result
+
+            entry = await self.single_flight.do(key, synthesize)
+
+        return (entry.audio, entry.mime_type, entry.voice, rid)
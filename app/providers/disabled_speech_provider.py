@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-import io
 import uuid
-import wave
 from typing import Optional
 
 from app.providers.speech_provider import SpeechProvider
 from app.schemas.voice import NormalizedTranscript
+from app.services.wav import wav_frames
 
 
 class DisabledSpeechProvider(SpeechProvider):
@@ -56,11 +55,4 @@ class DisabledSpeechProvider(SpeechProvider):
         frames = int(sample_rate_hz * duration_ms / 1000)
         silence_pcm16 = b"\x00\x00" * frames
 
-        buf = io.BytesIO()
-        with wave.open(buf, "wb") as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)
-            wf.setframerate(sample_rate_hz)
-            wf.writeframes(silence_pcm16)
-
-        return (buf.getvalue(), "audio/wav", voice, rid)
+        return (b"".join(wav_frames(silence_pcm16, sample_rate_hz)), "audio/wav", voice, rid)
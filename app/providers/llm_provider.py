@@ -1,7 +1,81 @@
+import asyncio
 from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Upstream statuses worth retrying (timeouts, conflicts, rate limits, server errors).
+RETRYABLE_STATUSES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+# Chat message: {"role": "system" | "user" | "assistant", "content": str}
+ChatMessage = dict[str, str]
+
+
+def flatten_messages(messages: list[ChatMessage]) -> str:
+    """Render chat messages as a single prompt string.
+
+    System messages form the preamble; the rest become `Role: content` lines
+    followed by an `Assistant:` cue.
+    """
+
+    system = " ".join(m["content"] for m in messages if m.get("role") == "system")
+    lines = "".join(
+        f"{m.get('role', 'user').capitalize()}: {m['content']}\n"
+        for m in messages
+        if m.get("role") != "system"
+    )
+    return f"{system}\n\n{lines}Assistant:"
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class LLMProviderError(RuntimeError):
+    """Raised when an upstream LLM call fails.
+
+    `retryable` marks transient failures (transport errors, RETRYABLE_STATUSES);
+    `retry_after` carries the upstream Retry-After hint in seconds, if any.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        status_code: int | None = None,
+        retry_after: float | None = None,
+        retryable: bool = False,
+    ) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.retryable = retryable
+
 
 class LLMProvider(ABC):
 
+    # True if generate_batch() sends a whole batch in one upstream request.
+    supports_batch = False
+
+    @property
+    def name(self) -> str:
+        """Display name of the provider (class name by default)."""
+        return self.__class__.__name__
+
     @abstractmethod
     async def generate(self, prompt: str) -> str:
         """Return a full LLM response"""
@@ -11,3 +85,31 @@ class LLMProvider(ABC):
     async def stream(self, prompt: str, on_token):
         """Stream tokens to callback function"""
         pass
+
+    async def generate_messages(self, messages: list[ChatMessage]) -> str:
+        """Return a full LLM response for a chat message list.
+
+        Providers without a native chat API fall back to a flattened prompt.
+        """
+        return await self.generate(flatten_messages(messages))
+
+    async def stream_messages(self, messages: list[ChatMessage], on_token):
+        """Stream tokens for a chat message list to callback function"""
+        return await self.stream(flatten_messages(messages), on_token)
+
+    async def generate_batch(self, prompts: list[str]) -> list[str]:
+        """Return one full response per prompt, in order.
+
+        Providers without a native batch API issue one call per prompt.
+        """
+        return list(await asyncio.gather(*(self.generate(p) for p in prompts)))
+
+    async def health_check(self) -> bool:
+        """Return True if the upstream is reachable. Local providers always are."""
+        return True
+
+    async def startup(self) -> None:
+        """Warm up long-lived state (connections, models). Optional."""
+
+    async def aclose(self) -> None:
+        """Release resources held by the provider. Optional."""
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import uuid
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 import httpx
 
 from app.core import config
+from app.core.http import http_clients
+from app.core.metrics import observe_upstream
 from app.providers.speech_provider import SpeechProvider
 from app.schemas.voice import NormalizedTranscript
+from app.services.wav import HEADER_SIZE, wav_header
 
 
 class MicrosoftVoiceLiveError(RuntimeError):
@@ -15,7 +18,11 @@ class MicrosoftVoiceLiveError(RuntimeError):
 
 
 class MicrosoftVoiceLiveProvider(SpeechProvider):
-    """SpeechProvider backed by Microsoft Speech Services."""
+    """SpeechProvider backed by Microsoft Speech Services.
+
+    Calls go through the pooled `client` from http_clients, so connections
+    (and TLS sessions) to the speech region are reused across requests.
+    """
 
     def __init__(
         self,
@@ -24,6 +31,8 @@ class MicrosoftVoiceLiveProvider(SpeechProvider):
         base_url: Optional[str] = None,
         stt_url: Optional[str] = None,
         tts_url: Optional[str] = None,
+        *,
+        client: str = "speech",
     ) -> None:
         # Configuration comes from app.core.config
         self.api_key = api_key or config.MICROSOFT_VOICE_LIVE_API_KEY
@@ -31,6 +40,7 @@ class MicrosoftVoiceLiveProvider(SpeechProvider):
         self.base_url = base_url or config.MICROSOFT_VOICE_LIVE_BASE_URL
         self.stt_url = stt_url or config.MICROSOFT_VOICE_LIVE_STT_URL
         self.tts_url = tts_url or config.MICROSOFT_VOICE_LIVE_TTS_URL
+        self.client = client
 
         if not self.api_key:
             raise MicrosoftVoiceLiveError("MICROSOFT_VOICE_LIVE_API_KEY is not set")
@@ -46,9 +56,9 @@ class MicrosoftVoiceLiveProvider(SpeechProvider):
         if not url:
             return False
 
+        client = http_clients.get(self.client)
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                resp = await client.get(url, headers=self._auth_headers())
+            resp = await client.get(url, headers=self._auth_headers(), timeout=config.SPEECH_HEALTH_TIMEOUT)
         except httpx.HTTPError as exc:
             raise MicrosoftVoiceLiveError(f"Health check failed: {exc}") from exc
 
@@ -61,6 +71,45 @@ class MicrosoftVoiceLiveProvider(SpeechProvider):
         sample_rate_hz: int,
         language: Optional[str] = None,
         request_id: Optional[str] = None,
+    ) -> NormalizedTranscript:
+        return await self._recognize(
+            wav_bytes,
+            sample_rate_hz=sample_rate_hz,
+            language=language,
+            request_id=request_id,
+        )
+
+    async def transcribe_stream(
+        self,
+        *,
+        pcm: AsyncIterator[bytes],
+        sample_rate_hz: int,
+        pcm_bytes: Optional[int] = None,
+        language: Optional[str] = None,
+        request_id: Optional[str] = None,
+    ) -> NormalizedTranscript:
+        async def body() -> AsyncIterator[bytes | memoryview]:
+            yield wav_header(sample_rate_hz, pcm_bytes)
+            async for chunk in pcm:
+                yield chunk
+
+        # Forwarded as received (chunked unless the size is known), never buffered.
+        return await self._recognize(
+            body(),
+            sample_rate_hz=sample_rate_hz,
+            language=language,
+            request_id=request_id,
+            content_length=None if pcm_bytes is None else HEADER_SIZE + pcm_bytes,
+        )
+
+    async def _recognize(
+        self,
+        content: bytes | AsyncIterator[bytes],
+        *,
+        sample_rate_hz: int,
+        language: Optional[str],
+        request_id: Optional[str],
+        content_length: Optional[int] = None,
     ) -> NormalizedTranscript:
         if not self.stt_url:
             raise MicrosoftVoiceLiveError("MICROSOFT_VOICE_LIVE_STT_URL is not set")
@@ -79,14 +128,14 @@ class MicrosoftVoiceLiveProvider(SpeechProvider):
             "Ocp-Apim-Subscription-Key": self.api_key,
             "Content-Type": f"audio/wav; codecs=audio/pcm; samplerate={sample_rate_hz}",
         }
+        if content_length is not None:
+            headers["Content-Length"] = str(content_length)
 
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.post(url, headers=headers, content=wav_bytes)
-
-        if resp.status_code >= 400:
-            raise MicrosoftVoiceLiveError(
-                f"STT request failed (status={resp.status_code})"
-            )
+        client = http_clients.get(self.client)
+        with observe_upstream("stt", self.name, "transcribe"):
+            resp = await client.post(url, headers=headers, content=content, timeout=config.SPEECH_STT_TIMEOUT)
+            if resp.status_code >= 400:
+                raise MicrosoftVoiceLiveError(f"STT request failed (status={resp.status_code})")
 
         try:
             data: dict[str, Any] = resp.json()
@@ -140,11 +189,11 @@ class MicrosoftVoiceLiveProvider(SpeechProvider):
         else:
             list_url = f"{base}/cognitiveservices/voices/list"
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(list_url, headers=self._auth_headers())
-
-        if resp.status_code >= 400:
-            raise MicrosoftVoiceLiveError(f"Voices list failed (status={resp.status_code})")
+        client = http_clients.get(self.client)
+        with observe_upstream("tts", self.name, "list_voices"):
+            resp = await client.get(list_url, headers=self._auth_headers(), timeout=config.SPEECH_VOICES_TIMEOUT)
+            if resp.status_code >= 400:
+                raise MicrosoftVoiceLiveError(f"Voices list failed (status={resp.status_code})")
 
         try:
             data = resp.json()
@@ -169,6 +218,20 @@ class MicrosoftVoiceLiveProvider(SpeechProvider):
             )
         return [v for v in voices if v.get("name")]
 
+    def resolve_synthesis(
+        self,
+        *,
+        language: Optional[str] = None,
+        voice: Optional[str] = None,
+        output_format: Optional[str] = None,
+    ) -> tuple[str, str, str]:
+        # Sensible default voice if none configured.
+        voice_name = voice or config.MICROSOFT_VOICE_LIVE_VOICE or "en-US-JennyNeural"
+        lang = (language or "en-US").strip() or "en-US"
+        # Default to mp3 for compactness.
+        fmt = (output_format or "audio-16khz-32kbitrate-mono-mp3").strip()
+        return voice_name, lang, fmt
+
     async def synthesize_text(
         self,
         *,
@@ -182,15 +245,9 @@ class MicrosoftVoiceLiveProvider(SpeechProvider):
             raise MicrosoftVoiceLiveError("MICROSOFT_VOICE_LIVE_TTS_URL is not set")
 
         rid = request_id or str(uuid.uuid4())
-        voice_name = voice or config.MICROSOFT_VOICE_LIVE_VOICE
-        if not voice_name:
-            # Sensible default if none configured.
-            voice_name = "en-US-JennyNeural"
-
-        lang = (language or "en-US").strip() or "en-US"
-
-        # Default to mp3 for compactness.
-        fmt = (output_format or "audio-16khz-32kbitrate-mono-mp3").strip()
+        voice_name, lang, fmt = self.resolve_synthesis(
+            language=language, voice=voice, output_format=output_format
+        )
         mime = "audio/mpeg" if "mp3" in fmt.lower() else "audio/wav"
 
         ssml = (
@@ -206,11 +263,16 @@ class MicrosoftVoiceLiveProvider(SpeechProvider):
             "User-Agent": "bot-backend",
         }
 
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.post(self.tts_url.rstrip("/"), headers=headers, content=ssml.encode("utf-8"))
-
-        if resp.status_code >= 400:
-            raise MicrosoftVoiceLiveError(f"TTS request failed (status={resp.status_code}): {resp.text}")
+        client = http_clients.get(self.client)
+        with observe_upstream("tts", self.name, "synthesize"):
+            resp = await client.post(
+                self.tts_url.rstrip("/"),
+                headers=headers,
+                content=ssml.encode("utf-8"),
+                timeout=config.SPEECH_TTS_TIMEOUT,
+            )
+            if resp.status_code >= 400:
+                raise MicrosoftVoiceLiveError(f"TTS request failed (status={resp.status_code}): {resp.text}")
 
         return (resp.content, mime, voice_name, rid)
 
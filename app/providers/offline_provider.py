@@ -1,19 +1,241 @@
 from __future__ import annotations
 
+import asyncio
+import json
 from typing import Any, Callable
 
-from app.providers.llm_provider import LLMProvider
+import httpx
+
+from app.core import config
+from app.core.http import http_clients
+from app.providers.llm_provider import (
+    RETRYABLE_STATUSES,
+    ChatMessage,
+    LLMProvider,
+    LLMProviderError,
+    flatten_messages,
+    parse_retry_after,
+)
+from app.providers.openai_provider import OpenAIProvider
+
+# Backends an OfflineProvider can talk to.
+OFFLINE_BACKENDS = ("openai", "llamacpp", "stub")
+
+
+class OfflineProviderError(LLMProviderError):
+    pass
+
+
+def _status_error(resp: httpx.Response, body: str) -> OfflineProviderError:
+    return OfflineProviderError(
+        f"Local LLM request failed (status={resp.status_code}): {body}",
+        status_code=resp.status_code,
+        retry_after=parse_retry_after(resp.headers.get("Retry-After")),
+        retryable=resp.status_code in RETRYABLE_STATUSES,
+    )
+
+
+async def _emit(on_token: Callable[[str], Any], token: str) -> None:
+    result = on_token(token)
+    if hasattr(result, "__await__"):
+        await result
 
 
 class OfflineProvider(LLMProvider):
-    """Placeholder for offline LLM adapters."""
+    """LLM served by a local model process.
+
+    Backends:
+    - "openai": an OpenAI-compatible server (llama.cpp `llama-server`, vLLM,
+      Ollama, LM Studio) via /chat/completions.
+    - "llamacpp": llama.cpp's native /completion endpoint, with
+      `cache_prompt` so the server reuses the KV cache for shared prefixes.
+    - "stub": a deterministic in-process generator; no server needed.
+
+    Requests share pooled connections (the "offline" HTTP client). At most
+    `parallel` requests run against the local process at a time, matching
+    its slot count (`llama-server --parallel N`). Only "llamacpp" (and
+    "stub") support batching: generate_batch() sends the prompts as one
+    multi-prompt /completion request holding one slot, formatted as a single
+    call would format them. "openai" has no equivalent batch call, so its
+    batches are plain single calls, one slot each.
+    """
+
+    def __init__(
+        self,
+        model: str | None = None,
+        base_url: str | None = None,
+        *,
+        backend: str | None = None,
+        parallel: int | None = None,
+        timeout: float | None = None,
+        max_tokens: int | None = None,
+    ) -> None:
+        self.backend = (backend or config.OFFLINE_LLM_BACKEND).strip().lower()
+        if self.backend not in OFFLINE_BACKENDS:
+            raise OfflineProviderError(f"Unsupported OFFLINE_LLM_BACKEND: {self.backend}")
+
+        self.model = model or config.OFFLINE_LLM_MODEL
+        self.base_url = (base_url or config.OFFLINE_LLM_BASE_URL).rstrip("/")
+        self.timeout = timeout or config.OFFLINE_LLM_TIMEOUT
+        self.max_tokens = max_tokens or config.OFFLINE_LLM_MAX_TOKENS
+        # Read by the micro-batcher; see generate_batch().
+        self.supports_batch = self.backend != "openai"
+        self._slots = asyncio.Semaphore(parallel or config.OFFLINE_LLM_PARALLEL)
+
+        self._chat: OpenAIProvider | None = None
+        if self.backend == "openai":
+            # Local servers usually ignore the key, but the header must be present.
+            self._chat = OpenAIProvider(
+                api_key=config.OFFLINE_LLM_API_KEY or "local",
+                base_url=self.base_url,
+                model=self.model,
+                client="offline",
+                timeout=self.timeout,
+            )
+
+    @property
+    def name(self) -> str:
+        return f"OfflineProvider({self.backend})"
+
+    async def startup(self) -> None:
+        # Open a pooled connection to the local server; failures are non-fatal.
+        if self._chat is not None:
+            await self._chat.startup()
+        elif self.backend == "llamacpp":
+            try:
+                await http_clients.get("offline").get(f"{self.base_url}/health", timeout=5.0)
+            except httpx.HTTPError:
+                pass
+
+    async def health_check(self) -> bool:
+        if self._chat is not None:
+            return await self._chat.health_check()
+        if self.backend == "llamacpp":
+            resp = await http_clients.get("offline").get(f"{self.base_url}/health", timeout=5.0)
+            return resp.status_code < 400
+        return True
 
     async def generate(self, prompt: str) -> str:
-        raise RuntimeError(
-            "Offline LLM provider is not configured."
-        )
+        return await self.generate_messages([{"role": "user", "content": prompt}])
+
+    async def generate_messages(self, messages: list[ChatMessage]) -> str:
+        async with self._slots:
+            if self._chat is not None:
+                return await self._chat.generate_messages(messages)
+            if self.backend == "llamacpp":
+                data = await self._post("/completion", self._completion_payload(flatten_messages(messages)))
+                return self._content(data)
+            return self._stub_reply(messages)
 
     async def stream(self, prompt: str, on_token: Callable[[str], Any]) -> None:
-        raise RuntimeError(
-            "Offline LLM streaming is not configured."
+        await self.stream_messages([{"role": "user", "content": prompt}], on_token)
+
+    async def stream_messages(
+        self, messages: list[ChatMessage], on_token: Callable[[str], Any]
+    ) -> None:
+        async with self._slots:
+            if self._chat is not None:
+                await self._chat.stream_messages(messages, on_token)
+            elif self.backend == "llamacpp":
+                await self._stream_completion(flatten_messages(messages), on_token)
+            else:
+                for token in self._stub_tokens(self._stub_reply(messages)):
+                    await _emit(on_token, token)
+
+    async def generate_batch(self, prompts: list[str]) -> list[str]:
+        """Generate replies for several prompts in one upstream request where supported."""
+
+        if not prompts:
+            return []
+        if self._chat is not None:
+            # Separate chat calls, each taking its own slot.
+            return await super().generate_batch(prompts)
+        async with self._slots:
+            if self.backend == "stub":
+                return [self._stub_reply([{"role": "user", "content": p}]) for p in prompts]
+
+            rendered = [flatten_messages([{"role": "user", "content": p}]) for p in prompts]
+            data = await self._post("/completion", self._completion_payload(rendered))
+            results = data if isinstance(data, list) else [data]
+            return [self._content(item) for item in results]
+
+    def _completion_payload(self, prompt: str | list[str], *, stream: bool = False) -> dict[str, Any]:
+        return {
+            "prompt": prompt,
+            "n_predict": self.max_tokens,
+            "temperature": 0.2,
+            "cache_prompt": True,
+            "stream": stream,
+        }
+
+    def _headers(self) -> dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if config.OFFLINE_LLM_API_KEY:
+            headers["Authorization"] = f"Bearer {config.OFFLINE_LLM_API_KEY}"
+        return headers
+
+    async def _post(self, path: str, payload: dict[str, Any]) -> Any:
+        client = http_clients.get("offline")
+        try:
+            resp = await client.post(
+                f"{self.base_url}{path}", headers=self._headers(), json=payload, timeout=self.timeout
+            )
+        except httpx.HTTPError as exc:
+            raise OfflineProviderError(f"Local LLM request failed: {exc}", retryable=True) from exc
+
+        if resp.status_code >= 400:
+            raise _status_error(resp, resp.text)
+        try:
+            return resp.json()
+        except ValueError as exc:
+            raise OfflineProviderError("Invalid local LLM response") from exc
+
+    async def _stream_completion(self, prompt: str, on_token: Callable[[str], Any]) -> None:
+        client = http_clients.get("offline")
+        try:
+            async with client.stream(
+                "POST",
+                f"{self.base_url}/completion",
+                headers={**self._headers(), "Accept": "text/event-stream"},
+                json=self._completion_payload(prompt, stream=True),
+                timeout=self.timeout,
+            ) as resp:
+                if resp.status_code >= 400:
+                    body = await resp.aread()
+                    raise _status_error(resp, body.decode("utf-8", errors="replace"))
+
+                async for line in resp.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    try:
+                        chunk = json.loads(line[5:].strip())
+                    except ValueError as exc:
+                        raise OfflineProviderError("Invalid local LLM stream chunk") from exc
+                    if chunk.get("error"):
+                        raise OfflineProviderError(f"Local LLM stream error: {chunk['error']}")
+                    if chunk.get("content"):
+                        await _emit(on_token, chunk["content"])
+                    if chunk.get("stop"):
+                        break
+        except httpx.HTTPError as exc:
+            raise OfflineProviderError(f"Local LLM stream failed: {exc}", retryable=True) from exc
+
+    @staticmethod
+    def _content(data: Any) -> str:
+        try:
+            return data["content"]
+        except (KeyError, TypeError) as exc:
+            raise OfflineProviderError("Unexpected local LLM response format") from exc
+
+    def _stub_reply(self, messages: list[ChatMessage]) -> str:
+        last_user = next(
+            (m.get("content", "") for m in reversed(messages) if m.get("role") == "user"),
+            "",
         )
+        return f"Offline response ({self.model}) for: {last_user}"
+
+    @staticmethod
+    def _stub_tokens(text: str) -> list[str]:
+        # Word-sized tokens, keeping the separating spaces.
+        words = text.split(" ")
+        return [w if i == 0 else f" {w}" for i, w in enumerate(words)]
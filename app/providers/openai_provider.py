@@ -1,22 +1,43 @@
 from __future__ import annotations
 
+import json
 from typing import Any, Callable, Optional
 
 import httpx
 
 from app.core import config
-from app.providers.llm_provider import LLMProvider
+from app.core.http import http_clients
+from app.providers.llm_provider import (
+    RETRYABLE_STATUSES,
+    ChatMessage,
+    LLMProvider,
+    LLMProviderError,
+    parse_retry_after,
+)
 
 
-class OpenAIProviderError(RuntimeError):
+class OpenAIProviderError(LLMProviderError):
     pass
 
 
+def _status_error(resp: httpx.Response, body: str) -> OpenAIProviderError:
+    return OpenAIProviderError(
+        f"OpenAI request failed (status={resp.status_code}): {body}",
+        status_code=resp.status_code,
+        retry_after=parse_retry_after(resp.headers.get("Retry-After")),
+        retryable=resp.status_code in RETRYABLE_STATUSES,
+    )
+
+
 class OpenAIProvider(LLMProvider):
     """Minimal OpenAI-compatible chat completion provider.
 
-    - generate(): non-streaming response
-    - stream(): best-effort token callback (fallback implementation)
+    - generate() / generate_messages(): non-streaming response
+    - stream() / stream_messages(): incremental SSE streaming (`stream: true`)
+      forwarding deltas
+
+    The string methods send the prompt as a single user message. `client`
+    names the pooled HTTP client to use (see app.core.http).
     """
 
     def __init__(
@@ -24,33 +45,64 @@ class OpenAIProvider(LLMProvider):
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
         model: Optional[str] = None,
+        *,
+        client: str = "llm",
+        timeout: float = 30.0,
     ) -> None:
         self.api_key = api_key or config.OPENAI_API_KEY
         self.base_url = (base_url or config.OPENAI_BASE_URL).rstrip("/")
         self.model = model or config.LLM_MODEL or "gpt-4o-mini"
+        self.client = client
+        self.timeout = timeout
 
         if not self.api_key:
             raise OpenAIProviderError("OPENAI_API_KEY is not set")
 
-    async def generate(self, prompt: str) -> str:
-        url = f"{self.base_url}/chat/completions"
-        headers = {
+    async def startup(self) -> None:
+        # Open a pooled connection ahead of the first request; failures are non-fatal.
+        client = http_clients.get(self.client)
+        try:
+            await client.get(f"{self.base_url}/models", headers=self._headers(), timeout=5.0)
+        except httpx.HTTPError:
+            pass
+
+    async def health_check(self) -> bool:
+        client = http_clients.get(self.client)
+        resp = await client.get(f"{self.base_url}/models", headers=self._headers(), timeout=5.0)
+        return resp.status_code < 400
+
+    def _headers(self) -> dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
+
+    def _payload(self, messages: list[ChatMessage], *, stream: bool = False) -> dict[str, Any]:
         payload: dict[str, Any] = {
             "model": self.model,
-            "messages": [{"role": "user", "content": prompt}],
+            "messages": messages,
             "temperature": 0.2,
         }
+        if stream:
+            payload["stream"] = True
+        return payload
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(url, headers=headers, json=payload)
+    async def generate(self, prompt: str) -> str:
+        return await self.generate_messages([{"role": "user", "content": prompt}])
 
-        if resp.status_code >= 400:
-            raise OpenAIProviderError(
-                f"OpenAI request failed (status={resp.status_code}): {resp.text}"
+    async def generate_messages(self, messages: list[ChatMessage]) -> str:
+        url = f"{self.base_url}/chat/completions"
+
+        client = http_clients.get(self.client)
+        try:
+            resp = await client.post(
+                url, headers=self._headers(), json=self._payload(messages), timeout=self.timeout
             )
+        except httpx.HTTPError as exc:
+            raise OpenAIProviderError(f"OpenAI request failed: {exc}", retryable=True) from exc
+
+        if resp.status_code >= 400:
+            raise _status_error(resp, resp.text)
 
         data = resp.json()
         try:
@@ -59,9 +111,65 @@ class OpenAIProvider(LLMProvider):
             raise OpenAIProviderError("Unexpected OpenAI response format") from exc
 
     async def stream(self, prompt: str, on_token: Callable[[str], Any]) -> None:
-        # Best-effort streaming without SSE wiring.
-        text = await self.generate(prompt)
-        for chunk in text.split():
-            result = on_token(chunk + " ")
-            if hasattr(result, "__await__"):
-                await result
+        await self.stream_messages([{"role": "user", "content": prompt}], on_token)
+
+    async def stream_messages(
+        self, messages: list[ChatMessage], on_token: Callable[[str], Any]
+    ) -> None:
+        url = f"{self.base_url}/chat/completions"
+        headers = {**self._headers(), "Accept": "text/event-stream"}
+
+        client = http_clients.get(self.client)
+        try:
+            # Cancelling the calling task exits this context, closing the upstream response.
+            async with client.stream(
+                "POST",
+                url,
+                headers=headers,
+                json=self._payload(messages, stream=True),
+                timeout=self.timeout,
+            ) as resp:
+                if resp.status_code >= 400:
+                    body = await resp.aread()
+                    raise _status_error(resp, body.decode("utf-8", errors="replace"))
+
+                async for line in resp.aiter_lines():
+                    delta = self._parse_sse_line(line)
+                    if delta is None:
+                        continue
+                    if delta is _DONE:
+                        break
+                    result = on_token(delta)
+                    if hasattr(result, "__await__"):
+                        await result
+        except httpx.HTTPError as exc:
+            raise OpenAIProviderError(f"OpenAI stream failed: {exc}", retryable=True) from exc
+
+    @staticmethod
+    def _parse_sse_line(line: str) -> Any:
+        """Return the content delta of one SSE line, `_DONE`, or None to skip."""
+        if not line.startswith("data:"):
+            # Blank separators, comments (": keep-alive") and other SSE fields.
+            return None
+
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return _DONE
+
+        try:
+            chunk = json.loads(data)
+        except ValueError as exc:
+            raise OpenAIProviderError("Invalid OpenAI stream chunk") from exc
+
+        if isinstance(chunk, dict) and chunk.get("error"):
+            raise OpenAIProviderError(f"OpenAI stream error: {chunk['error']}")
+
+        try:
+            content = chunk["choices"][0]["delta"].get("content")
+        except (KeyError, IndexError, TypeError, AttributeError):
+            return None
+        return content or None
+
+
+# Sentinel for the terminal `data: [DONE]` event.
+_DONE = object()
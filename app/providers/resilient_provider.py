@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, TypeVar
+
+from app.providers.llm_provider import ChatMessage, LLMProvider, LLMProviderError
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(LLMProviderError):
+    """Raised without calling upstream while the provider's circuit is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    closed: calls pass through. After `failure_threshold` consecutive
+    failures the circuit opens and calls fail fast for `reset_seconds`.
+    Then it is half-open: one probe call is let through; success closes
+    the circuit, failure opens it again.
+    """
+
+    def __init__(self, *, failure_threshold: int, reset_seconds: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.consecutive_failures = 0
+        self.opened_total = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def retry_in(self) -> float:
+        """Seconds until the circuit lets a probe through (0 if it does now)."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_seconds - time.monotonic())
+
+    def before_call(self) -> None:
+        state = self.state
+        if state == "closed":
+            return
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return
+        retry_in = self.retry_in()
+        raise CircuitOpenError(
+            "LLM provider circuit is open",
+            retry_after=retry_in or None,
+        )
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self._probing or self.consecutive_failures >= self.failure_threshold:
+            if self._opened_at is None or self._probing:
+                self.opened_total += 1
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+    def release(self) -> None:
+        """Forget an in-progress probe whose outcome says nothing about upstream health."""
+        self._probing = False
+
+
+class _LatencyWindow:
+    """Ring buffer of recent successful call latencies."""
+
+    def __init__(self, size: int = 256) -> None:
+        self.samples: deque[float] = deque(maxlen=size)
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def percentile(self, q: float) -> float | None:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    return isinstance(exc, LLMProviderError) and exc.retryable
+
+
+class ResilientProvider(LLMProvider):
+    """Wrap an LLMProvider with retries, a circuit breaker and optional hedging.
+
+    - Retryable errors (LLMProviderError.retryable) are retried up to
+      `max_attempts` times with full-jitter exponential backoff; an upstream
+      Retry-After is honoured, and a hint longer than `max_delay` ends retrying.
+    - Only retryable errors count as circuit breaker failures; client errors
+      (4xx) say nothing about upstream health.
+    - With `hedge` enabled, a full response that takes longer than the p95 of
+      recent latencies triggers a second identical request; the first to
+      succeed wins and the other is cancelled.
+    - Streams are retried only if no token has been delivered yet, and are
+      never hedged.
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        *,
+        max_attempts: int = 3,
+        base_delay: float = 0.25,
+        max_delay: float = 4.0,
+        breaker: CircuitBreaker | None = None,
+        hedge: bool = False,
+        hedge_min_samples: int = 20,
+    ) -> None:
+        self.inner = inner
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker(failure_threshold=5, reset_seconds=30.0)
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.latencies = _LatencyWindow()
+
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @property
+    def name(self) -> str:
+        return self.inner.name
+
+    @property
+    def supports_batch(self) -> bool:
+        return self.inner.supports_batch
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "circuit_state": self.breaker.state,
+            "consecutive_failures": self.breaker.consecutive_failures,
+            "circuit_opened": self.breaker.opened_total,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "p95_seconds": self.latencies.percentile(0.95),
+        }
+
+    async def health_check(self) -> bool:
+        return await self.inner.health_check()
+
+    async def startup(self) -> None:
+        await self.inner.startup()
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+    async def generate(self, prompt: str) -> str:
+        return await self._call(lambda: self.inner.generate(prompt))
+
+    async def generate_messages(self, messages: list[ChatMessage]) -> str:
+        return await self._call(lambda: self.inner.generate_messages(messages))
+
+    async def generate_batch(self, prompts: list[str]) -> list[str]:
+        return await self._call(lambda: self.inner.generate_batch(prompts))
+
+    async def stream(self, prompt: str, on_token: Callable[[str], Any]):
+        await self._stream(lambda cb: self.inner.stream(prompt, cb), on_token)
+
+    async def stream_messages(self, messages: list[ChatMessage], on_token: Callable[[str], Any]):
+        await self._stream(lambda cb: self.inner.stream_messages(messages, cb), on_token)
+
+    async def _call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        attempt = 0
+        while True:
+            attempt += 1
+            self._before_call()
+            try:
+                result = await self._attempt(fn)
+            except BaseException as exc:
+                if not self._after_failure(exc, attempt):
+                    raise
+                await asyncio.sleep(self._backoff(attempt, exc))
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def _stream(
+        self,
+        fn: Callable[[Callable[[str], Any]], Awaitable[Any]],
+        on_token: Callable[[str], Any],
+    ) -> None:
+        emitted = False
+
+        async def forward(tok: str) -> None:
+            nonlocal emitted
+            emitted = True
+            result = on_token(tok)
+            if hasattr(result, "__await__"):
+                await result
+
+        attempt = 0
+        while True:
+            attempt += 1
+            self._before_call()
+            try:
+                await fn(forward)
+            except BaseException as exc:
+                # Once tokens reached the caller, replaying would duplicate them.
+                retry = self._after_failure(exc, attempt if not emitted else self.max_attempts)
+                if not retry:
+                    raise
+                await asyncio.sleep(self._backoff(attempt, exc))
+                continue
+            self.breaker.record_success()
+            return
+
+    def _before_call(self) -> None:
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self.rejected += 1
+            raise
+
+    def _after_failure(self, exc: BaseException, attempt: int) -> bool:
+        """Record a failed attempt; return True if it should be retried."""
+
+        if not _is_retryable(exc):
+            # Cancellation or a client error: not an upstream health signal.
+            self.breaker.release()
+            return False
+
+        self.failures += 1
+        self.breaker.record_failure()
+        if attempt >= self.max_attempts or self.breaker.state != "closed":
+            return False
+        if exc.retry_after is not None and exc.retry_after > self.max_delay:
+            return False
+        self.retries += 1
+        return True
+
+    def _backoff(self, attempt: int, exc: BaseException) -> float:
+        # Full jitter: uniform in [0, min(max_delay, base * 2^(attempt-1))].
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        retry_after = getattr(exc, "retry_after", None)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def _attempt(self, fn: Callable[[], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        hedge_after = self._hedge_delay()
+        if hedge_after is None:
+            result = await fn()
+            self.latencies.observe(time.perf_counter() - started)
+            return result
+
+        primary = asyncio.ensure_future(fn())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done:
+                self.hedges += 1
+                tasks.add(asyncio.ensure_future(fn()))
+
+            error: BaseException | None = None
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    tasks.discard(task)
+                    if task.cancelled():
+                        continue
+                    exc = task.exception()
+                    if exc is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        self.latencies.observe(time.perf_counter() - started)
+                        return task.result()
+                    error = error or exc
+            raise error or asyncio.CancelledError()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _hedge_delay(self) -> float | None:
+        if not self.hedge or len(self.latencies) < self.hedge_min_samples:
+            return None
+        return self.latencies.percentile(0.95)
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Awaitable, Callable, TypeVar
+
+from app.providers.llm_provider import ChatMessage, LLMProvider
+from app.providers.resilient_provider import CircuitOpenError, ResilientProvider, _is_retryable
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _fails_over(exc: BaseException) -> bool:
+    # An open circuit fails fast without calling upstream; the next route may be fine.
+    return _is_retryable(exc) or isinstance(exc, CircuitOpenError)
+
+
+class Route:
+    """One backend behind a RoutingProvider, with its EWMA latency and error rate."""
+
+    def __init__(self, label: str, provider: LLMProvider, *, fallback: bool = False) -> None:
+        self.label = label
+        self.provider = provider
+        self.fallback = fallback
+        self.latency: float | None = None  # EWMA of successful full-response latency
+        self.error_rate = 0.0  # EWMA of failures (1) vs successes (0)
+        self.requests = 0
+        self.failures = 0
+        self.last_failure: float | None = None
+
+    def observe(self, *, ok: bool, latency: float | None, alpha: float) -> None:
+        self.requests += 1
+        self.error_rate += alpha * ((0.0 if ok else 1.0) - self.error_rate)
+        if ok and latency is not None:
+            self.latency = latency if self.latency is None else self.latency + alpha * (latency - self.latency)
+        if not ok:
+            self.failures += 1
+            self.last_failure = time.monotonic()
+
+    @property
+    def circuit_open(self) -> bool:
+        provider = self.provider
+        return isinstance(provider, ResilientProvider) and provider.breaker.state == "open"
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "route": self.label,
+            "fallback": self.fallback,
+            "latency_seconds": self.latency,
+            "error_rate": self.error_rate,
+            "requests": self.requests,
+            "failures": self.failures,
+            "circuit_open": self.circuit_open,
+        }
+
+
+class RoutingProvider(LLMProvider):
+    """Front several LLM backends and send each call to the fastest healthy one.
+
+    Primary routes are ranked by EWMA latency (routes without samples first,
+    so each gets measured). A route is skipped while its circuit is open, or
+    while its error rate is above `max_error_rate` and it failed within the
+    last `cooldown_seconds`. Unhealthy primaries are still tried after the
+    healthy ones, and fallback routes (e.g. the dummy provider) only after
+    every primary.
+
+    Full responses fail over to the next route on retryable upstream errors
+    (and open circuits). Streams fail over only until the first token has
+    been delivered. Other errors, such as a 4xx for a bad request, are
+    raised as-is: another backend would reject the request too, and they
+    do not count against the route's health.
+    """
+
+    def __init__(
+        self,
+        routes: list[Route],
+        *,
+        alpha: float = 0.3,
+        max_error_rate: float = 0.5,
+        cooldown_seconds: float = 10.0,
+    ) -> None:
+        if not routes:
+            raise ValueError("RoutingProvider requires at least one route")
+        self.routes = routes
+        self.alpha = alpha
+        self.max_error_rate = max_error_rate
+        self.cooldown_seconds = cooldown_seconds
+        self.failovers = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {"failovers": self.failovers, "routes": [r.stats() for r in self.routes]}
+
+    def healthy(self, route: Route) -> bool:
+        if route.circuit_open:
+            return False
+        if route.error_rate <= self.max_error_rate or route.last_failure is None:
+            return True
+        # Let an unhealthy route take traffic again once it has cooled down.
+        return time.monotonic() - route.last_failure >= self.cooldown_seconds
+
+    def ranked(self) -> list[Route]:
+        """Routes in the order they should be tried for the next call."""
+
+        primaries = [r for r in self.routes if not r.fallback]
+        healthy = [r for r in primaries if self.healthy(r)]
+        healthy.sort(key=lambda r: -1.0 if r.latency is None else r.latency)
+        unhealthy = [r for r in primaries if r not in healthy]
+        return healthy + unhealthy + [r for r in self.routes if r.fallback]
+
+    async def health_check(self) -> bool:
+        """Return True if any primary route's upstream is reachable."""
+
+        for route in self.ranked():
+            if route.fallback:
+                continue
+            try:
+                if await route.provider.health_check():
+                    return True
+            except Exception:
+                logger.warning("Health check failed for LLM route %s", route.label, exc_info=True)
+        return False
+
+    async def startup(self) -> None:
+        for route in self.routes:
+            await route.provider.startup()
+
+    async def aclose(self) -> None:
+        for route in self.routes:
+            try:
+                await route.provider.aclose()
+            except Exception:
+                logger.exception("Failed to close LLM route %s", route.label)
+
+    async def generate(self, prompt: str) -> str:
+        return await self._call(lambda p: p.generate(prompt))
+
+    async def generate_messages(self, messages: list[ChatMessage]) -> str:
+        return await self._call(lambda p: p.generate_messages(messages))
+
+    async def stream(self, prompt: str, on_token: Callable[[str], Any]):
+        await self._stream(lambda p, cb: p.stream(prompt, cb), on_token)
+
+    async def stream_messages(self, messages: list[ChatMessage], on_token: Callable[[str], Any]):
+        await self._stream(lambda p, cb: p.stream_messages(messages, cb), on_token)
+
+    async def _call(self, fn: Callable[[LLMProvider], Awaitable[T]]) -> T:
+        error: Exception | None = None
+        for i, route in enumerate(self.ranked()):
+            if i:
+                self.failovers += 1
+            started = time.perf_counter()
+            try:
+                result = await fn(route.provider)
+            except Exception as exc:
+                if not _fails_over(exc):
+                    raise
+                route.observe(ok=False, latency=None, alpha=self.alpha)
+                logger.warning("LLM route %s failed: %s", route.label, exc)
+                error = error or exc
+                continue
+            route.observe(ok=True, latency=time.perf_counter() - started, alpha=self.alpha)
+            return result
+        raise error
+
+    async def _stream(
+        self,
+        fn: Callable[[LLMProvider, Callable[[str], Any]], Awaitable[Any]],
+        on_token: Callable[[str], Any],
+    ) -> None:
+        emitted = False
+
+        async def forward(tok: str) -> None:
+            nonlocal emitted
+            emitted = True
+            result = on_token(tok)
+            if hasattr(result, "__await__"):
+                await result
+
+        error: Exception | None = None
+        for i, route in enumerate(self.ranked()):
+            if i:
+                self.failovers += 1
+            try:
+                await fn(route.provider, forward)
+            except Exception as exc:
+                if not _fails_over(exc):
+                    raise
+                route.observe(ok=False, latency=None, alpha=self.alpha)
+                if emitted:
+                    raise
+                logger.warning("LLM route %s failed: %s", route.label, exc)
+                error = error or exc
+                continue
+            # Stream duration depends on output length, so it does not feed the latency EWMA.
+            route.observe(ok=True, latency=None, alpha=self.alpha)
+            return
+        raise error
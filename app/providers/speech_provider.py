@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from app.schemas.voice import NormalizedTranscript
+from app.services.wav import HEADER_SIZE, wav_header
 
 
 class SpeechProvider(ABC):
@@ -34,6 +35,34 @@ class SpeechProvider(ABC):
     ) -> NormalizedTranscript:
         """Speech-to-text from canonical WAV audio."""
 
+    async def transcribe_stream(
+        self,
+        *,
+        pcm: AsyncIterator[bytes],
+        sample_rate_hz: int,
+        pcm_bytes: Optional[int] = None,
+        language: Optional[str] = None,
+        request_id: Optional[str] = None,
+    ) -> NormalizedTranscript:
+        """Speech-to-text from PCM16 mono audio delivered as a stream.
+
+        `pcm_bytes` is the payload size when known up front. Providers that
+        can forward a streamed body upstream should override this; the
+        default collects the audio and calls transcribe_wav().
+        """
+
+        buf = bytearray(wav_header(sample_rate_hz, pcm_bytes))
+        async for chunk in pcm:
+            buf += chunk
+        if pcm_bytes is None:
+            buf[:HEADER_SIZE] = wav_header(sample_rate_hz, len(buf) - HEADER_SIZE)
+        return await self.transcribe_wav(
+            wav_bytes=bytes(buf),
+            sample_rate_hz=sample_rate_hz,
+            language=language,
+            request_id=request_id,
+        )
+
     async def list_voices(self) -> list[dict]:
         """Return available voices.
 
@@ -42,6 +71,21 @@ class SpeechProvider(ABC):
 
         raise NotImplementedError("Voice listing not supported")
 
+    def resolve_synthesis(
+        self,
+        *,
+        language: Optional[str] = None,
+        voice: Optional[str] = None,
+        output_format: Optional[str] = None,
+    ) -> tuple[str | None, str | None, str | None]:
+        """Return the (voice, language, output_format) synthesize_text would use.
+
+        Providers that fill in configured defaults should override this, so
+        callers (e.g. the TTS cache) see the effective values.
+        """
+
+        return voice, language, output_format
+
     async def synthesize_text(
         self,
         *,
@@ -1,21 +1,30 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+import asyncio
+import json
+import logging
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
 from app.schemas.interaction import NormalizedInteractionInput
 from app.schemas.interaction_request import TextInteractionRequest
+from app.services.interaction_stream import interaction_events, new_token_stream
+from app.services.token_stream import HEARTBEAT, sse_event, stream_stats, wait_for_disconnect
 
 
 from app.services.orchestrator import orchestrator
 
+logger = logging.getLogger(__name__)
+
 
 router = APIRouter(prefix="/interactions", tags=["interactions"])
 
 
-@router.post("", response_model=dict)
-async def create_interaction(body: TextInteractionRequest) -> dict:
-    # 1. Create normalized input
-    interaction = NormalizedInteractionInput(
+def _normalize(body: TextInteractionRequest) -> NormalizedInteractionInput:
+    return NormalizedInteractionInput(
         session_id=body.session_id,
         input_type="text",
         raw_input_ref=None,
@@ -23,6 +32,12 @@ async def create_interaction(body: TextInteractionRequest) -> dict:
         language=body.language,
     )
 
+
+@router.post("", response_model=dict)
+async def create_interaction(body: TextInteractionRequest) -> dict:
+    # 1. Create normalized input
+    interaction = _normalize(body)
+
     # 2. Process with orchestrator
     response_text = await orchestrator.process_interaction(interaction)
 
@@ -32,3 +47,73 @@ async def create_interaction(body: TextInteractionRequest) -> dict:
         "response_text": response_text
     }
 
+
+@router.post("/stream")
+async def stream_interaction(body: TextInteractionRequest, request: Request) -> StreamingResponse:
+    """Server-sent events variant of POST /interactions."""
+
+    interaction = _normalize(body)
+
+    async def event_iter() -> AsyncIterator[bytes]:
+        stream = new_token_stream()
+        events = interaction_events(interaction, stream)
+
+        async def watch_disconnect() -> None:
+            # Ending the stream cancels the orchestrator's upstream call.
+            await wait_for_disconnect(request)
+            stream_stats.disconnected += 1
+            stream.abort()
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            async for event, data in events:
+                if event == "ping":
+                    yield HEARTBEAT
+                elif event == "done":
+                    yield sse_event(json.dumps(data), event="done")
+                else:
+                    yield sse_event(data, event=event)
+        except Exception:
+            logger.exception("Interaction stream failed")
+            yield sse_event("Interaction stream failed", event="error")
+        finally:
+            watcher.cancel()
+            await events.aclose()
+
+    return StreamingResponse(event_iter(), media_type="text/event-stream")
+
+
+@router.websocket("/ws")
+async def interaction_ws(websocket: WebSocket) -> None:
+    """WebSocket variant: one JSON TextInteractionRequest per turn.
+
+    Replies are JSON messages {"type": "token" | "sentence" | "ping" | "done" | "error", ...}.
+    """
+
+    await websocket.accept()
+    try:
+        while True:
+            try:
+                body = TextInteractionRequest.model_validate(await websocket.receive_json())
+            except (ValidationError, ValueError) as exc:
+                await websocket.send_json({"type": "error", "detail": str(exc)})
+                continue
+
+            events = interaction_events(_normalize(body), new_token_stream())
+            try:
+                async for event, data in events:
+                    if event == "done":
+                        await websocket.send_json({"type": "done", **data})
+                    elif event == "ping":
+                        await websocket.send_json({"type": "ping"})
+                    else:
+                        await websocket.send_json({"type": event, "text": data})
+            except WebSocketDisconnect:
+                raise
+            except Exception:
+                logger.exception("Interaction stream failed")
+                await websocket.send_json({"type": "error", "detail": "Interaction stream failed"})
+            finally:
+                await events.aclose()
+    except WebSocketDisconnect:
+        pass
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, AsyncIterator
+import contextlib
+import logging
+from typing import AsyncIterator
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
 from fastapi.responses import StreamingResponse
 
+from app.core import config
 from app.dependencies import get_llm_provider
 from app.providers.llm_provider import LLMProvider
 from app.schemas.llm import (
@@ -14,7 +17,17 @@ from app.schemas.llm import (
     LLMHealthResponse,
     LLMModelsResponse,
 )
-from app.services.model_selector import model_selector
+from app.services.admission import AdmissionRejected, Priority, llm_admission
+from app.services.interaction_stream import new_token_stream
+from app.services.llm_handler import llm_handler
+from app.services.token_stream import (
+    HEARTBEAT,
+    sse_event,
+    stream_stats,
+    wait_for_disconnect,
+)
+
+logger = logging.getLogger(__name__)
 
 
 router = APIRouter(prefix="/llm", tags=["llm"])
@@ -24,7 +37,7 @@ router = APIRouter(prefix="/llm", tags=["llm"])
 async def llm_health(provider: LLMProvider = Depends(get_llm_provider)) -> LLMHealthResponse:
     # We can't do a full upstream health check generically.
     # If provider instantiation succeeded, report ok.
-    return LLMHealthResponse(status="ok", provider=provider.__class__.__name__)
+    return LLMHealthResponse(status="ok", provider=provider.name)
 
 
 @router.get("/models", response_model=LLMModelsResponse)
@@ -36,19 +49,33 @@ async def llm_models() -> LLMModelsResponse:
         models=[
             {"id": "dummy", "label": "Dummy (local test)"},
             {"id": "openai", "label": "OpenAI-compatible"},
+            {"id": "offline", "label": "Local model server"},
         ],
     )
 
 
 @router.post("/generate", response_model=LLMGenerateResponse)
-async def llm_generate(body: LLMGenerateRequest) -> LLMGenerateResponse:
+async def llm_generate(
+    body: LLMGenerateRequest,
+    cache_control: str | None = Header(None),
+) -> LLMGenerateResponse:
     try:
-        provider_name = body.provider
-        selected = model_selector.select(provider_name or "", body.llm_model)
+        llm_handler.select_provider(body.provider, llm_model=body.llm_model)
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    text = await selected.generate(body.prompt)
+    # `Cache-Control: no-cache` (or no-store) skips the response cache for this request.
+    directives = {d.strip() for d in (cache_control or "").lower().split(",")}
+    use_cache = not ({"no-cache", "no-store"} & directives)
+
+    text = await llm_handler.generate_response(
+        body.prompt,
+        provider=body.provider,
+        llm_model=body.llm_model,
+        use_cache=use_cache,
+        priority=Priority.BATCH,
+    )
+
     return LLMGenerateResponse(
         provider=(body.provider or "configured"),
         model=body.llm_model,
@@ -58,32 +85,53 @@ async def llm_generate(body: LLMGenerateRequest) -> LLMGenerateResponse:
 
 
 @router.post("/stream")
-async def llm_stream(body: LLMGenerateRequest) -> StreamingResponse:
+async def llm_stream(body: LLMGenerateRequest, request: Request) -> StreamingResponse:
     try:
-        selected = model_selector.select(body.provider or "", body.llm_model)
+        llm_handler.select_provider(body.provider, llm_model=body.llm_model)
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    queue: asyncio.Queue[str | None] = asyncio.Queue()
+    # Reject before the response starts; once streaming, a 503 can no longer be sent.
+    if llm_admission.get(body.provider or config.LLM_PROVIDER).saturated:
+        raise AdmissionRejected("Upstream LLM queue is full")
 
-    async def on_token(tok: str) -> Any:
-        await queue.put(tok)
+    # Bounded: a slow client pauses the provider instead of buffering the whole reply.
+    stream = new_token_stream()
 
     async def run_stream() -> None:
         try:
-            await selected.stream(body.prompt, on_token)
-        finally:
-            await queue.put(None)
+            await llm_handler.stream_response(
+                body.prompt,
+                provider=body.provider,
+                on_token=stream.put,
+                llm_model=body.llm_model,
+                priority=Priority.BATCH,
+            )
+        except Exception as exc:
+            await stream.close(exc)
+        else:
+            await stream.close()
+
+    async def watch_disconnect(producer: asyncio.Task) -> None:
+        await wait_for_disconnect(request)
+        stream_stats.disconnected += 1
+        producer.cancel()
+        stream.abort()
 
     async def event_iter() -> AsyncIterator[bytes]:
-        task = asyncio.create_task(run_stream())
+        producer = asyncio.create_task(run_stream())
+        watcher = asyncio.create_task(watch_disconnect(producer))
         try:
-            while True:
-                item = await queue.get()
-                if item is None:
-                    break
-                yield f"data: {item}\n\n".encode("utf-8")
+            async for frame in stream.frames():
+                yield HEARTBEAT if frame is None else sse_event(frame)
+        except Exception:
+            logger.exception("LLM stream failed")
+            yield sse_event("LLM stream failed", event="error")
         finally:
-            task.cancel()
+            # Stop the upstream call as soon as the client is gone (or we are done).
+            watcher.cancel()
+            producer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await producer
 
     return StreamingResponse(event_iter(), media_type="text/event-stream")
@@ -3,17 +3,290 @@ from __future__ import annotations
 from fastapi import APIRouter
 from fastapi.responses import PlainTextResponse
 
+from app.core.http import http_clients
+from app.core.metrics import registry
+from app.services.admission import llm_admission
+from app.services.context_service import context
+from app.services.health_monitor import health_monitor
+from app.services.llm_handler import llm_handler, response_cache
+from app.services.model_selector import model_selector
+from app.services.token_stream import stream_stats
+from app.services.tts_cache import tts_cache
+
 
 router = APIRouter(tags=["metrics"])
 
+# Component state is kept by the components themselves; the collectors below
+# copy it into registry metrics before every snapshot/render, so it is merged
+# across workers like the rest. Histograms are observed at the source.
+
+pool_connections = registry.gauge(
+    "bot_backend_http_pool_connections",
+    "Upstream HTTP pool connections by state",
+    ("client", "state"),
+)
+pool_max_connections = registry.gauge(
+    "bot_backend_http_pool_max_connections",
+    "Configured pool size",
+    ("client",),
+)
+pool_requests = registry.counter(
+    "bot_backend_http_requests_total",
+    "Upstream HTTP requests sent through the pool",
+    ("client",),
+)
+
+dependency_up = registry.gauge(
+    "bot_backend_dependency_up",
+    "Last background probe result per dependency (1 ok, 0 unhealthy in any worker)",
+    ("dependency",),
+    merge="min",
+)
+dependency_probe_seconds = registry.gauge(
+    "bot_backend_dependency_probe_seconds",
+    "Duration of the last probe per dependency (slowest worker)",
+    ("dependency",),
+    merge="max",
+)
+health_rounds = registry.counter(
+    "bot_backend_health_check_rounds_total",
+    "Background health check rounds completed",
+)
+
+sessions = registry.gauge("bot_backend_sessions", "Sessions held in the context store")
+session_messages = registry.gauge("bot_backend_session_messages", "Messages held across all sessions")
+session_bytes = registry.gauge("bot_backend_session_bytes", "Approximate memory used by session messages")
+sessions_evicted = registry.counter(
+    "bot_backend_sessions_evicted_total",
+    "Sessions evicted from the context store",
+    ("reason",),
+)
+session_messages_trimmed = registry.counter(
+    "bot_backend_session_messages_trimmed_total",
+    "Messages trimmed by the per-session cap",
+)
+
+llm_cache_requests = registry.counter(
+    "bot_backend_llm_cache_requests_total",
+    "LLM response cache lookups by result",
+    ("result",),
+)
+llm_cache_entries = registry.gauge("bot_backend_llm_cache_entries", "LLM responses held in the cache")
+llm_cache_evictions = registry.counter(
+    "bot_backend_llm_cache_evictions_total",
+    "LLM cache entries evicted by the size bound",
+)
+
+tts_cache_requests = registry.counter(
+    "bot_backend_tts_cache_requests_total",
+    "TTS audio cache lookups by result and tier",
+    ("result", "tier"),
+)
+tts_cache_entries = registry.gauge("bot_backend_tts_cache_entries", "TTS audio entries held per tier", ("tier",))
+tts_cache_bytes = registry.gauge("bot_backend_tts_cache_bytes", "Bytes of TTS audio held per tier", ("tier",))
+tts_cache_evictions = registry.counter(
+    "bot_backend_tts_cache_evictions_total",
+    "TTS cache entries evicted by the size bound per tier",
+    ("tier",),
+)
+
+coalesced_calls = registry.counter(
+    "bot_backend_llm_coalesced_calls_total",
+    "LLM calls by single-flight role",
+    ("role",),
+)
+coalesced_in_flight = registry.gauge("bot_backend_llm_coalesced_in_flight", "Distinct LLM calls currently in flight")
+
+llm_in_flight = registry.gauge("bot_backend_llm_in_flight", "Upstream LLM calls currently running", ("provider",))
+llm_queued = registry.gauge("bot_backend_llm_queued", "Upstream LLM calls waiting for a slot", ("provider",))
+llm_rejected = registry.counter(
+    "bot_backend_llm_rejected_total",
+    "Upstream LLM calls rejected because the queue was full",
+    ("provider",),
+)
+
+streams_active = registry.gauge("bot_backend_llm_streams_active", "LLM token streams currently being sent")
+stream_queue_depth = registry.gauge("bot_backend_llm_stream_queue_depth", "Tokens buffered across active streams")
+streams = registry.counter("bot_backend_llm_streams_total", "Finished LLM token streams by outcome", ("outcome",))
+stream_backpressure = registry.counter(
+    "bot_backend_llm_stream_backpressure_total",
+    "Token writes that waited for a full stream queue",
+)
+
+circuit_open = registry.gauge(
+    "bot_backend_llm_circuit_open",
+    "Whether the upstream LLM circuit is open (1) or half-open (0.5) in any worker",
+    ("provider", "model"),
+    merge="max",
+)
+resilience_counters = {
+    key: registry.counter(f"bot_backend_llm_{metric}_total", help_text, ("provider", "model"))
+    for metric, key, help_text in (
+        ("retries", "retries", "Upstream LLM calls retried after a transient error"),
+        ("failures", "failures", "Transient upstream LLM failures"),
+        ("circuit_rejected", "rejected", "LLM calls rejected while the circuit was open"),
+        ("hedges", "hedges", "Hedged (duplicate) upstream LLM requests sent"),
+    )
+}
+
+route_latency = registry.gauge(
+    "bot_backend_llm_route_latency_seconds",
+    "EWMA latency of full LLM responses per route (slowest worker)",
+    ("route", "model"),
+    merge="max",
+)
+route_error_rate = registry.gauge(
+    "bot_backend_llm_route_error_rate",
+    "EWMA error rate per route (highest worker)",
+    ("route", "model"),
+    merge="max",
+)
+route_healthy = registry.gauge(
+    "bot_backend_llm_route_healthy",
+    "Whether a route currently takes traffic first in every worker",
+    ("route", "model"),
+    merge="min",
+)
+route_requests = registry.counter(
+    "bot_backend_llm_route_requests_total",
+    "LLM calls sent to each route",
+    ("route", "model"),
+)
+route_failovers = registry.counter(
+    "bot_backend_llm_route_failovers_total",
+    "LLM calls retried on another route",
+    ("model",),
+)
+
+
+def _http_pool_metrics() -> None:
+    stats = http_clients.stats()
+    connections = {}
+    for name, s in stats.items():
+        connections[(name, "active")] = s["active_connections"]
+        connections[(name, "idle")] = s["idle_connections"]
+    pool_connections.replace(connections)
+    pool_max_connections.replace({(name,): s["max_connections"] for name, s in stats.items()})
+    pool_requests.replace({(name,): s["requests_total"] for name, s in stats.items()})
+
+
+def _health_metrics() -> None:
+    results = health_monitor.results
+    dependency_up.replace(
+        {(name,): int(r.status == "ok") for name, r in results.items() if r.status != "disabled"}
+    )
+    dependency_probe_seconds.replace(
+        {(name,): r.latency_seconds for name, r in results.items() if r.latency_seconds is not None}
+    )
+    health_rounds.replace({(): health_monitor.rounds})
+
+
+def _session_metrics() -> None:
+    s = context.stats()
+    if not s:
+        # Shared backends do not track per-process accounting.
+        return
+    sessions.set((), s["sessions"])
+    session_messages.set((), s["messages"])
+    session_bytes.set((), s["approx_bytes"])
+    sessions_evicted.replace({("lru",): s["evicted_lru"], ("ttl",): s["evicted_ttl"]})
+    session_messages_trimmed.replace({(): s["trimmed_messages"]})
+
+
+def _llm_cache_metrics() -> None:
+    if response_cache is None:
+        return
+    s = response_cache.stats()
+    llm_cache_requests.replace({("hit",): s["hits"], ("miss",): s["misses"]})
+    llm_cache_entries.set((), s["entries"])
+    llm_cache_evictions.replace({(): s["evictions"]})
+
+
+def _tts_cache_metrics() -> None:
+    if tts_cache is None:
+        return
+    s = tts_cache.stats()
+    tts_cache_requests.replace({
+        ("hit", "memory"): s["memory_hits"],
+        ("hit", "disk"): s["disk_hits"],
+        ("miss", ""): s["misses"],
+    })
+    tts_cache_entries.replace({("memory",): s["memory_entries"], ("disk",): s["disk_entries"]})
+    tts_cache_bytes.replace({("memory",): s["memory_bytes"], ("disk",): s["disk_bytes"]})
+    tts_cache_evictions.replace({("memory",): s["memory_evictions"], ("disk",): s["disk_evictions"]})
+
+
+def _single_flight_metrics() -> None:
+    if llm_handler.single_flight is None:
+        return
+    s = llm_handler.single_flight.stats()
+    coalesced_calls.replace({("leader",): s["leaders"], ("follower",): s["followers"]})
+    coalesced_in_flight.set((), s["in_flight"])
+
+
+def _admission_metrics() -> None:
+    controllers = llm_admission.controllers
+    llm_in_flight.replace({(name,): c.in_flight for name, c in controllers.items()})
+    llm_queued.replace({(name,): c.queued for name, c in controllers.items()})
+    llm_rejected.replace({(name,): c.rejected for name, c in controllers.items()})
+
+
+def _stream_metrics() -> None:
+    s = stream_stats
+    streams_active.set((), len(s.active))
+    stream_queue_depth.set((), s.queue_depth)
+    streams.replace({("completed",): s.completed, ("disconnected",): s.disconnected})
+    stream_backpressure.replace({(): s.backpressure_waits})
+
+
+def _resilience_metrics() -> None:
+    providers = [
+        ((label, model or ""), instance.stats())
+        for label, model, instance in model_selector.resilient_instances()
+    ]
+    state_value = {"closed": 0, "half_open": 0.5, "open": 1}
+    circuit_open.replace({labels: state_value[s["circuit_state"]] for labels, s in providers})
+    for key, counter in resilience_counters.items():
+        counter.replace({labels: s[key] for labels, s in providers})
+
+
+def _routing_metrics() -> None:
+    routers = model_selector.routers()
+    routes = [
+        ((route.label, model or ""), routing, route)
+        for model, routing in routers
+        for route in routing.routes
+    ]
+    route_latency.replace({labels: route.latency for labels, _, route in routes if route.latency is not None})
+    route_error_rate.replace({labels: route.error_rate for labels, _, route in routes})
+    route_healthy.replace({labels: int(routing.healthy(route)) for labels, routing, route in routes})
+    route_requests.replace({labels: route.requests for labels, _, route in routes})
+    route_failovers.replace({(model or "",): routing.failovers for model, routing in routers})
+
+
+for _collector in (
+    _http_pool_metrics,
+    _health_metrics,
+    _session_metrics,
+    _llm_cache_metrics,
+    _tts_cache_metrics,
+    _single_flight_metrics,
+    _admission_metrics,
+    _stream_metrics,
+    _resilience_metrics,
+    _routing_metrics,
+):
+    registry.add_collector(_collector)
+
 
 @router.get("/metrics")
 async def metrics() -> PlainTextResponse:
-    # Minimal Prometheus-compatible endpoint.
-    # Expand with real counters/histograms when you add middleware instrumentation.
+    # Everything goes through the registry, so with METRICS_MULTIPROC_DIR set
+    # every worker's metrics are merged into one scrape.
     body = (
         "# HELP bot_backend_build_info Build and runtime info\n"
         "# TYPE bot_backend_build_info gauge\n"
         "bot_backend_build_info{service=\"bot-backend\"} 1\n"
     )
+    body += registry.render()
     return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
@@ -13,6 +13,7 @@ from app.schemas.sessions import (
 )
 
 from app.services.context_service import context
+from app.services.orchestrator import orchestrator
 
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
@@ -21,13 +22,13 @@ router = APIRouter(prefix="/sessions", tags=["sessions"])
 @router.post("", response_model=SessionCreateResponse)
 async def create_session() -> SessionCreateResponse:
     session_id = str(uuid.uuid4())
-    context.set(session_id, {})
+    await context.set(session_id, {})
     return SessionCreateResponse(session_id=session_id)
 
 
 @router.get("/{session_id}", response_model=SessionStateResponse)
 async def get_session(session_id: str) -> SessionStateResponse:
-    state = context.get(session_id)
+    state = await context.get(session_id)
     if state is None:
         raise HTTPException(status_code=404, detail="Session not found")
     return SessionStateResponse(session_id=session_id, state=state)
@@ -35,13 +36,15 @@ async def get_session(session_id: str) -> SessionStateResponse:
 
 @router.delete("/{session_id}")
 async def delete_session(session_id: str) -> dict[str, str]:
-    context.reset(session_id)
+    await context.reset(session_id)
+    # Also drop the cached prompt window so a reused ID starts clean.
+    orchestrator.history.discard(session_id)
     return {"status": "ok"}
 
 
 @router.get("/{session_id}/messages", response_model=SessionMessagesResponse)
 async def list_messages(session_id: str) -> SessionMessagesResponse:
-    messages = context.get_messages(session_id)
+    messages = await context.get_messages(session_id)
     if messages is None:
         raise HTTPException(status_code=404, detail="Session not found")
     return SessionMessagesResponse(session_id=session_id, messages=messages)
@@ -49,20 +52,19 @@ async def list_messages(session_id: str) -> SessionMessagesResponse:
 
 @router.post("/{session_id}/messages", response_model=SessionMessagesResponse)
 async def add_message(session_id: str, body: SessionAddMessageRequest) -> SessionMessagesResponse:
-    ok = context.add_message(session_id, role=body.role, content=body.content)
+    ok = await context.add_message(session_id, role=body.role, content=body.content)
     if not ok:
         raise HTTPException(status_code=404, detail="Session not found")
-    return SessionMessagesResponse(session_id=session_id, messages=context.get_messages(session_id) or [])
+    return SessionMessagesResponse(session_id=session_id, messages=await context.get_messages(session_id) or [])
 
 
 @router.patch("/{session_id}", response_model=SessionStateResponse)
 async def update_session_state(session_id: str, body: SessionUpdateStateRequest) -> SessionStateResponse:
-    if not context.exists(session_id):
+    if not await context.exists(session_id):
         raise HTTPException(status_code=404, detail="Session not found")
     
     data = body.model_dump(exclude_unset=True)
-    for k, v in data.items():
-        context.update_state(session_id, k, v)
-        
-    return SessionStateResponse(session_id=session_id, state=context.get(session_id) or {})
+    await context.update_states(session_id, data)
+
+    return SessionStateResponse(session_id=session_id, state=await context.get(session_id) or {})
 
@@ -3,40 +3,65 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends
 
 from app.core import config
-from app.dependencies import get_db, get_llm_provider, get_speech_provider
-from app.providers.disabled_speech_provider import DisabledSpeechProvider
+from app.dependencies import get_llm_provider
 from app.providers.llm_provider import LLMProvider
-from app.providers.speech_provider import SpeechProvider
-from app.schemas.status import DependencyStatus, SystemStatusResponse
+from app.providers.resilient_provider import ResilientProvider
+from app.providers.routing_provider import RoutingProvider
+from app.schemas.status import (
+    DependencyStatus,
+    LLMResilienceStatus,
+    LLMRouteStatus,
+    SystemStatusResponse,
+)
+from app.services.health_monitor import ProbeResult, health_monitor
+from app.services.model_selector import model_selector
 
 
 router = APIRouter(prefix="/status", tags=["status"])
 
 
+def _dependency(result: ProbeResult) -> DependencyStatus:
+    return DependencyStatus(
+        status=result.status,
+        detail=result.detail,
+        latency_seconds=result.latency_seconds,
+        checked_at=result.checked_at,
+    )
+
+
 @router.get("", response_model=SystemStatusResponse)
 async def system_status(
     llm: LLMProvider = Depends(get_llm_provider),
-    voice: SpeechProvider = Depends(get_speech_provider),
-    _db=Depends(get_db),
 ) -> SystemStatusResponse:
-    # Database health: if dependency injected, consider it ok.
-    db_status = DependencyStatus(status="ok")
-
-    # LLM health: if provider resolved, ok.
-    llm_status = DependencyStatus(status="ok", detail=llm.__class__.__name__)
-
-    # Voice health:
-    if isinstance(voice, DisabledSpeechProvider):
-        voice_status = DependencyStatus(status="disabled")
-    else:
-        try:
-            ok = await voice.health_check()
-            voice_status = DependencyStatus(status="ok" if ok else "unhealthy")
-        except Exception as exc:
-            voice_status = DependencyStatus(status="unhealthy", detail=str(exc))
+    # Probe results come from the background health monitor; no upstream calls here.
+    db_status = _dependency(health_monitor.get("database"))
+    voice_status = _dependency(health_monitor.get("voice"))
+
+    # LLM health: last probe, overridden by the live circuit/routing state.
+    llm_status = _dependency(health_monitor.get("llm"))
+    if isinstance(llm, ResilientProvider) and llm.breaker.state == "open":
+        llm_status = llm_status.model_copy(
+            update={"status": "unhealthy", "detail": f"{llm.name}: circuit open"}
+        )
+    if isinstance(llm, RoutingProvider) and not any(
+        llm.healthy(r) for r in llm.routes if not r.fallback
+    ):
+        llm_status = llm_status.model_copy(
+            update={"status": "unhealthy", "detail": f"{llm.name}: no healthy route"}
+        )
+
+    resilience = [
+        LLMResilienceStatus(provider=label, model=model, **instance.stats())
+        for label, model, instance in model_selector.resilient_instances()
+    ]
+    routes = [
+        LLMRouteStatus(model=model, healthy=routing.healthy(route), **route.stats())
+        for model, routing in model_selector.routers()
+        for route in routing.routes
+    ]
 
     overall = "ok"
-    if voice_status.status in {"unhealthy"}:
+    if "unhealthy" in {voice_status.status, llm_status.status, db_status.status}:
         overall = "degraded"
 
     return SystemStatusResponse(
@@ -45,5 +70,7 @@ async def system_status(
         llm=llm_status,
         voice=voice_status,
         database=db_status,
+        llm_resilience=resilience,
+        llm_routes=routes,
         tags=["gateway", "fastapi"],
     )
@@ -1,41 +1,47 @@
 import asyncio
 import base64
-import io
+import json
+import logging
 import uuid
-import wave
+from typing import AsyncIterator
 
 import websockets
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
 from websockets.exceptions import ConnectionClosed
 
 from app.core import config
+from app.core.tracing import tracer
 from app.dependencies import get_speech_provider
 from app.providers.microsoft_voice_live_provider import MicrosoftVoiceLiveError
 from app.providers.disabled_speech_provider import DisabledSpeechProvider
 from app.providers.speech_provider import SpeechProvider
+from app.schemas.interaction import NormalizedInteractionInput
 from app.schemas.voice import (
     NormalizedTranscript,
+    SpokenReplyRequest,
     SynthesizeRequest,
     SynthesizeResponse,
     TranscribeAudioRequest,
     VoiceInfo,
 )
+from app.services.audio_upload import AudioUploadError, PcmUpload
+from app.services.health_monitor import health_monitor
+from app.services.interaction_stream import interaction_events, new_token_stream
+from app.services.speech_pipeline import SpeechPipeline, speak_events
+from app.services.token_stream import HEARTBEAT, sse_event, stream_stats, wait_for_disconnect
+from app.services.voice_catalog import etag_matches, voice_catalog
+
+logger = logging.getLogger(__name__)
 
 
 router = APIRouter(prefix="/voice", tags=["voice"])
 
 
 @router.get("/health")
-async def voice_health(provider: SpeechProvider = Depends(get_speech_provider)) -> dict[str, str]:
-    if isinstance(provider, DisabledSpeechProvider):
-        return {"status": "disabled"}
-
-    try:
-        ok = await provider.health_check()
-    except Exception:
-        return {"status": "unhealthy"}
-
-    return {"status": "ok" if ok else "unhealthy"}
+async def voice_health() -> dict[str, str]:
+    # Served from the background health monitor's last probe.
+    return {"status": health_monitor.get("voice").status}
 
 
 @router.post("/transcribe", response_model=NormalizedTranscript)
@@ -51,23 +57,23 @@ async def transcribe_audio(
             request_id=body.request_id,
         )
 
-    raw_pcm = base64.b64decode(body.audio.audio_b64)
+    with tracer.span("voice.decode"):
+        raw_pcm = base64.b64decode(body.audio.audio_b64)
 
     sample_rate = body.audio.sample_rate_hz
     request_id = body.request_id or str(uuid.uuid4())
     language = body.language
 
-    buf = io.BytesIO()
-    with wave.open(buf, "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-        wf.writeframes(raw_pcm)
+    # The provider frames the PCM with a WAV header and sends both parts as
+    # they are, so the decoded audio is not copied again.
+    async def pcm() -> AsyncIterator[memoryview]:
+        yield memoryview(raw_pcm)
 
     try:
-        return await provider.transcribe_wav(
-            wav_bytes=buf.getvalue(),
+        return await provider.transcribe_stream(
+            pcm=pcm(),
             sample_rate_hz=sample_rate,
+            pcm_bytes=len(raw_pcm),
             language=language,
             request_id=request_id,
         )
@@ -77,22 +83,69 @@ async def transcribe_audio(
         raise HTTPException(status_code=502, detail="STT request failed") from exc
 
 
+@router.post("/transcribe/stream", response_model=NormalizedTranscript)
+async def transcribe_audio_stream(
+    request: Request,
+    language: str | None = None,
+    request_id: str | None = None,
+    provider: SpeechProvider = Depends(get_speech_provider),
+) -> NormalizedTranscript:
+    """Speech-to-text from a raw body: `audio/L16; rate=16000` (big-endian PCM16 mono) or PCM WAV.
+
+    Chunked uploads are accepted. The audio is validated as it arrives and
+    forwarded upstream as a stream rather than buffered.
+    """
+
+    content_length = request.headers.get("content-length")
+    if content_length is not None and not content_length.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid Content-Length")
+
+    try:
+        upload = PcmUpload(
+            request.stream(),
+            request.headers.get("content-type"),
+            content_length=int(content_length) if content_length else None,
+        )
+        with tracer.span("voice.upload_header", content_type=upload.media_type):
+            await upload.open()
+        return await provider.transcribe_stream(
+            pcm=upload.pcm(),
+            sample_rate_hz=upload.sample_rate_hz,
+            pcm_bytes=upload.pcm_bytes,
+            language=language,
+            request_id=request_id or str(uuid.uuid4()),
+        )
+    except AudioUploadError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+    except MicrosoftVoiceLiveError as exc:
+        raise HTTPException(status_code=502, detail=str(exc)) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail="STT request failed") from exc
+
+
 @router.get("/voices", response_model=list[VoiceInfo])
 async def list_voices(
+    request: Request,
+    locale: str | None = None,
+    gender: str | None = None,
     provider: SpeechProvider = Depends(get_speech_provider),
-) -> list[VoiceInfo]:
-    try:
-        voices = await provider.list_voices()
-    except NotImplementedError:
-        return []
-    except Exception:
-        return []
+) -> Response:
+    """List voices, optionally filtered by locale ("en-US" or "en") and gender.
+
+    Served from the cached voice catalogue; clients can revalidate with
+    If-None-Match.
+    """
+
+    with tracer.span("voice.catalog"):
+        snapshot = await voice_catalog.get(provider)
+    if snapshot is None:
+        return Response(b"[]", media_type="application/json")
 
-    out: list[VoiceInfo] = []
-    for v in voices:
-        if isinstance(v, dict) and v.get("name"):
-            out.append(VoiceInfo(**v))
-    return out
+    body, etag = snapshot.render(locale, gender)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 @router.post("/synthesize", response_model=SynthesizeResponse)
@@ -116,16 +169,92 @@ async def synthesize(
     except Exception as exc:
         raise HTTPException(status_code=502, detail="TTS request failed") from exc
 
+    with tracer.span("voice.encode", bytes=len(audio_bytes)):
+        audio_b64 = base64.b64encode(audio_bytes).decode("ascii")
+
     return SynthesizeResponse(
         request_id=final_rid,
         provider=getattr(provider, "name", provider.__class__.__name__),
         voice=voice_used,
         mime_type=mime,
-        audio_b64=base64.b64encode(audio_bytes).decode("ascii"),
+        audio_b64=audio_b64,
         raw=None if not isinstance(provider, DisabledSpeechProvider) else {"status": "disabled"},
     )
 
 
+@router.post("/respond")
+async def spoken_reply(
+    body: SpokenReplyRequest,
+    request: Request,
+    provider: SpeechProvider = Depends(get_speech_provider),
+) -> StreamingResponse:
+    """Run a conversation turn and stream the reply as text and audio (SSE).
+
+    Each sentence is synthesized as soon as the LLM has produced it, so the
+    first audio event follows the first sentence instead of the full reply.
+    Events: token, sentence, audio (JSON with base64 audio, in sentence
+    order), done, error.
+    """
+
+    rid = body.request_id or str(uuid.uuid4())
+    interaction = NormalizedInteractionInput(
+        session_id=body.session_id,
+        input_type="text",
+        raw_input_ref=rid,
+        normalized_text=body.text.strip(),
+        language=body.language,
+    )
+    stream = new_token_stream()
+    pipeline = SpeechPipeline(
+        provider,
+        concurrency=config.TTS_PIPELINE_CONCURRENCY,
+        language=body.language,
+        voice=body.voice,
+        output_format=body.output_format,
+        request_id=rid,
+    )
+
+    async def event_iter() -> AsyncIterator[bytes]:
+        events = speak_events(interaction_events(interaction, stream), pipeline)
+
+        async def watch_disconnect() -> None:
+            # Ending the text stream cancels the LLM call and pending synthesis.
+            await wait_for_disconnect(request)
+            stream_stats.disconnected += 1
+            stream.abort()
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            async for event, data in events:
+                if event == "ping":
+                    yield HEARTBEAT
+                elif event == "audio":
+                    yield sse_event(
+                        json.dumps(
+                            {
+                                "index": data.index,
+                                "text": data.text,
+                                "mime_type": data.mime_type,
+                                "voice": data.voice,
+                                "audio_b64": base64.b64encode(data.audio).decode("ascii"),
+                            }
+                        ),
+                        event="audio",
+                    )
+                elif event == "done":
+                    yield sse_event(json.dumps({"request_id": rid, **data}), event="done")
+                else:
+                    yield sse_event(data, event=event)
+        except Exception:
+            logger.exception("Spoken reply stream failed")
+            yield sse_event("Spoken reply failed", event="error")
+        finally:
+            watcher.cancel()
+            await events.aclose()
+
+    return StreamingResponse(event_iter(), media_type="text/event-stream")
+
+
 @router.websocket("/stream")
 async def voice_stream(
     websocket: WebSocket,
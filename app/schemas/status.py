@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Literal
 
 from pydantic import BaseModel, Field
@@ -8,6 +9,34 @@ from pydantic import BaseModel, Field
 class DependencyStatus(BaseModel):
     status: Literal["ok", "disabled", "unhealthy"]
     detail: str | None = None
+    latency_seconds: float | None = None
+    checked_at: datetime | None = None
+
+
+class LLMResilienceStatus(BaseModel):
+    provider: str
+    model: str | None = None
+    circuit_state: Literal["closed", "open", "half_open"]
+    consecutive_failures: int
+    circuit_opened: int
+    failures: int
+    rejected: int
+    retries: int
+    hedges: int
+    hedge_wins: int
+    p95_seconds: float | None = None
+
+
+class LLMRouteStatus(BaseModel):
+    route: str
+    model: str | None = None
+    fallback: bool
+    healthy: bool
+    latency_seconds: float | None = None
+    error_rate: float
+    requests: int
+    failures: int
+    circuit_open: bool
 
 
 class SystemStatusResponse(BaseModel):
@@ -16,4 +45,6 @@ class SystemStatusResponse(BaseModel):
     llm: DependencyStatus
     voice: DependencyStatus
     database: DependencyStatus
+    llm_resilience: list[LLMResilienceStatus] = Field(default_factory=list)
+    llm_routes: list[LLMRouteStatus] = Field(default_factory=list)
     tags: list[str] = Field(default_factory=list)
@@ -93,3 +93,17 @@ class SynthesizeResponse(BaseModel):
     mime_type: str = "audio/wav"
     audio_b64: str = Field(..., description="Base64-encoded audio")
     raw: Optional[dict[str, Any]] = None
+
+
+class SpokenReplyRequest(BaseModel):
+    """Conversation turn answered with streamed text and sentence-by-sentence audio."""
+
+    session_id: str = Field(..., min_length=1)
+    text: str = Field(..., min_length=1, description="User-provided text input")
+    language: str | None = Field(None, description="Optional BCP-47 language code")
+    voice: str | None = Field(None, description="Optional voice name")
+    request_id: str | None = Field(None, description="Client-supplied request id")
+    output_format: str | None = Field(
+        None,
+        description="Optional provider format hint, e.g. mp3 or wav",
+    )
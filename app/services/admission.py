@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator
+
+from app.core import config
+from app.core.metrics import registry
+
+# Upper bounds (seconds) of the queue-wait histogram buckets.
+WAIT_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+queue_wait = registry.histogram(
+    "bot_backend_llm_queue_wait_seconds",
+    "Time spent waiting for an upstream LLM slot",
+    ("provider", "priority"),
+    buckets=WAIT_BUCKETS,
+)
+
+
+class Priority(IntEnum):
+    """Admission priority; lower values are served first."""
+
+    INTERACTIVE = 0  # /interactions, /voice
+    BATCH = 1  # /llm/generate, /llm/stream
+
+
+class AdmissionRejected(RuntimeError):
+    """Raised when an upstream call cannot be queued because the queue is full."""
+
+
+class AdmissionController:
+    """Bound concurrent upstream calls for one provider.
+
+    Up to `max_in_flight` calls run at once; further callers wait in a
+    priority queue (FIFO within a priority) of at most `max_queue` entries.
+    Callers arriving when the queue is full are rejected immediately.
+    Queue waits are recorded per priority, labelled with `name`.
+    """
+
+    def __init__(self, *, max_in_flight: int, max_queue: int, name: str = "") -> None:
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.rejected = 0
+        self._queue: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, fut in self._queue if not fut.done())
+
+    @property
+    def saturated(self) -> bool:
+        """True if a new caller would be rejected right now."""
+        return self.in_flight >= self.max_in_flight and self.queued >= self.max_queue
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.INTERACTIVE) -> AsyncIterator[None]:
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: Priority) -> None:
+        started = time.perf_counter()
+        if self.in_flight < self.max_in_flight and not self._queue:
+            self.in_flight += 1
+            self._observe_wait(priority, 0.0)
+            return
+
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionRejected("Upstream LLM queue is full")
+
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (int(priority), next(self._seq), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # The slot was handed to us just as we were cancelled; pass it on.
+                self._release()
+            raise
+        self._observe_wait(priority, time.perf_counter() - started)
+
+    def _observe_wait(self, priority: Priority, seconds: float) -> None:
+        queue_wait.observe((self.name, priority.name.lower()), seconds)
+
+    def _release(self) -> None:
+        # Hand the slot directly to the next live waiter, if any.
+        while self._queue:
+            _, _, fut = heapq.heappop(self._queue)
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self.in_flight -= 1
+
+
+class AdmissionRegistry:
+    """One AdmissionController per provider name."""
+
+    def __init__(self, *, max_in_flight: int, max_queue: int) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.controllers: dict[str, AdmissionController] = {}
+
+    def get(self, provider: str) -> AdmissionController:
+        key = provider.strip().lower()
+        controller = self.controllers.get(key)
+        if controller is None:
+            controller = AdmissionController(
+                max_in_flight=self.max_in_flight,
+                max_queue=self.max_queue,
+                name=key,
+            )
+            self.controllers[key] = controller
+        return controller
+
+
+llm_admission = AdmissionRegistry(
+    max_in_flight=config.LLM_MAX_IN_FLIGHT,
+    max_queue=config.LLM_MAX_QUEUE,
+)
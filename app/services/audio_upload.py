@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from typing import AsyncIterator
+
+from app.services.wav import parse_wav_header
+
+# Same guardrails as the base64 JSON upload (Pcm16Base64Audio).
+MAX_AUDIO_BYTES = 10_000_000
+MIN_SAMPLE_RATE_HZ = 8000
+MAX_SAMPLE_RATE_HZ = 48000
+
+# Bytes of WAV preamble read while looking for the data chunk.
+_MAX_WAV_HEADER = 64 * 1024
+
+_WAV_TYPES = frozenset({"audio/wav", "audio/wave", "audio/x-wav", "audio/vnd.wave"})
+
+
+class AudioUploadError(ValueError):
+    """Raised when an uploaded audio body is not acceptable PCM16 mono."""
+
+    def __init__(self, message: str, status_code: int = 400) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _check_rate(rate: int) -> int:
+    if not MIN_SAMPLE_RATE_HZ <= rate <= MAX_SAMPLE_RATE_HZ:
+        raise AudioUploadError(
+            f"sample rate must be between {MIN_SAMPLE_RATE_HZ} and {MAX_SAMPLE_RATE_HZ} Hz"
+        )
+    return rate
+
+
+class PcmUpload:
+    """Validate a raw PCM16 mono upload incrementally while it streams through.
+
+    Accepts `audio/L16` (RFC 2586; `rate` parameter, `channels=1`) and PCM
+    WAV bodies. open() reads just enough of a WAV body to learn its format;
+    pcm() then yields the PCM bytes as received, enforcing the size limit as
+    it goes and the even-length/non-empty checks at the end, so no copy of
+    the whole body is ever held. L16 samples are big-endian (network byte
+    order) and are swapped to the little-endian order of WAV on the way.
+    """
+
+    def __init__(
+        self,
+        chunks: AsyncIterator[bytes],
+        content_type: str | None,
+        *,
+        content_length: int | None = None,
+        max_bytes: int = MAX_AUDIO_BYTES,
+    ) -> None:
+        self._chunks = chunks
+        self.content_length = content_length
+        self.max_bytes = max_bytes
+        self.sample_rate_hz = 0
+        # PCM bytes expected, when known up front.
+        self.pcm_bytes: int | None = None
+        self.received = 0
+        self._head = b""
+        # Odd trailing byte of the last L16 chunk, swapped with the next one.
+        self._carry = b""
+
+        media_type, *params = [p.strip() for p in (content_type or "").split(";")]
+        self.media_type = media_type.lower()
+        self.params = {}
+        for param in params:
+            key, _, value = param.partition("=")
+            self.params[key.strip().lower()] = value.strip().strip('"')
+
+        if self.media_type not in _WAV_TYPES and self.media_type != "audio/l16":
+            raise AudioUploadError(
+                "Content-Type must be audio/L16 or audio/wav", status_code=415
+            )
+        if content_length is not None and content_length > max_bytes + _MAX_WAV_HEADER:
+            raise AudioUploadError("audio is too large", status_code=413)
+
+    async def open(self) -> None:
+        if self.media_type == "audio/l16":
+            if self.params.get("channels", "1") != "1":
+                raise AudioUploadError("audio/L16 must be mono (channels=1)")
+            rate = self.params.get("rate", "")
+            if not rate.isdigit():
+                raise AudioUploadError("audio/L16 requires an integer rate parameter")
+            self.sample_rate_hz = _check_rate(int(rate))
+            self.pcm_bytes = self.content_length
+            if self.pcm_bytes is not None and self.pcm_bytes > self.max_bytes:
+                raise AudioUploadError("audio is too large", status_code=413)
+            return
+
+        head = bytearray()
+        async for chunk in self._chunks:
+            head += chunk
+            try:
+                fmt = parse_wav_header(head)
+            except ValueError as exc:
+                raise AudioUploadError(f"invalid WAV: {exc}") from exc
+            if fmt is not None:
+                break
+            if len(head) > _MAX_WAV_HEADER:
+                raise AudioUploadError("WAV header is too large")
+        else:
+            raise AudioUploadError("WAV body ended before the data chunk")
+
+        if fmt.channels != 1 or fmt.sample_width != 2:
+            raise AudioUploadError("WAV audio must be 16-bit mono PCM")
+        self.sample_rate_hz = _check_rate(fmt.sample_rate_hz)
+        self.pcm_bytes = fmt.data_size
+        if self.pcm_bytes is not None and self.pcm_bytes > self.max_bytes:
+            raise AudioUploadError("audio is too large", status_code=413)
+        self._head = bytes(head[fmt.data_offset:])
+
+    async def pcm(self) -> AsyncIterator[bytes]:
+        """Yield the PCM payload; raises AudioUploadError if it turns out invalid."""
+
+        limit = self.pcm_bytes if self.pcm_bytes is not None else self.max_bytes
+        pending = self._head
+        self._head = b""
+        chunks = self._chunks
+        while True:
+            if pending:
+                if self.received + len(pending) > limit:
+                    if self.pcm_bytes is None:
+                        raise AudioUploadError("audio is too large", status_code=413)
+                    # Ignore anything after the declared WAV data chunk.
+                    pending = pending[: limit - self.received]
+                self.received += len(pending)
+                if self.media_type == "audio/l16":
+                    pending = self._to_little_endian(pending)
+                if pending:
+                    yield pending
+                if self.received == limit and self.pcm_bytes is not None:
+                    break
+            try:
+                pending = await chunks.__anext__()
+            except StopAsyncIteration:
+                break
+
+        if self.received == 0:
+            raise AudioUploadError("audio is empty")
+        if self.pcm_bytes is not None and self.received < self.pcm_bytes:
+            raise AudioUploadError("audio body is shorter than declared")
+        if self.received % 2:
+            raise AudioUploadError("audio is not valid PCM16 (odd byte length)")
+
+    def _to_little_endian(self, chunk: bytes) -> bytes:
+        data = bytearray(self._carry + chunk)
+        end = len(data) & ~1
+        self._carry = bytes(data[end:])
+        del data[end:]
+        data[0::2], data[1::2] = data[1::2], data[0::2]
+        return bytes(data)
@@ -1,61 +1,89 @@
 from __future__ import annotations
 
-from datetime import datetime
 from typing import Any
 
+from app.core import config
+from app.services.session_backend import (
+    InMemorySessionBackend,
+    SessionBackend,
+    new_message,
+)
+from app.services.sql_session_backend import SqlSessionBackend
+
 
 class ContextService:
+    """Session state and message history on top of a pluggable backend."""
+
+    def __init__(self, backend: SessionBackend) -> None:
+        self.backend = backend
 
-    def __init__(self) -> None:
-        self.sessions: dict[str, dict[str, Any]] = {}
+    async def exists(self, session_id: str) -> bool:
+        return await self.backend.exists(session_id)
 
-    def exists(self, session_id: str) -> bool:
-        return session_id in self.sessions
+    async def get(self, session_id: str) -> dict[str, Any] | None:
+        """Return session state including its messages (full read)."""
+        state = await self.backend.get_state(session_id)
+        if state is None:
+            return None
+        state["messages"] = await self.backend.get_messages(session_id) or []
+        return state
 
-    def get(self, session_id: str) -> dict[str, Any] | None:
-        return self.sessions.get(session_id)
+    async def get_state(self, session_id: str) -> dict[str, Any] | None:
+        """Return session state without messages."""
+        return await self.backend.get_state(session_id)
 
-    def set(self, session_id: str, data: dict[str, Any]) -> None:
+    async def set(self, session_id: str, data: dict[str, Any]) -> None:
         # Ensure session container always exists.
-        existing = self.sessions.get(session_id) or {}
-        existing.update(data)
-        existing.setdefault("messages", [])
-        existing.setdefault("current_topic", None)
-        existing.setdefault("language", "en")
-        existing.setdefault("persona", "default")
-        existing.setdefault("last_response", None)
-        self.sessions[session_id] = existing
-
-    def update_state(self, session_id: str, key: str, value: Any) -> bool:
-        sess = self.sessions.get(session_id)
-        if not sess:
-            return False
-        sess[key] = value
-        return True
-
-    def reset(self, session_id: str) -> None:
-        self.sessions.pop(session_id, None)
-
-    def get_messages(self, session_id: str):
-        sess = self.sessions.get(session_id)
-        if not sess:
-            return None
-        return list(sess.get("messages") or [])
-
-    def add_message(self, session_id: str, *, role: str, content: str) -> bool:
-        sess = self.sessions.get(session_id)
-        if not sess:
-            return False
-
-        messages = sess.setdefault("messages", [])
-        messages.append(
-            {
-                "role": role,
-                "content": content,
-                "timestamp": datetime.utcnow(),
-            }
+        await self.backend.set_state(session_id, data)
+
+    async def update_state(self, session_id: str, key: str, value: Any) -> bool:
+        return await self.backend.update_state(session_id, {key: value})
+
+    async def update_states(self, session_id: str, values: dict[str, Any]) -> bool:
+        """Update several state fields in one backend call."""
+        return await self.backend.update_state(session_id, values)
+
+    async def reset(self, session_id: str) -> None:
+        await self.backend.delete(session_id)
+
+    async def get_messages(self, session_id: str, limit: int | None = None):
+        return await self.backend.get_messages(session_id, limit)
+
+    async def add_message(self, session_id: str, *, role: str, content: str) -> bool:
+        return await self.backend.append_message(session_id, new_message(role, content))
+
+    def stats(self) -> dict[str, int]:
+        return self.backend.stats()
+
+    async def startup(self) -> None:
+        await self.backend.startup()
+
+    async def aclose(self) -> None:
+        await self.backend.aclose()
+
+
+def build_session_backend() -> SessionBackend:
+    """Return the session backend selected by SESSION_BACKEND."""
+
+    name = (config.SESSION_BACKEND or "memory").strip().lower()
+
+    if name == "memory":
+        return InMemorySessionBackend(
+            max_sessions=config.SESSION_MAX_SESSIONS,
+            idle_ttl_seconds=config.SESSION_IDLE_TTL_SECONDS,
+            max_messages=config.SESSION_MAX_MESSAGES,
+            keep_system_messages=config.SESSION_KEEP_SYSTEM_MESSAGES,
+            sweep_interval_seconds=config.SESSION_SWEEP_INTERVAL_SECONDS,
         )
-        return True
+    if name == "sql":
+        return SqlSessionBackend(
+            idle_ttl_seconds=config.SESSION_IDLE_TTL_SECONDS,
+            max_messages=config.SESSION_MAX_MESSAGES,
+            sweep_interval_seconds=config.SESSION_SWEEP_INTERVAL_SECONDS,
+            keep_system_messages=config.SESSION_KEEP_SYSTEM_MESSAGES,
+        )
+
+    raise ValueError(f"Unsupported SESSION_BACKEND: {config.SESSION_BACKEND}")
 
 
-context = ContextService()
+context = ContextService(build_session_backend())
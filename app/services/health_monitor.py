@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, NamedTuple
+
+from sqlalchemy import text
+
+from app.core import config
+from app.core.database import engine
+from app.dependencies import get_llm_provider, get_speech_provider
+from app.providers.disabled_speech_provider import DisabledSpeechProvider
+from app.services.model_selector import model_selector
+
+logger = logging.getLogger(__name__)
+
+# A probe returns (status, detail); raising or timing out counts as unhealthy.
+Probe = Callable[[], Awaitable[tuple[str, str | None]]]
+
+
+class ProbeResult(NamedTuple):
+    status: str
+    detail: str | None
+    latency_seconds: float | None
+    checked_at: datetime | None
+
+
+_PENDING = ProbeResult("unhealthy", "not checked yet", None, None)
+
+
+class HealthMonitor:
+    """Probe dependencies on an interval and keep the latest results.
+
+    Probes run concurrently in a background task, each bounded by
+    `timeout_seconds`, so health endpoints read cached results instead of
+    calling upstreams per request. startup() runs the first round before
+    returning so results are available from the first request.
+    """
+
+    def __init__(
+        self,
+        probes: dict[str, Probe],
+        *,
+        interval_seconds: float,
+        timeout_seconds: float,
+    ) -> None:
+        self.probes = probes
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.results: dict[str, ProbeResult] = {}
+        self.rounds = 0
+        self._task: asyncio.Task | None = None
+
+    def get(self, name: str) -> ProbeResult:
+        return self.results.get(name, _PENDING)
+
+    async def check(self) -> dict[str, ProbeResult]:
+        """Run every probe once and store the results."""
+
+        names = list(self.probes)
+        results = await asyncio.gather(*(self._run(self.probes[n]) for n in names))
+        self.results.update(zip(names, results))
+        self.rounds += 1
+        return self.results
+
+    async def startup(self) -> None:
+        await self.check()
+        if self.interval_seconds > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._loop())
+
+    async def aclose(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Health check round failed")
+
+    async def _run(self, probe: Probe) -> ProbeResult:
+        checked_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        try:
+            status, detail = await asyncio.wait_for(probe(), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            status, detail = "unhealthy", f"timed out after {self.timeout_seconds:g}s"
+        except Exception as exc:
+            status, detail = "unhealthy", str(exc) or exc.__class__.__name__
+        return ProbeResult(status, detail, time.perf_counter() - start, checked_at)
+
+
+def _select_one() -> None:
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def probe_database() -> tuple[str, str | None]:
+    await asyncio.to_thread(_select_one)
+    return "ok", None
+
+
+async def probe_llm() -> tuple[str, str | None]:
+    llm = get_llm_provider()
+    with model_selector.lease(llm):
+        return ("ok" if await llm.health_check() else "unhealthy"), llm.name
+
+
+async def probe_voice() -> tuple[str, str | None]:
+    voice = get_speech_provider()
+    if isinstance(voice, DisabledSpeechProvider):
+        return "disabled", None
+    return ("ok" if await voice.health_check() else "unhealthy"), voice.name
+
+
+health_monitor = HealthMonitor(
+    {"database": probe_database, "llm": probe_llm, "voice": probe_voice},
+    interval_seconds=config.HEALTH_CHECK_INTERVAL_SECONDS,
+    timeout_seconds=config.HEALTH_CHECK_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import Any, AsyncIterator
+
+from app.core import config
+from app.schemas.interaction import NormalizedInteractionInput
+from app.services.orchestrator import ConversationOrchestrator, orchestrator as default_orchestrator
+from app.services.sentence_splitter import SentenceSplitter
+from app.services.token_stream import TokenStream
+
+
+def new_token_stream() -> TokenStream:
+    """TokenStream configured with the LLM_STREAM_* settings."""
+
+    return TokenStream(
+        max_queue=config.LLM_STREAM_QUEUE_SIZE,
+        frame_max_chars=config.LLM_STREAM_FRAME_MAX_CHARS,
+        frame_max_delay=config.LLM_STREAM_FRAME_MAX_DELAY_MS / 1000,
+        heartbeat_seconds=config.LLM_STREAM_HEARTBEAT_SECONDS,
+    )
+
+
+async def interaction_events(
+    interaction: NormalizedInteractionInput,
+    stream: TokenStream,
+    orchestrator: ConversationOrchestrator | None = None,
+) -> AsyncIterator[tuple[str, Any]]:
+    """Run one streamed turn, yielding (event, data) pairs.
+
+    Events: "token" (coalesced reply text), "sentence" (each complete
+    sentence, for clients that start speech early), "ping" (heartbeat) and
+    finally "done" with the interaction and full reply. Ends early, without
+    "done", if the stream is aborted.
+    """
+
+    orchestrator = orchestrator or default_orchestrator
+    splitter = SentenceSplitter()
+    result: dict[str, str] = {}
+
+    async def run() -> None:
+        try:
+            result["text"] = await orchestrator.stream_interaction(interaction, stream.put)
+        except Exception as exc:
+            await stream.close(exc)
+        else:
+            await stream.close()
+
+    producer = asyncio.create_task(run())
+    try:
+        async for frame in stream.frames():
+            if frame is None:
+                yield "ping", None
+                continue
+            yield "token", frame
+            for sentence in splitter.feed(frame):
+                yield "sentence", sentence
+        if stream.aborted:
+            return
+        rest = splitter.flush()
+        if rest:
+            yield "sentence", rest
+        yield "done", {
+            "interaction": interaction.model_dump(mode="json"),
+            "response_text": result.get("text", ""),
+        }
+    finally:
+        producer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await producer
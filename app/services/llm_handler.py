@@ -1,20 +1,92 @@
 from __future__ import annotations
 
+from typing import Any, Awaitable, Callable
+
 from app.core import config
+from app.core.metrics import observe_upstream
+from app.providers.llm_provider import ChatMessage
+from .admission import AdmissionRegistry, Priority, llm_admission
+from .micro_batcher import MicroBatcher
 from .model_selector import model_selector
+from .response_cache import ResponseCache
+from .single_flight import SingleFlight
 
 
 class LLMHandler:
-    def _select_provider(
+    def __init__(
+        self,
+        cache: ResponseCache | None = None,
+        single_flight: SingleFlight | None = None,
+        admission: AdmissionRegistry | None = None,
+        batching: bool = False,
+    ) -> None:
+        self.cache = cache
+        self.single_flight = single_flight
+        self.admission = admission or llm_admission
+        self.batching = batching
+        # One micro-batcher per (provider, model) with a native batch API.
+        self.batchers: dict[tuple[str, str | None], MicroBatcher] = {}
+
+    async def _admitted(
+        self,
+        provider_name: str,
+        priority: Priority,
+        call: Callable[[], Awaitable[Any]],
+        operation: str = "generate",
+    ) -> Any:
+        # Waits for a slot in the provider's queue; raises AdmissionRejected when full.
+        async with self.admission.get(provider_name).slot(priority):
+            with observe_upstream("llm", provider_name.strip().lower(), operation):
+                return await call()
+
+    def _batcher(self, provider_name: str, model_name: str | None) -> MicroBatcher:
+        key = (provider_name.strip().lower(), model_name)
+        batcher = self.batchers.get(key)
+        if batcher is None:
+            # A whole batch takes one admission slot, at the priority of its most urgent item.
+            async def dispatch(items: list[tuple[str, Priority]]) -> list[str]:
+                priority = min(p for _, p in items)
+                prompts = [text for text, _ in items]
+                # Looked up per batch: the instance seen when the batcher was made may be evicted.
+                selected = model_selector.select(provider_name, model_name)
+                with model_selector.lease(selected):
+                    return await self._admitted(
+                        provider_name, priority, lambda: selected.generate_batch(prompts), "batch"
+                    )
+
+            batcher = MicroBatcher(
+                dispatch,
+                max_size=config.LLM_BATCH_MAX_SIZE,
+                max_wait=config.LLM_BATCH_MAX_WAIT_MS / 1000,
+                labels=(key[0], model_name or ""),
+            )
+            self.batchers[key] = batcher
+        return batcher
+
+    def _resolve(
         self,
         provider: str | None,
         *,
         llm_model: str | None,
         legacy_model: str | None,
-    ):
+    ) -> tuple[str, str | None]:
         # Back-compat: `model` used to mean provider name.
         provider_name = (provider or legacy_model or config.LLM_PROVIDER)
         model_name = (llm_model or config.LLM_MODEL)
+        return provider_name, model_name
+
+    def select_provider(
+        self,
+        provider: str | None,
+        *,
+        llm_model: str | None = None,
+        legacy_model: str | None = None,
+    ):
+        provider_name, model_name = self._resolve(
+            provider,
+            llm_model=llm_model,
+            legacy_model=legacy_model,
+        )
         return model_selector.select(provider_name, model_name)
 
     async def generate_response(
@@ -24,13 +96,42 @@ class LLMHandler:
         *,
         llm_model: str | None = None,
         model: str | None = None,
+        use_cache: bool = True,
+        priority: Priority = Priority.INTERACTIVE,
     ):
-        selected = self._select_provider(
+        provider_name, model_name = self._resolve(
             provider,
             llm_model=llm_model,
             legacy_model=model,
         )
-        return await selected.generate(text)
+        selected = model_selector.select(provider_name, model_name)
+        # Leased so an evicted instance is not closed under the call. The shared
+        # single-flight call can outlive this caller, so it takes its own lease.
+        with model_selector.lease(selected):
+            key = None
+            if self.cache is not None and use_cache:
+                key = self.cache.key(provider_name, model_name, text)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    return cached
+
+            async def call() -> str:
+                with model_selector.lease(selected):
+                    if self.batching and selected.supports_batch:
+                        return await self._batcher(provider_name, model_name).submit((text, priority))
+                    return await self._admitted(provider_name, priority, lambda: selected.generate(text))
+
+            if self.single_flight is None:
+                result = await call()
+            else:
+                result = await self.single_flight.do(
+                    ("generate", provider_name, model_name, text),
+                    call,
+                )
+
+            if key is not None:
+                self.cache.set(key, result)
+            return result
 
     async def stream_response(
         self,
@@ -40,10 +141,91 @@ class LLMHandler:
         *,
         llm_model: str | None = None,
         model: str | None = None,
+        priority: Priority = Priority.INTERACTIVE,
     ):
-        selected = self._select_provider(
+        provider_name, model_name = self._resolve(
             provider,
             llm_model=llm_model,
             legacy_model=model,
         )
-        return await selected.stream(text, on_token)
+        selected = model_selector.select(provider_name, model_name)
+        with model_selector.lease(selected):
+            async def call(tokens: Callable[[str], Any]) -> Any:
+                # Shared by single-flight callers; leased for its own lifetime.
+                with model_selector.lease(selected):
+                    return await self._admitted(
+                        provider_name, priority, lambda: selected.stream(text, tokens), "stream"
+                    )
+
+            if self.single_flight is None:
+                return await call(on_token)
+
+            return await self.single_flight.stream(
+                ("stream", provider_name, model_name, text),
+                call,
+                on_token,
+            )
+
+    async def generate_chat(
+        self,
+        messages: list[ChatMessage],
+        provider: str | None = None,
+        *,
+        llm_model: str | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ):
+        provider_name, model_name = self._resolve(
+            provider,
+            llm_model=llm_model,
+            legacy_model=None,
+        )
+        selected = model_selector.select(provider_name, model_name)
+        with model_selector.lease(selected):
+            return await self._admitted(
+                provider_name, priority, lambda: selected.generate_messages(messages), "chat"
+            )
+
+    async def stream_chat(
+        self,
+        messages: list[ChatMessage],
+        provider: str | None = None,
+        on_token=None,
+        *,
+        llm_model: str | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ):
+        provider_name, model_name = self._resolve(
+            provider,
+            llm_model=llm_model,
+            legacy_model=None,
+        )
+        selected = model_selector.select(provider_name, model_name)
+        with model_selector.lease(selected):
+            return await self._admitted(
+                provider_name,
+                priority,
+                lambda: selected.stream_messages(messages, on_token),
+                "stream_chat",
+            )
+
+
+response_cache = (
+    ResponseCache(
+        max_entries=config.LLM_CACHE_MAX_ENTRIES,
+        ttl_seconds=config.LLM_CACHE_TTL_SECONDS,
+        normalize=config.LLM_CACHE_NORMALIZE,
+        path=config.LLM_CACHE_PATH,
+    )
+    if config.LLM_CACHE_ENABLED
+    else None
+)
+
+llm_handler = LLMHandler(
+    cache=response_cache,
+    single_flight=(
+        SingleFlight(max_queue=config.LLM_STREAM_QUEUE_SIZE)
+        if config.LLM_SINGLE_FLIGHT_ENABLED
+        else None
+    ),
+    batching=config.LLM_BATCH_ENABLED,
+)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from app.core.metrics import registry
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Upper bounds of the batch-size histogram buckets.
+SIZE_BUCKETS: tuple[int, ...] = (1, 2, 4, 8, 16, 32, 64)
+# Upper bounds (seconds) of the batching-delay histogram buckets.
+DELAY_BUCKETS: tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+
+batch_sizes = registry.histogram(
+    "bot_backend_llm_batch_size",
+    "Items per dispatched LLM micro-batch",
+    ("provider", "model"),
+    buckets=SIZE_BUCKETS,
+)
+batch_waits = registry.histogram(
+    "bot_backend_llm_batch_wait_seconds",
+    "Time an LLM call waited for its micro-batch",
+    ("provider", "model"),
+    buckets=DELAY_BUCKETS,
+)
+
+
+class MicroBatcher(Generic[T, R]):
+    """Collect concurrent submissions into batches for one `fn(items) -> results` call.
+
+    A batch is dispatched when it reaches `max_size` items or `max_wait`
+    seconds after its first item arrived, whichever comes first. Results are
+    returned to each submitter in order; an error fails the whole batch.
+    Submitters cancelled before dispatch are dropped from the batch.
+    Batch sizes and waits are recorded under `labels` (provider, model).
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[list[T]], Awaitable[list[R]]],
+        *,
+        max_size: int,
+        max_wait: float,
+        labels: tuple[str, str] = ("", ""),
+    ) -> None:
+        self.fn = fn
+        self.labels = labels
+        self.max_size = max(1, max_size)
+        self.max_wait = max_wait
+        self._pending: list[tuple[T, asyncio.Future, float]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future = loop.create_future()
+        self._pending.append((item, fut, time.perf_counter()))
+
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch = [entry for entry in self._pending if not entry[1].done()]
+        self._pending = []
+        if not batch:
+            return
+
+        now = time.perf_counter()
+        self.batches += 1
+        self.items += len(batch)
+        batch_sizes.observe(self.labels, len(batch))
+        for _, _, enqueued in batch:
+            batch_waits.observe(self.labels, now - enqueued)
+
+        task = asyncio.ensure_future(self._dispatch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: list[tuple[T, asyncio.Future, float]]) -> None:
+        try:
+            results = await self.fn([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"Batch call returned {len(results)} results for {len(batch)} items"
+                )
+        except Exception as exc:
+            for _, fut, _ in batch:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+
+        for (_, fut, _), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
@@ -1,10 +1,26 @@
 from __future__ import annotations
 
-from typing import Any, Callable
+import asyncio
+import contextlib
+import logging
+from collections import OrderedDict
+from importlib.metadata import entry_points
+from typing import Any, Callable, Iterator
 
+from app.core import config
 from app.providers.llm_provider import LLMProvider
 from app.providers.offline_provider import OfflineProvider
 from app.providers.openai_provider import OpenAIProvider
+from app.providers.resilient_provider import CircuitBreaker, ResilientProvider
+from app.providers.routing_provider import Route, RoutingProvider
+
+logger = logging.getLogger(__name__)
+
+# Entry point group third-party packages use to register LLM providers.
+# Each entry point must load a factory `(model, base_url) -> LLMProvider`.
+ENTRY_POINT_GROUP = "bot_backend.llm_providers"
+
+ProviderFactory = Callable[[str | None, str | None], LLMProvider]
 
 
 class DummyProvider(LLMProvider):
@@ -20,20 +36,249 @@ class DummyProvider(LLMProvider):
                 await result  # support async callbacks
 
 
+def resilient(provider: LLMProvider) -> ResilientProvider:
+    """Wrap an upstream provider with the configured retry/breaker/hedging policy."""
+
+    return ResilientProvider(
+        provider,
+        max_attempts=config.LLM_RETRY_MAX_ATTEMPTS,
+        base_delay=config.LLM_RETRY_BASE_DELAY,
+        max_delay=config.LLM_RETRY_MAX_DELAY,
+        breaker=CircuitBreaker(
+            failure_threshold=config.LLM_BREAKER_FAILURE_THRESHOLD,
+            reset_seconds=config.LLM_BREAKER_RESET_SECONDS,
+        ),
+        hedge=config.LLM_HEDGE_ENABLED,
+        hedge_min_samples=config.LLM_HEDGE_MIN_SAMPLES,
+    )
+
+
+def parse_routes(spec: str) -> list[tuple[str, str | None]]:
+    """Parse "provider[@base_url],..." into (provider, base_url) pairs."""
+
+    routes = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, base_url = item.partition("@")
+        routes.append((name.strip().lower(), base_url.strip() or None))
+    return routes
+
+
 class ModelSelector:
-    def select(self, provider: str, model: str | None = None) -> LLMProvider:
+    """Registry of long-lived LLM providers keyed by (provider, model, base URL).
+
+    Instances are created on first use and reused across requests so they can
+    keep connection pools and warm state. Beyond `max_instances`, the least
+    recently used instance is evicted; callers hold a lease() while using an
+    instance, and an evicted instance is closed once its last lease ends.
+    """
+
+    def __init__(self, max_instances: int = 32) -> None:
+        self.max_instances = max_instances
+        self._factories: dict[str, ProviderFactory] = {}
+        self._aliases: dict[str, str] = {}
+        self._instances: OrderedDict[tuple[str, str | None, str | None], LLMProvider] = OrderedDict()
+        self._entry_points_loaded = False
+        # id(instance) -> calls in flight; evicted instances wait here until unused.
+        self._leases: dict[int, int] = {}
+        self._retired: dict[int, LLMProvider] = {}
+        self._closing: set[asyncio.Task] = set()
+
+        self.register(
+            "dummy", lambda model, base_url: DummyProvider(), aliases=("test",)
+        )
+        self.register(
+            "openai",
+            lambda model, base_url: resilient(OpenAIProvider(model=model, base_url=base_url)),
+        )
+        self.register(
+            "offline",
+            lambda model, base_url: resilient(OfflineProvider(model=model, base_url=base_url)),
+            aliases=("local",),
+        )
+        self.register("router", lambda model, base_url: self.build_router(model))
+
+    def register(
+        self,
+        name: str,
+        factory: ProviderFactory,
+        *,
+        aliases: tuple[str, ...] = (),
+    ) -> None:
+        """Register (or replace) a provider factory under `name` and `aliases`."""
+
+        key = name.strip().lower()
+        self._factories[key] = factory
+        for alias in (key, *aliases):
+            self._aliases[alias.strip().lower()] = key
+
+    def load_entry_points(self) -> None:
+        """Register providers exposed by installed packages (once)."""
+
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+
+        for ep in entry_points(group=ENTRY_POINT_GROUP):
+            try:
+                self.register(ep.name, ep.load())
+            except Exception:
+                logger.exception("Failed to load LLM provider entry point %s", ep.name)
+
+    def select(
+        self,
+        provider: str,
+        model: str | None = None,
+        base_url: str | None = None,
+    ) -> LLMProvider:
         """Return an LLMProvider by provider name."""
 
-        key = (provider or "dummy").strip().lower()
+        name = (provider or "dummy").strip().lower()
+        canonical = self._aliases.get(name)
+        if canonical is None:
+            raise ValueError(f"Unsupported LLM provider: {provider}")
+
+        key = (canonical, model or None, base_url or None)
+        instance = self._instances.get(key)
+        if instance is not None:
+            self._instances.move_to_end(key)
+            return instance
+
+        # Construction errors (e.g. missing API key) are not cached.
+        instance = self.create(canonical, model, base_url)
+        self._instances[key] = instance
+
+        while len(self._instances) > self.max_instances:
+            _, evicted = self._instances.popitem(last=False)
+            self._retire(evicted)
+
+        return instance
+
+    def create(
+        self,
+        provider: str,
+        model: str | None = None,
+        base_url: str | None = None,
+    ) -> LLMProvider:
+        """Build a new, uncached provider instance."""
+
+        canonical = self._aliases.get((provider or "").strip().lower())
+        if canonical is None:
+            raise ValueError(f"Unsupported LLM provider: {provider}")
+        return self._factories[canonical](model or None, base_url or None)
+
+    def build_router(self, model: str | None = None) -> RoutingProvider:
+        """Build a RoutingProvider over LLM_ROUTES and LLM_ROUTES_FALLBACK.
+
+        The router owns its backend instances; they are not shared with the cache.
+        """
+
+        routes = []
+        for spec, fallback in ((config.LLM_ROUTES, False), (config.LLM_ROUTES_FALLBACK, True)):
+            for name, base_url in parse_routes(spec):
+                if self._aliases.get(name) == "router":
+                    raise ValueError("LLM_ROUTES cannot contain the router itself")
+                label = f"{name}@{base_url}" if base_url else name
+                routes.append(Route(label, self.create(name, model, base_url), fallback=fallback))
+
+        if not any(not r.fallback for r in routes):
+            raise ValueError("LLM_PROVIDER=router requires LLM_ROUTES")
+        return RoutingProvider(
+            routes,
+            alpha=config.LLM_ROUTER_EWMA_ALPHA,
+            max_error_rate=config.LLM_ROUTER_MAX_ERROR_RATE,
+            cooldown_seconds=config.LLM_ROUTER_COOLDOWN_SECONDS,
+        )
+
+    def instances(self) -> list[tuple[tuple[str, str | None, str | None], LLMProvider]]:
+        """Return the cached provider instances with their (provider, model, base URL) keys."""
+        return list(self._instances.items())
+
+    def resilient_instances(self) -> list[tuple[str, str | None, ResilientProvider]]:
+        """Return (label, model, provider) for every ResilientProvider, including router backends."""
+
+        found = []
+        for (name, model, base_url), instance in self._instances.items():
+            if isinstance(instance, ResilientProvider):
+                found.append((f"{name}@{base_url}" if base_url else name, model, instance))
+            elif isinstance(instance, RoutingProvider):
+                for route in instance.routes:
+                    if isinstance(route.provider, ResilientProvider):
+                        found.append((route.label, model, route.provider))
+        return found
+
+    def routers(self) -> list[tuple[str | None, RoutingProvider]]:
+        """Return (model, router) for every cached RoutingProvider."""
+        return [
+            (model, instance)
+            for (_, model, _), instance in self._instances.items()
+            if isinstance(instance, RoutingProvider)
+        ]
+
+    async def startup(self) -> None:
+        """Load plugin providers and warm up the configured default provider."""
+
+        self.load_entry_points()
+        try:
+            provider = self.select(config.LLM_PROVIDER, config.LLM_MODEL)
+        except Exception:
+            logger.exception("Failed to initialize LLM provider %s", config.LLM_PROVIDER)
+            return
+        with self.lease(provider):
+            await provider.startup()
+
+    @contextlib.contextmanager
+    def lease(self, instance: LLMProvider) -> Iterator[LLMProvider]:
+        """Mark a call in flight on `instance` for the duration of the block."""
+
+        key = id(instance)
+        self._leases[key] = self._leases.get(key, 0) + 1
+        try:
+            yield instance
+        finally:
+            remaining = self._leases.pop(key) - 1
+            if remaining:
+                self._leases[key] = remaining
+            else:
+                retired = self._retired.pop(key, None)
+                if retired is not None:
+                    self._close_later(retired)
+
+    async def aclose(self) -> None:
+        """Close and forget every cached provider instance."""
+
+        instances = [*self._instances.values(), *self._retired.values()]
+        self._instances.clear()
+        self._retired.clear()
+        for instance in instances:
+            await self._close(instance)
+        if self._closing:
+            await asyncio.gather(*self._closing)
+
+    def _retire(self, instance: LLMProvider) -> None:
+        if self._leases.get(id(instance)):
+            self._retired[id(instance)] = instance
+        else:
+            self._close_later(instance)
 
-        if key in {"dummy", "test"}:
-            return DummyProvider()
-        if key in {"openai"}:
-            return OpenAIProvider(model=model)
-        if key in {"offline", "local"}:
-            return OfflineProvider()
+    def _close_later(self, instance: LLMProvider) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        # Referenced until done so the task is not garbage-collected mid-close.
+        task = loop.create_task(self._close(instance))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
 
-        raise ValueError(f"Unsupported LLM provider: {provider}")
+    @staticmethod
+    async def _close(instance: LLMProvider) -> None:
+        try:
+            await instance.aclose()
+        except Exception:
+            logger.exception("Failed to close LLM provider %r", instance)
 
 
 model_selector = ModelSelector()
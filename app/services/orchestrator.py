@@ -1,17 +1,31 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
+from app.core import config
+from app.core.tracing import tracer
 from app.schemas.interaction import NormalizedInteractionInput
 from app.services.context_service import context
 from app.services.llm_handler import LLMHandler
+from app.providers.llm_provider import ChatMessage
+from app.services.prompt_history import HistoryCache, HistoryWindow, get_token_estimator
 
 logger = logging.getLogger(__name__)
 
 class ConversationOrchestrator:
-    def __init__(self, llm_handler: Optional[LLMHandler] = None):
+    def __init__(
+        self,
+        llm_handler: Optional[LLMHandler] = None,
+        history: Optional[HistoryCache] = None,
+    ):
         self.llm_handler = llm_handler or LLMHandler()
+        self.history = history or HistoryCache(
+            budget=config.PROMPT_HISTORY_TOKEN_BUDGET,
+            estimate=get_token_estimator(config.PROMPT_TOKEN_ESTIMATOR, config.LLM_MODEL),
+            max_messages=config.PROMPT_HISTORY_MAX_MESSAGES,
+            max_sessions=config.SESSION_MAX_SESSIONS,
+        )
 
     async def process_interaction(
         self, 
@@ -19,49 +33,100 @@ class ConversationOrchestrator:
         provider: Optional[str] = None,
         llm_model: Optional[str] = None
     ) -> str:
+        with tracer.span("interaction.turn", session_id=interaction.session_id):
+            messages = await self._prepare(interaction)
+
+            # 5. Generate response logic (AI Reasoning Logic)
+            # In a real scenario, we might use the intent to branch logic.
+            # For now, we use the LLM to generate the final response.
+            with tracer.span("orchestrator.llm"):
+                response_text = await self.llm_handler.generate_chat(
+                    messages,
+                    provider=provider,
+                    llm_model=llm_model
+                )
+
+            await self._commit(interaction, response_text)
+            return response_text
+
+    async def stream_interaction(
+        self,
+        interaction: NormalizedInteractionInput,
+        on_token: Callable[[str], Any],
+        provider: Optional[str] = None,
+        llm_model: Optional[str] = None
+    ) -> str:
+        """Like process_interaction, but forward reply tokens to on_token as they arrive.
+
+        The assistant message is committed once the stream completes; a
+        cancelled or failed stream leaves only the user message in history.
+        """
+        with tracer.span("interaction.turn", session_id=interaction.session_id, stream=True):
+            messages = await self._prepare(interaction)
+
+            parts: list[str] = []
+
+            async def collect(tok: str) -> None:
+                parts.append(tok)
+                result = on_token(tok)
+                if hasattr(result, "__await__"):
+                    await result
+
+            with tracer.span("orchestrator.llm"):
+                await self.llm_handler.stream_chat(
+                    messages,
+                    provider=provider,
+                    on_token=collect,
+                    llm_model=llm_model
+                )
+
+            response_text = "".join(parts)
+            await self._commit(interaction, response_text)
+            return response_text
+
+    async def _prepare(self, interaction: NormalizedInteractionInput) -> list[ChatMessage]:
         session_id = interaction.session_id
         text = interaction.normalized_text
         
-        # 1. Ensure session exists
-        if not context.exists(session_id):
-            context.set(session_id, {})
-        
+        # 1. Ensure session exists and track session state (one backend write)
+        with tracer.span("orchestrator.session"):
+            await context.set(session_id, {"language": interaction.language or "en"})
+
         # 2. Detect basic intents
-        intent = self._detect_intent(text)
+        with tracer.span("orchestrator.intent") as span:
+            intent = self._detect_intent(text)
+            if span is not None:
+                span.attributes["intent"] = intent
         logger.info(f"Detected intent: {intent} for session {session_id}")
-        
-        # 3. Track session state
-        context.update_state(session_id, "language", interaction.language or "en")
-        
-        # 4. Add user message to history
-        context.add_message(session_id, role="user", content=text)
-        
-        # 5. Get conversation context
-        history = context.get_messages(session_id) or []
-        
-        # 6. Generate response logic (AI Reasoning Logic)
-        # In a real scenario, we might use the intent to branch logic.
-        # For now, we use the LLM to generate the final response.
-        
-        # Format a prompt with history
-        prompt = self._build_prompt(history, session_id)
-        
-        response_text = await self.llm_handler.generate_response(
-            prompt,
-            provider=provider,
-            llm_model=llm_model
-        )
-        
-        # 7. Update state with last response and inferred topic (simple)
-        context.update_state(session_id, "last_response", response_text)
-        if len(text.split()) > 3:
-            # Very simple topic inference
-            context.update_state(session_id, "current_topic", text[:30] + "...")
-        
-        # 8. Add assistant message to history
-        context.add_message(session_id, role="assistant", content=response_text)
-        
-        return response_text
+
+        # 3. Add user message to history
+        # 4. Get conversation context: the newest messages that fit the token budget.
+        # Only messages added since the last turn are processed.
+        with tracer.span("orchestrator.history"):
+            await context.add_message(session_id, role="user", content=text)
+            recent = await context.get_messages(
+                session_id, limit=config.PROMPT_HISTORY_MAX_MESSAGES
+            ) or []
+            history = self.history.window(session_id, recent)
+            state = await context.get_state(session_id) or {}
+
+        # Build chat messages with a stable system prefix
+        with tracer.span("orchestrator.prompt"):
+            return self._build_messages(history, state)
+
+    async def _commit(self, interaction: NormalizedInteractionInput, response_text: str) -> None:
+        session_id = interaction.session_id
+        text = interaction.normalized_text
+
+        # 6. Update state with last response and inferred topic (simple)
+        # 7. Add assistant message to history
+        with tracer.span("orchestrator.commit"):
+            updates: dict[str, Any] = {"last_response": response_text}
+            if len(text.split()) > 3:
+                # Very simple topic inference
+                updates["current_topic"] = text[:30] + "..."
+            await context.update_states(session_id, updates)
+            await context.add_message(session_id, role="assistant", content=response_text)
 
     def _detect_intent(self, text: str) -> str:
         text = text.lower()
@@ -73,20 +138,22 @@ class ConversationOrchestrator:
             return "question"
         return "statement"
 
-    def _build_prompt(self, history: list[dict[str, Any]], session_id: str) -> str:
+    def _build_messages(self, history: HistoryWindow, sess: dict[str, Any]) -> list[ChatMessage]:
         # Get persona from state
-        sess = context.get(session_id) or {}
         persona = sess.get("persona", "default")
         
-        system_prompt = f"You are a helpful assistant. Persona: {persona}. "
+        # Keep the leading system message identical across turns so upstream
+        # prefix caching can reuse it; per-turn context goes after the history.
+        messages: list[ChatMessage] = [
+            {"role": "system", "content": f"You are a helpful assistant. Persona: {persona}."}
+        ]
+        messages.extend(history.messages)
         if sess.get("current_topic"):
-            system_prompt += f"Current topic is {sess.get('current_topic')}. "
-            
-        full_prompt = system_prompt + "\n\n"
-        for msg in history[-5:]: # Last 5 messages for context
-            full_prompt += f"{msg['role'].capitalize()}: {msg['content']}\n"
-        
-        full_prompt += "Assistant:"
-        return full_prompt
+            # Place it before the newest message so that message stays last.
+            messages.insert(
+                max(1, len(messages) - 1),
+                {"role": "system", "content": f"Current topic is {sess.get('current_topic')}."},
+            )
+        return messages
 
 orchestrator = ConversationOrchestrator()
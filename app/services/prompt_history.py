@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import importlib.util
+from collections import OrderedDict, deque
+from typing import Any, Callable
+
+# Estimates the number of tokens in a string.
+TokenEstimator = Callable[[str], int]
+
+
+def heuristic_token_estimator(text: str) -> int:
+    """Cheap estimate (~4 characters per token for English text)."""
+    return max(1, (len(text) + 3) // 4)
+
+
+def tiktoken_available() -> bool:
+    return importlib.util.find_spec("tiktoken") is not None
+
+
+def get_token_estimator(name: str, model: str | None = None) -> TokenEstimator:
+    """Return the token estimator selected by name ("heuristic" or "tiktoken")."""
+
+    key = (name or "heuristic").strip().lower()
+    if key == "heuristic":
+        return heuristic_token_estimator
+    if key == "tiktoken":
+        import tiktoken
+
+        try:
+            encoding = tiktoken.encoding_for_model(model or "")
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text))
+
+    raise ValueError(f"Unsupported token estimator: {name}")
+
+
+def _message_key(message: dict[str, Any]) -> tuple[Any, str, str]:
+    return (message.get("timestamp"), message.get("role") or "", message.get("content") or "")
+
+
+class HistoryWindow:
+    """Most recent messages of one session that fit in a token budget.
+
+    Each message is converted and measured once; later turns only process
+    the new messages and drop old ones from the front.
+    """
+
+    def __init__(self) -> None:
+        # (key, chat message, tokens), oldest first
+        self.entries: deque[tuple[tuple[Any, str, str], dict[str, str], int]] = deque()
+        self.tokens = 0
+
+    @property
+    def messages(self) -> list[dict[str, str]]:
+        """Chat messages in the window, oldest first."""
+        return [message for _, message, _ in self.entries]
+
+    def sync(
+        self,
+        recent: list[dict[str, Any]],
+        *,
+        budget: int,
+        estimate: TokenEstimator,
+        max_messages: int | None = None,
+    ) -> None:
+        """Bring the window up to date with `recent` (newest last).
+
+        The window holds at most `max_messages` messages, matching a cold
+        rebuild from a `recent` read with that limit.
+        """
+
+        start = self._new_messages_start(recent)
+        if start is None:
+            # Cold cache or history changed under us: rebuild from the newest end.
+            self.entries.clear()
+            self.tokens = 0
+            for message in reversed(recent):
+                entry = self._entry(message, estimate)
+                if self.entries and self.tokens + entry[2] > budget:
+                    break
+                self.entries.appendleft(entry)
+                self.tokens += entry[2]
+            return
+
+        if start == len(recent):
+            return
+
+        for message in recent[start:]:
+            entry = self._entry(message, estimate)
+            self.entries.append(entry)
+            self.tokens += entry[2]
+
+        # Always keep the newest message, even if it alone exceeds the budget.
+        while len(self.entries) > 1 and (
+            self.tokens > budget or (max_messages is not None and len(self.entries) > max_messages)
+        ):
+            self.tokens -= self.entries.popleft()[2]
+
+    def _new_messages_start(self, recent: list[dict[str, Any]]) -> int | None:
+        if not self.entries:
+            return None
+        last_key = self.entries[-1][0]
+        for i in range(len(recent) - 1, -1, -1):
+            if _message_key(recent[i]) == last_key:
+                return i + 1
+        return None
+
+    @staticmethod
+    def _entry(message: dict[str, Any], estimate: TokenEstimator):
+        role = str(message.get("role") or "user")
+        content = str(message.get("content") or "")
+        # Count the role too; chat formats spend a few tokens per message on it.
+        tokens = estimate(f"{role}: {content}")
+        return (_message_key(message), {"role": role, "content": content}, tokens)
+
+
+class HistoryCache:
+    """Bounded per-session cache of HistoryWindow objects (LRU)."""
+
+    def __init__(
+        self,
+        *,
+        budget: int,
+        estimate: TokenEstimator,
+        max_messages: int | None = None,
+        max_sessions: int = 10_000,
+    ) -> None:
+        self.budget = budget
+        self.estimate = estimate
+        self.max_messages = max_messages
+        self.max_sessions = max_sessions
+        self._windows: OrderedDict[str, HistoryWindow] = OrderedDict()
+
+    def window(self, session_id: str, recent: list[dict[str, Any]]) -> HistoryWindow:
+        win = self._windows.get(session_id)
+        if win is None:
+            win = HistoryWindow()
+            self._windows[session_id] = win
+            if len(self._windows) > self.max_sessions:
+                self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(session_id)
+
+        win.sync(recent, budget=self.budget, estimate=self.estimate, max_messages=self.max_messages)
+        return win
+
+    def discard(self, session_id: str) -> None:
+        """Drop a session's window, e.g. when the session is deleted."""
+        self._windows.pop(session_id, None)
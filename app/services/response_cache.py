@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of LLM responses with a TTL.
+
+    Keys are (provider, model, prompt). With `normalize` enabled, prompts
+    that differ only in whitespace or casing share an entry. When `path` is
+    set, entries survive restarts via `load()` / `save()`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        normalize: bool = False,
+        path: str | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.normalize = normalize
+        self.path = Path(path) if path else None
+
+        # key -> (expires_at wall-clock seconds, response text)
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, provider: str, model: str | None, prompt: str) -> str:
+        if self.normalize:
+            prompt = " ".join(prompt.split()).casefold()
+        raw = "\x1f".join((provider.strip().lower(), model or "", prompt))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, text = entry
+        if expires_at < time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return text
+
+    def set(self, key: str, text: str) -> None:
+        self._entries[key] = (time.time() + self.ttl_seconds, text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
+
+    def load(self) -> None:
+        """Load unexpired entries from `path`, if configured and present."""
+
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.exception("Failed to load LLM response cache from %s", self.path)
+            return
+
+        now = time.time()
+        for key, expires_at, text in data.get("entries", []):
+            if expires_at > now:
+                self._entries[key] = (expires_at, text)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def save(self) -> None:
+        """Write unexpired entries to `path` atomically, if configured."""
+
+        if self.path is None:
+            return
+        now = time.time()
+        entries = [
+            [key, expires_at, text]
+            for key, (expires_at, text) in self._entries.items()
+            if expires_at > now
+        ]
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps({"entries": entries}), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            logger.exception("Failed to save LLM response cache to %s", self.path)
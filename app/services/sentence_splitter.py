@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import re
+
+# Sentence end: terminal punctuation (plus closing quotes/brackets) followed by
+# whitespace, or a line break.
+_BOUNDARY = re.compile(r"[.!?…]+[\"')\]”’]*\s+|\n+")
+
+# Words whose trailing period does not end a sentence.
+_ABBREVIATIONS = frozenset({"mr", "mrs", "ms", "dr", "st", "vs", "etc", "e.g", "i.e"})
+# Abbreviations only when a number follows ("No. 5"); "No. I can't." is two sentences.
+_NUMBER_ABBREVIATIONS = frozenset({"no"})
+
+
+class SentenceSplitter:
+    """Split streamed text into sentences as soon as each one is complete.
+
+    feed() returns the sentences finished by the new text; flush() returns
+    whatever is left at the end of the stream. Text running past
+    `max_chars` without a boundary is cut at the last space so speech can
+    start on long run-on output.
+    """
+
+    def __init__(self, *, max_chars: int = 300) -> None:
+        self.max_chars = max_chars
+        self._buf = ""
+
+    def feed(self, text: str) -> list[str]:
+        self._buf += text
+        sentences: list[str] = []
+        start = 0
+        for match in _BOUNDARY.finditer(self._buf):
+            candidate = self._buf[start:match.end()]
+            if "\n" not in match.group():
+                word = self._last_word(self._buf[start:match.start()])
+                if word in _ABBREVIATIONS:
+                    continue
+                if word in _NUMBER_ABBREVIATIONS:
+                    if match.end() == len(self._buf):
+                        break  # Wait for the next character to decide.
+                    if self._buf[match.end()].isdigit():
+                        continue
+            if candidate.strip():
+                sentences.append(candidate.strip())
+            start = match.end()
+        self._buf = self._buf[start:]
+
+        while len(self._buf) > self.max_chars:
+            cut = self._buf.rfind(" ", 0, self.max_chars)
+            if cut <= 0:
+                cut = self.max_chars
+            sentences.append(self._buf[:cut].strip())
+            self._buf = self._buf[cut:].lstrip()
+        return sentences
+
+    def flush(self) -> str | None:
+        rest, self._buf = self._buf.strip(), ""
+        return rest or None
+
+    @staticmethod
+    def _last_word(text: str) -> str:
+        words = text.rsplit(None, 1)
+        return words[-1].lower().rstrip(".") if words else ""
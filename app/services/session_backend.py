@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Rough per-message overhead (dict, datetime, role string) for memory accounting.
+_MESSAGE_OVERHEAD_BYTES = 200
+
+DEFAULT_STATE: dict[str, Any] = {
+    "current_topic": None,
+    "language": "en",
+    "persona": "default",
+    "last_response": None,
+}
+
+
+class SessionBackend(ABC):
+    """Storage contract for conversation sessions.
+
+    State is a small dict of fields; messages are append-only and read back
+    newest-last, optionally limited to the most recent `limit` entries so
+    callers never need a full-session round trip.
+    """
+
+    @abstractmethod
+    async def exists(self, session_id: str) -> bool:
+        """Return True if the session exists."""
+
+    @abstractmethod
+    async def get_state(self, session_id: str) -> dict[str, Any] | None:
+        """Return the session state (without messages), or None."""
+
+    @abstractmethod
+    async def set_state(self, session_id: str, values: dict[str, Any]) -> None:
+        """Create the session if needed and merge `values` into its state."""
+
+    @abstractmethod
+    async def update_state(self, session_id: str, values: dict[str, Any]) -> bool:
+        """Merge `values` into an existing session; False if it does not exist."""
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        """Remove the session and its messages."""
+
+    @abstractmethod
+    async def append_message(self, session_id: str, message: dict[str, Any]) -> bool:
+        """Append one message; False if the session does not exist."""
+
+    @abstractmethod
+    async def get_messages(
+        self, session_id: str, limit: int | None = None
+    ) -> list[dict[str, Any]] | None:
+        """Return the last `limit` messages (all if None), or None if missing."""
+
+    # Seconds between background sweeps; 0 disables the sweeper.
+    sweep_interval_seconds: float = 0
+    _sweeper: asyncio.Task | None = None
+
+    def stats(self) -> dict[str, int]:
+        """Return backend accounting for metrics export (optional)."""
+        return {}
+
+    async def sweep(self) -> int:
+        """Remove expired sessions and return how many were removed."""
+        return 0
+
+    async def startup(self) -> None:
+        """Start the background sweeper."""
+        if self.sweep_interval_seconds <= 0:
+            return
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._run_sweeper())
+
+    async def aclose(self) -> None:
+        """Stop the background sweeper."""
+        task, self._sweeper = self._sweeper, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run_sweeper(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval_seconds)
+            try:
+                removed = await self.sweep()
+            except Exception:
+                logger.exception("Session sweep failed")
+                continue
+            if removed:
+                logger.info("Evicted %d idle sessions", removed)
+
+
+class InMemorySessionBackend(SessionBackend):
+    """Per-process session store with LRU + idle-TTL eviction.
+
+    - At most `max_sessions` sessions are kept; the least recently used is
+      evicted first.
+    - Sessions idle for longer than `idle_ttl_seconds` expire on access and
+      are removed by the background sweeper.
+    - Each session keeps at most `max_messages` messages; older ones are
+      trimmed (system messages are kept when `keep_system_messages` is set).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_sessions: int,
+        idle_ttl_seconds: float,
+        max_messages: int,
+        keep_system_messages: bool,
+        sweep_interval_seconds: float,
+    ) -> None:
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_messages = max_messages
+        self.keep_system_messages = keep_system_messages
+        self.sweep_interval_seconds = sweep_interval_seconds
+
+        self.states: dict[str, dict[str, Any]] = {}
+        self.messages: dict[str, list[dict[str, Any]]] = {}
+        # session_id -> last access (monotonic), ordered least recently used first.
+        self._last_access: OrderedDict[str, float] = OrderedDict()
+        # session_id -> approximate bytes held by its messages
+        self._bytes: dict[str, int] = {}
+        self._total_messages = 0
+        self._total_bytes = 0
+        self.evictions: dict[str, int] = {"lru": 0, "ttl": 0}
+        self.trimmed_messages = 0
+
+    async def exists(self, session_id: str) -> bool:
+        return self._lookup(session_id) is not None
+
+    async def get_state(self, session_id: str) -> dict[str, Any] | None:
+        state = self._lookup(session_id)
+        return dict(state) if state is not None else None
+
+    async def set_state(self, session_id: str, values: dict[str, Any]) -> None:
+        state = self._lookup(session_id)
+        if state is None:
+            state = dict(DEFAULT_STATE)
+            self.states[session_id] = state
+            self.messages[session_id] = []
+            self._bytes[session_id] = 0
+            self._touch(session_id)
+        state.update(values)
+        self._evict_lru()
+
+    async def update_state(self, session_id: str, values: dict[str, Any]) -> bool:
+        state = self._lookup(session_id)
+        if state is None:
+            return False
+        state.update(values)
+        return True
+
+    async def delete(self, session_id: str) -> None:
+        self._remove(session_id)
+
+    async def append_message(self, session_id: str, message: dict[str, Any]) -> bool:
+        if self._lookup(session_id) is None:
+            return False
+
+        messages = self.messages[session_id]
+        messages.append(message)
+
+        added = _message_size(message)
+        self._bytes[session_id] += added
+        self._total_messages += 1
+        self._total_bytes += added
+
+        dropped = self._trim(messages)
+        if dropped:
+            freed = sum(_message_size(m) for m in dropped)
+            self._bytes[session_id] -= freed
+            self._total_messages -= len(dropped)
+            self._total_bytes -= freed
+        return True
+
+    async def get_messages(
+        self, session_id: str, limit: int | None = None
+    ) -> list[dict[str, Any]] | None:
+        if self._lookup(session_id) is None:
+            return None
+        messages = self.messages[session_id]
+        if limit is not None:
+            return messages[-limit:] if limit > 0 else []
+        return list(messages)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "sessions": len(self.states),
+            "messages": self._total_messages,
+            "approx_bytes": self._total_bytes,
+            "evicted_lru": self.evictions["lru"],
+            "evicted_ttl": self.evictions["ttl"],
+            "trimmed_messages": self.trimmed_messages,
+        }
+
+    async def sweep(self, batch_size: int = 500) -> int:
+        """Remove idle sessions, yielding to the event loop between batches."""
+
+        removed = 0
+        deadline = time.monotonic() - self.idle_ttl_seconds
+        while True:
+            batch = []
+            for session_id, last in self._last_access.items():
+                if last > deadline or len(batch) >= batch_size:
+                    break
+                batch.append(session_id)
+            if not batch:
+                return removed
+
+            for session_id in batch:
+                self._remove(session_id)
+                self.evictions["ttl"] += 1
+            removed += len(batch)
+            await asyncio.sleep(0)
+
+    def _lookup(self, session_id: str) -> dict[str, Any] | None:
+        state = self.states.get(session_id)
+        if state is None:
+            return None
+
+        now = time.monotonic()
+        if now - self._last_access.get(session_id, now) > self.idle_ttl_seconds:
+            self._remove(session_id)
+            self.evictions["ttl"] += 1
+            return None
+
+        self._touch(session_id, now)
+        return state
+
+    def _touch(self, session_id: str, now: float | None = None) -> None:
+        self._last_access[session_id] = time.monotonic() if now is None else now
+        self._last_access.move_to_end(session_id)
+
+    def _evict_lru(self) -> None:
+        while len(self.states) > self.max_sessions:
+            session_id = next(iter(self._last_access))
+            self._remove(session_id)
+            self.evictions["lru"] += 1
+
+    def _remove(self, session_id: str) -> None:
+        self.states.pop(session_id, None)
+        self._last_access.pop(session_id, None)
+        messages = self.messages.pop(session_id, None) or []
+        self._total_messages -= len(messages)
+        self._total_bytes -= self._bytes.pop(session_id, 0)
+
+    def _trim(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Trim `messages` in place to the cap and return what was dropped."""
+
+        overflow = len(messages) - self.max_messages
+        if overflow <= 0:
+            return []
+
+        if not self.keep_system_messages:
+            dropped = messages[:overflow]
+            del messages[:overflow]
+        else:
+            # Drop the oldest non-system messages, keeping system ones in place.
+            dropped = []
+            kept: list[dict[str, Any]] = []
+            for msg in messages:
+                if len(dropped) < overflow and msg.get("role") != "system":
+                    dropped.append(msg)
+                else:
+                    kept.append(msg)
+            if len(kept) > self.max_messages:
+                dropped.extend(kept[: len(kept) - self.max_messages])
+                kept = kept[len(kept) - self.max_messages:]
+            messages[:] = kept
+
+        self.trimmed_messages += len(dropped)
+        return dropped
+
+
+def _message_size(message: dict[str, Any]) -> int:
+    return len(str(message.get("content") or "")) + _MESSAGE_OVERHEAD_BYTES
+
+
+def new_message(role: str, content: str) -> dict[str, Any]:
+    return {
+        "role": role,
+        "content": content,
+        "timestamp": datetime.now(timezone.utc),
+    }
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+# Marks the end of a fanned-out token stream.
+_END = object()
+
+
+class _Call:
+    __slots__ = ("task", "waiters", "tokens", "queues")
+
+    def __init__(self) -> None:
+        self.task: asyncio.Task | None = None
+        self.waiters = 0
+        # Stream calls only: tokens seen so far and one queue per waiter.
+        self.tokens: list[str] = []
+        self.queues: list[asyncio.Queue] = []
+
+
+class SingleFlight:
+    """De-duplicate concurrent identical calls.
+
+    The first caller for a key starts the work; callers arriving while it is
+    in flight share its result (or token stream). When every waiter has
+    gone away, the shared work is cancelled.
+
+    Stream waiters each get a queue of at most `max_queue` tokens and the
+    shared stream waits for the slowest of them, so backpressure from a
+    slow client reaches the upstream call instead of growing memory.
+    """
+
+    def __init__(self, *, max_queue: int = 64) -> None:
+        self.max_queue = max_queue
+        self._calls: dict[Hashable, _Call] = {}
+        self._streams: dict[Hashable, _Call] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": len(self._calls) + len(self._streams),
+            "leaders": self.leaders,
+            "followers": self.followers,
+        }
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return fn()'s result, sharing one execution per key in flight."""
+
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call()
+            call.task = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(self._calls, key, call))
+            self.leaders += 1
+        else:
+            self.followers += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            self._leave(self._calls, key, call)
+
+    async def stream(
+        self,
+        key: Hashable,
+        fn: Callable[[Callable[[str], Any]], Awaitable[Any]],
+        on_token: Callable[[str], Any],
+    ) -> None:
+        """Run fn(on_token) once per key in flight and fan tokens out to every caller.
+
+        Callers joining late first receive the tokens already produced.
+        """
+
+        call = self._streams.get(key)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue)
+        replay: list[str] = []
+        if call is None:
+            call = _Call()
+            self._streams[key] = call
+            call.queues.append(queue)
+
+            async def broadcast(tok: str) -> None:
+                call.tokens.append(tok)
+                for q in list(call.queues):
+                    await q.put(tok)
+
+            async def run() -> None:
+                end: object = _END
+                try:
+                    await fn(broadcast)
+                except Exception as exc:
+                    # Delivered to every waiter instead of being raised here.
+                    end = exc
+                finally:
+                    # Unregister before signalling the end, so no caller can
+                    # join a finished stream and wait for tokens forever.
+                    self._forget(self._streams, key, call)
+                for q in list(call.queues):
+                    await q.put(end)
+
+            call.task = asyncio.ensure_future(run())
+            call.task.add_done_callback(lambda _: self._forget(self._streams, key, call))
+            self.leaders += 1
+        else:
+            # Replayed directly; new tokens queue up (bounded) meanwhile.
+            replay = list(call.tokens)
+            call.queues.append(queue)
+            self.followers += 1
+
+        call.waiters += 1
+        try:
+            for tok in replay:
+                result = on_token(tok)
+                if hasattr(result, "__await__"):
+                    await result
+            while True:
+                item = await queue.get()
+                if item is _END:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                result = on_token(item)
+                if hasattr(result, "__await__"):
+                    await result
+        finally:
+            call.queues.remove(queue)
+            # Unblock a broadcast waiting for room in this (abandoned) queue.
+            while not queue.empty():
+                queue.get_nowait()
+            self._leave(self._streams, key, call)
+
+    def _leave(self, calls: dict[Hashable, _Call], key: Hashable, call: _Call) -> None:
+        # The last waiter to leave (e.g. cancelled) cancels unfinished shared work.
+        call.waiters -= 1
+        if call.waiters == 0 and not call.task.done():
+            self._forget(calls, key, call)
+            call.task.cancel()
+
+    @staticmethod
+    def _forget(calls: dict[Hashable, _Call], key: Hashable, call: _Call) -> None:
+        if calls.get(key) is call:
+            del calls[key]
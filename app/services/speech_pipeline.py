@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import Any, AsyncIterator, NamedTuple
+
+from app.core.tracing import tracer
+from app.providers.speech_provider import SpeechProvider
+
+# Marks the end of the sentence sequence.
+_END = object()
+
+
+class SpeechChunk(NamedTuple):
+    index: int
+    text: str
+    audio: bytes
+    mime_type: str
+    voice: str | None
+
+
+class SpeechPipeline:
+    """Synthesize sentences concurrently and return the audio in sentence order.
+
+    At most `concurrency` synthesis calls run at once. feed() waits once
+    `concurrency` sentences are in flight or waiting to be read, so a slow
+    reader (or slow TTS) also slows the text producer down.
+    """
+
+    def __init__(
+        self,
+        provider: SpeechProvider,
+        *,
+        concurrency: int,
+        language: str | None = None,
+        voice: str | None = None,
+        output_format: str | None = None,
+        request_id: str | None = None,
+    ) -> None:
+        self.provider = provider
+        self.language = language
+        self.voice = voice
+        self.output_format = output_format
+        self.request_id = request_id
+        self._slots = asyncio.Semaphore(max(1, concurrency))
+        # Synthesis tasks in sentence order; bounded to cap buffered audio.
+        self._pending: asyncio.Queue[Any] = asyncio.Queue(maxsize=max(1, concurrency) * 2)
+        self._count = 0
+
+    async def feed(self, sentence: str) -> None:
+        index = self._count
+        self._count += 1
+        task = asyncio.ensure_future(self._synthesize(index, sentence))
+        try:
+            await self._pending.put(task)
+        except BaseException:
+            task.cancel()
+            raise
+
+    async def close(self) -> None:
+        await self._pending.put(_END)
+
+    async def chunks(self) -> AsyncIterator[SpeechChunk]:
+        """Yield synthesized chunks in order until close()."""
+
+        try:
+            while True:
+                task = await self._pending.get()
+                if task is _END:
+                    return
+                yield await task
+        finally:
+            # Reader gone or a synthesis failed: stop the remaining work.
+            while not self._pending.empty():
+                task = self._pending.get_nowait()
+                if task is not _END:
+                    task.cancel()
+                    with contextlib.suppress(BaseException):
+                        await task
+
+    async def _synthesize(self, index: int, sentence: str) -> SpeechChunk:
+        # Includes the wait for a synthesis slot.
+        with tracer.span("voice.sentence", index=index, chars=len(sentence)):
+            async with self._slots:
+                audio, mime, voice_used, _ = await self.provider.synthesize_text(
+                    text=sentence,
+                    language=self.language,
+                    voice=self.voice,
+                    request_id=f"{self.request_id}-{index}" if self.request_id else None,
+                    output_format=self.output_format,
+                )
+        return SpeechChunk(index, sentence, audio, mime, voice_used)
+
+
+async def speak_events(
+    events: AsyncIterator[tuple[str, Any]],
+    pipeline: SpeechPipeline,
+) -> AsyncIterator[tuple[str, Any]]:
+    """Add "audio" events (SpeechChunk) to an interaction event stream.
+
+    Each "sentence" event is handed to the pipeline as soon as it arrives;
+    audio is emitted in order as it becomes ready. "done" is held back until
+    all audio has been sent.
+    """
+
+    # Small so both readers wait for the consumer: a slow client holds back
+    # synthesis (and the text producer) instead of buffering the reply's audio.
+    out: asyncio.Queue[Any] = asyncio.Queue(maxsize=2)
+    done: list[tuple[str, Any]] = []
+
+    async def read_text() -> None:
+        try:
+            async for event, data in events:
+                if event == "done":
+                    done.append((event, data))
+                    continue
+                await out.put((event, data))
+                if event == "sentence":
+                    await pipeline.feed(data)
+        except Exception as exc:
+            await out.put(exc)
+        else:
+            await pipeline.close()
+
+    async def read_audio() -> None:
+        try:
+            async for chunk in pipeline.chunks():
+                await out.put(("audio", chunk))
+        except Exception as exc:
+            await out.put(exc)
+        else:
+            await out.put(_END)
+
+    tasks = [asyncio.create_task(read_text()), asyncio.create_task(read_audio())]
+    try:
+        while True:
+            item = await out.get()
+            if item is _END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        for item in done:
+            yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await events.aclose()
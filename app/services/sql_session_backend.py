@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.database import SessionLocal
+from app.models.session import ChatMessage, ChatSession
+from app.services.session_backend import DEFAULT_STATE, SessionBackend
+
+
+class SqlSessionBackend(SessionBackend):
+    """Session store shared across workers through the SQLAlchemy engine.
+
+    Messages are append-only rows; reads fetch only the most recent
+    `max_messages` (or fewer) so a turn never loads the whole history, and
+    each append deletes the oldest rows beyond `max_messages` (keeping
+    system messages when `keep_system_messages` is set), like the in-memory
+    backend. Blocking database calls run in a worker thread. Timestamps are
+    UTC; drivers that return naive datetimes are read as UTC.
+    """
+
+    def __init__(
+        self,
+        *,
+        idle_ttl_seconds: float,
+        max_messages: int,
+        sweep_interval_seconds: float,
+        keep_system_messages: bool = True,
+        session_factory: sessionmaker = SessionLocal,
+    ) -> None:
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_messages = max_messages
+        self.keep_system_messages = keep_system_messages
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self.session_factory = session_factory
+
+    async def exists(self, session_id: str) -> bool:
+        return await asyncio.to_thread(self._exists, session_id)
+
+    async def get_state(self, session_id: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self._get_state, session_id)
+
+    async def set_state(self, session_id: str, values: dict[str, Any]) -> None:
+        await asyncio.to_thread(self._set_state, session_id, values)
+
+    async def update_state(self, session_id: str, values: dict[str, Any]) -> bool:
+        return await asyncio.to_thread(self._update_state, session_id, values)
+
+    async def delete(self, session_id: str) -> None:
+        await asyncio.to_thread(self._delete, session_id)
+
+    async def append_message(self, session_id: str, message: dict[str, Any]) -> bool:
+        return await asyncio.to_thread(self._append_message, session_id, message)
+
+    async def get_messages(
+        self, session_id: str, limit: int | None = None
+    ) -> list[dict[str, Any]] | None:
+        return await asyncio.to_thread(self._get_messages, session_id, limit)
+
+    async def sweep(self) -> int:
+        return await asyncio.to_thread(self._sweep)
+
+    def _cutoff(self) -> datetime:
+        return _now() - timedelta(seconds=self.idle_ttl_seconds)
+
+    def _live(self, db: Session, session_id: str) -> ChatSession | None:
+        row = db.get(ChatSession, session_id)
+        if row is None or _as_utc(row.updated_at) < self._cutoff():
+            return None
+        return row
+
+    def _exists(self, session_id: str) -> bool:
+        with self.session_factory() as db:
+            return self._live(db, session_id) is not None
+
+    def _get_state(self, session_id: str) -> dict[str, Any] | None:
+        with self.session_factory() as db:
+            row = self._live(db, session_id)
+            return dict(row.state or {}) if row is not None else None
+
+    def _set_state(self, session_id: str, values: dict[str, Any]) -> None:
+        try:
+            self._upsert(session_id, values)
+        except IntegrityError:
+            # Another worker created the session concurrently; merge into it.
+            self._upsert(session_id, values)
+
+    def _upsert(self, session_id: str, values: dict[str, Any]) -> None:
+        with self.session_factory() as db:
+            row = db.get(ChatSession, session_id)
+            now = _now()
+            if row is None:
+                db.add(
+                    ChatSession(
+                        id=session_id,
+                        state={**DEFAULT_STATE, **values},
+                        updated_at=now,
+                    )
+                )
+            elif _as_utc(row.updated_at) < self._cutoff():
+                # Expired but not yet swept: start over as a fresh session.
+                db.execute(delete(ChatMessage).where(ChatMessage.session_id == session_id))
+                row.state = {**DEFAULT_STATE, **values}
+                row.updated_at = now
+            else:
+                # Assign a new dict so the JSON column is flagged dirty.
+                row.state = {**(row.state or {}), **values}
+                row.updated_at = now
+            db.commit()
+
+    def _update_state(self, session_id: str, values: dict[str, Any]) -> bool:
+        with self.session_factory() as db:
+            row = self._live(db, session_id)
+            if row is None:
+                return False
+            row.state = {**(row.state or {}), **values}
+            row.updated_at = _now()
+            db.commit()
+            return True
+
+    def _delete(self, session_id: str) -> None:
+        with self.session_factory() as db:
+            db.execute(delete(ChatMessage).where(ChatMessage.session_id == session_id))
+            db.execute(delete(ChatSession).where(ChatSession.id == session_id))
+            db.commit()
+
+    def _append_message(self, session_id: str, message: dict[str, Any]) -> bool:
+        with self.session_factory() as db:
+            touched = db.execute(
+                update(ChatSession)
+                .where(ChatSession.id == session_id, ChatSession.updated_at >= self._cutoff())
+                .values(updated_at=_now())
+            )
+            if touched.rowcount == 0:
+                db.rollback()
+                return False
+
+            db.add(
+                ChatMessage(
+                    session_id=session_id,
+                    role=message["role"],
+                    content=message["content"],
+                    created_at=message["timestamp"],
+                )
+            )
+            db.flush()
+            self._trim(db, session_id)
+            db.commit()
+            return True
+
+    def _trim(self, db: Session, session_id: str) -> None:
+        """Delete the oldest messages beyond `max_messages`."""
+
+        total = db.scalar(
+            select(func.count()).select_from(ChatMessage).where(ChatMessage.session_id == session_id)
+        )
+        overflow = (total or 0) - self.max_messages
+        if overflow <= 0:
+            return
+
+        oldest = (
+            select(ChatMessage.id)
+            .where(ChatMessage.session_id == session_id)
+            .order_by(ChatMessage.id)
+        )
+        ids: list[int] = []
+        if self.keep_system_messages:
+            ids = list(db.scalars(oldest.where(ChatMessage.role != "system").limit(overflow)))
+        if len(ids) < overflow:
+            # Only system messages left to drop (or they are not kept).
+            rest = oldest.where(ChatMessage.id.not_in(ids)) if ids else oldest
+            ids.extend(db.scalars(rest.limit(overflow - len(ids))))
+        db.execute(delete(ChatMessage).where(ChatMessage.id.in_(ids)))
+
+    def _get_messages(self, session_id: str, limit: int | None) -> list[dict[str, Any]] | None:
+        limit = self.max_messages if limit is None else min(limit, self.max_messages)
+
+        with self.session_factory() as db:
+            if self._live(db, session_id) is None:
+                return None
+            if limit <= 0:
+                return []
+
+            rows = db.execute(
+                select(ChatMessage.role, ChatMessage.content, ChatMessage.created_at)
+                .where(ChatMessage.session_id == session_id)
+                .order_by(ChatMessage.id.desc())
+                .limit(limit)
+            ).all()
+
+        return [
+            {"role": role, "content": content, "timestamp": _as_utc(created_at)}
+            for role, content, created_at in reversed(rows)
+        ]
+
+    def _sweep(self) -> int:
+        cutoff = self._cutoff()
+        with self.session_factory() as db:
+            expired = select(ChatSession.id).where(ChatSession.updated_at < cutoff)
+            db.execute(delete(ChatMessage).where(ChatMessage.session_id.in_(expired)))
+            removed = db.execute(
+                delete(ChatSession).where(ChatSession.updated_at < cutoff)
+            ).rowcount
+            db.commit()
+            return removed or 0
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite and MySQL drop the offset; stored values are always UTC.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
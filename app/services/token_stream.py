@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, AsyncIterator
+
+from starlette.requests import Request
+
+from app.core.metrics import registry, stream_chars, stream_tokens
+
+# Upper bounds of the frames-per-response histogram buckets.
+FRAME_BUCKETS: tuple[int, ...] = (1, 2, 5, 10, 25, 50, 100, 250, 500)
+
+stream_frames = registry.histogram(
+    "bot_backend_llm_stream_frames",
+    "SSE frames sent per streamed response",
+    buckets=FRAME_BUCKETS,
+)
+
+# Marks the end of a token stream.
+_END = object()
+
+# SSE comment frame sent to keep idle connections (and proxies) alive.
+HEARTBEAT = b": ping\n\n"
+
+
+def sse_event(data: str, event: str | None = None) -> bytes:
+    """Encode one SSE event; multi-line data becomes several `data:` lines."""
+
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+async def wait_for_disconnect(request: Request) -> None:
+    """Return when the client of a streaming response disconnects.
+
+    Only valid once the request body has been read: the next ASGI message is
+    then the disconnect, which arrives without waiting for a failed write.
+    """
+
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+class StreamStats:
+    """Process-wide counters for token streams (exported via /metrics)."""
+
+    def __init__(self) -> None:
+        self.active: set[TokenStream] = set()
+        self.completed = 0
+        self.disconnected = 0
+        self.backpressure_waits = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(s.queue.qsize() for s in self.active)
+
+    def observe_frames(self, frames: int) -> None:
+        stream_frames.observe((), frames)
+
+
+stream_stats = StreamStats()
+
+
+class TokenStream:
+    """Bounded relay from a token producer to a streaming response.
+
+    put() waits while `max_queue` tokens are buffered, so a slow client
+    slows the producer down instead of growing memory. frames() yields
+    tokens coalesced into chunks of up to `frame_max_chars`, gathering for
+    at most `frame_max_delay` seconds (the first chunk is sent at once),
+    and None as a heartbeat after `heartbeat_seconds` without output.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_queue: int,
+        frame_max_chars: int,
+        frame_max_delay: float,
+        heartbeat_seconds: float,
+        stats: StreamStats | None = None,
+    ) -> None:
+        self.queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=max(1, max_queue))
+        self.frame_max_chars = frame_max_chars
+        self.frame_max_delay = frame_max_delay
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stats = stats or stream_stats
+        self.frames_sent = 0
+        self.aborted = False
+        self._error: BaseException | None = None
+
+    async def put(self, token: str) -> None:
+        stream_tokens.inc()
+        stream_chars.inc(amount=len(token))
+        if self.queue.full():
+            self.stats.backpressure_waits += 1
+        await self.queue.put(token)
+
+    async def close(self, error: BaseException | None = None) -> None:
+        self._error = error
+        await self.queue.put(_END)
+
+    def abort(self) -> None:
+        """End the stream now, dropping buffered tokens (e.g. the client went away)."""
+        self.aborted = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(_END)
+
+    async def frames(self) -> AsyncIterator[str | None]:
+        """Yield coalesced text chunks, or None for a heartbeat, until close()."""
+
+        self.stats.active.add(self)
+        try:
+            done = False
+            while not done:
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout=self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if item is _END:
+                    break
+
+                parts = [item]
+                size = len(item)
+                if self.frames_sent:
+                    deadline = time.monotonic() + self.frame_max_delay
+                    while size < self.frame_max_chars:
+                        remaining = deadline - time.monotonic()
+                        try:
+                            item = (
+                                self.queue.get_nowait()
+                                if remaining <= 0 or not self.queue.empty()
+                                else await asyncio.wait_for(self.queue.get(), timeout=remaining)
+                            )
+                        except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                            break
+                        if item is _END:
+                            done = True
+                            break
+                        parts.append(item)
+                        size += len(item)
+
+                self.frames_sent += 1
+                yield "".join(parts)
+
+            if self._error is not None:
+                raise self._error
+            if not self.aborted:
+                self.stats.completed += 1
+        finally:
+            self.stats.active.discard(self)
+            self.stats.observe_frames(self.frames_sent)
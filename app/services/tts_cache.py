@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import struct
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from app.core import config
+from app.services.single_flight import SingleFlight
+
+if TYPE_CHECKING:
+    from app.providers.speech_provider import SpeechProvider
+
+logger = logging.getLogger(__name__)
+
+# Disk entry layout: 4-byte big-endian header length, JSON header, audio bytes.
+_HEADER_LEN = struct.Struct(">I")
+
+
+class CachedAudio(NamedTuple):
+    audio: bytes
+    mime_type: str
+    voice: str | None
+
+
+class TTSCache:
+    """Content-addressed cache of synthesized audio with memory and disk tiers.
+
+    Keys hash (provider, voice, language, output format, text), using the
+    values the provider resolves rather than the caller's (possibly empty)
+    arguments. The memory tier is an LRU bounded by `memory_max_bytes`. The
+    optional disk tier (`disk_dir`) keeps one file per entry and evicts
+    least recently used files beyond `disk_max_bytes`; disk hits are
+    promoted to memory. Disk I/O runs in a worker thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        memory_max_bytes: int,
+        disk_dir: str | None = None,
+        disk_max_bytes: int = 0,
+    ) -> None:
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = disk_max_bytes
+
+        self._memory: OrderedDict[str, CachedAudio] = OrderedDict()
+        self.memory_bytes = 0
+        # key -> file size, least recently used first
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self.disk_bytes = 0
+
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+        self.evictions = {"memory": 0, "disk": 0}
+
+    @staticmethod
+    def key(
+        provider: str,
+        text: str,
+        *,
+        voice: str | None,
+        language: str | None,
+        output_format: str | None,
+    ) -> str:
+        raw = "\x1f".join((provider, voice or "", language or "", output_format or "", text.strip()))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def stats(self) -> dict[str, float]:
+        hits = self.hits["memory"] + self.hits["disk"]
+        lookups = hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self.memory_bytes,
+            "disk_entries": len(self._disk),
+            "disk_bytes": self.disk_bytes,
+            "memory_hits": self.hits["memory"],
+            "disk_hits": self.hits["disk"],
+            "misses": self.misses,
+            "memory_evictions": self.evictions["memory"],
+            "disk_evictions": self.evictions["disk"],
+            "hit_ratio": (hits / lookups) if lookups else 0.0,
+        }
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._memory or key in self._disk
+
+    async def get(self, key: str) -> CachedAudio | None:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            self.hits["memory"] += 1
+            return entry
+
+        if key in self._disk:
+            entry = await asyncio.to_thread(self._read, key)
+            if entry is not None:
+                self._disk.move_to_end(key)
+                self.hits["disk"] += 1
+                self._remember(key, entry)
+                return entry
+            await asyncio.to_thread(self._unlink, self._forget([key]))
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, entry: CachedAudio) -> None:
+        self._remember(key, entry)
+        if self.disk_dir is not None and key not in self._disk:
+            try:
+                size = await asyncio.to_thread(self._write, key, entry)
+            except OSError:
+                logger.exception("Failed to write TTS cache entry %s", key)
+                return
+            self._disk[key] = size
+            self.disk_bytes += size
+            evicted = self._evict_disk()
+            if evicted:
+                await asyncio.to_thread(self._unlink, evicted)
+
+    def load(self) -> None:
+        """Index existing disk entries (oldest first) so they survive restarts."""
+
+        if self.disk_dir is None:
+            return
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            files = sorted(
+                (p for p in self.disk_dir.iterdir() if p.suffix == ".tts"),
+                key=lambda p: p.stat().st_mtime,
+            )
+        except OSError:
+            logger.exception("Failed to index TTS cache directory %s", self.disk_dir)
+            return
+        for path in files:
+            size = path.stat().st_size
+            self._disk[path.stem] = size
+            self.disk_bytes += size
+        self._unlink(self._evict_disk())
+
+    def _remember(self, key: str, entry: CachedAudio) -> None:
+        size = len(entry.audio)
+        if size > self.memory_max_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self.memory_bytes -= len(old.audio)
+        self._memory[key] = entry
+        self.memory_bytes += size
+        while self.memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self.memory_bytes -= len(evicted.audio)
+            self.evictions["memory"] += 1
+
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.tts"
+
+    def _read(self, key: str) -> CachedAudio | None:
+        try:
+            with open(self._path(key), "rb") as f:
+                (header_len,) = _HEADER_LEN.unpack(f.read(_HEADER_LEN.size))
+                header = json.loads(f.read(header_len))
+                # Read straight into the bytes object that is cached and served.
+                return CachedAudio(f.read(), header["mime_type"], header.get("voice"))
+        except (OSError, ValueError, KeyError, struct.error):
+            logger.warning("Dropping unreadable TTS cache entry %s", key)
+            return None
+
+    def _write(self, key: str, entry: CachedAudio) -> int:
+        self.disk_dir.mkdir(parents=True, exist_ok=True)
+        header = json.dumps({"mime_type": entry.mime_type, "voice": entry.voice}).encode("utf-8")
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(_HEADER_LEN.pack(len(header)))
+            f.write(header)
+            f.write(entry.audio)
+        os.replace(tmp, path)
+        return _HEADER_LEN.size + len(header) + len(entry.audio)
+
+    def _evict_disk(self) -> list[str]:
+        """Drop least recently used disk entries over the size bound from the index."""
+
+        evicted = []
+        while self.disk_bytes > self.disk_max_bytes and self._disk:
+            evicted.extend(self._forget([next(iter(self._disk))]))
+            self.evictions["disk"] += 1
+        return evicted
+
+    def _forget(self, keys: list[str]) -> list[str]:
+        forgotten = []
+        for key in keys:
+            size = self._disk.pop(key, None)
+            if size is not None:
+                self.disk_bytes -= size
+                forgotten.append(key)
+        return forgotten
+
+    def _unlink(self, keys: list[str]) -> None:
+        for key in keys:
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                logger.exception("Failed to delete TTS cache entry %s", key)
+
+
+async def prewarm(provider: SpeechProvider, path: str, *, concurrency: int = 2) -> int:
+    """Synthesize each phrase in `path` (one per line) through `provider`.
+
+    `provider` is expected to be cache-backed, so phrases already cached
+    cost nothing. Returns the number of phrases that failed.
+    """
+
+    try:
+        phrases = [line.strip() for line in Path(path).read_text(encoding="utf-8").splitlines()]
+    except OSError:
+        logger.exception("Failed to read TTS prewarm phrases from %s", path)
+        return 0
+    phrases = [p for p in dict.fromkeys(phrases) if p and not p.startswith("#")]
+
+    slots = asyncio.Semaphore(concurrency)
+    failed = 0
+
+    async def warm(phrase: str) -> None:
+        nonlocal failed
+        async with slots:
+            try:
+                await provider.synthesize_text(text=phrase)
+            except Exception:
+                failed += 1
+                logger.warning("TTS prewarm failed for %r", phrase, exc_info=True)
+
+    await asyncio.gather(*(warm(p) for p in phrases))
+    logger.info("TTS cache prewarmed %d phrases (%d failed)", len(phrases), failed)
+    return failed
+
+
+tts_cache = (
+    TTSCache(
+        memory_max_bytes=config.TTS_CACHE_MEMORY_MAX_BYTES,
+        disk_dir=config.TTS_CACHE_DIR,
+        disk_max_bytes=config.TTS_CACHE_DISK_MAX_BYTES,
+    )
+    if config.TTS_CACHE_ENABLED
+    else None
+)
+
+# Shared across provider instances so concurrent misses for one phrase coalesce.
+tts_single_flight = SingleFlight()
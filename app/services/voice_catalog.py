@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+
+from pydantic import ValidationError
+
+from app.core import config
+from app.providers.speech_provider import SpeechProvider
+from app.schemas.voice import VoiceInfo
+
+logger = logging.getLogger(__name__)
+
+# Retry delay after a failed refresh while stale voices are still being served.
+_RETRY_SECONDS = 30.0
+
+
+class VoiceSnapshot:
+    """One fetched voice list, indexed by locale and gender, with pre-serialized JSON.
+
+    render() joins the per-voice JSON fragments serialized at refresh time,
+    so serving a (filtered) list does no per-item validation or encoding.
+    """
+
+    def __init__(self, voices: list[dict]) -> None:
+        self.items = [json.dumps(v, separators=(",", ":")).encode("utf-8") for v in voices]
+        # Lower-cased locale ("en-us") and language ("en") -> item positions.
+        self.by_locale: dict[str, list[int]] = {}
+        self.by_gender: dict[str, list[int]] = {}
+        for i, voice in enumerate(voices):
+            locale = (voice.get("locale") or "").lower()
+            if locale:
+                self.by_locale.setdefault(locale, []).append(i)
+                language = locale.split("-", 1)[0]
+                if language != locale:
+                    self.by_locale.setdefault(language, []).append(i)
+            gender = (voice.get("gender") or "").lower()
+            if gender:
+                self.by_gender.setdefault(gender, []).append(i)
+
+        self._rendered: dict[tuple[str | None, str | None], tuple[bytes, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def render(self, locale: str | None = None, gender: str | None = None) -> tuple[bytes, str]:
+        """Return (JSON body, ETag) for the voices matching the filters."""
+
+        key = (locale.lower() if locale else None, gender.lower() if gender else None)
+        cached = self._rendered.get(key)
+        if cached is not None:
+            return cached
+
+        positions: list[int] | range = range(len(self.items))
+        known = True
+        if key[0] is not None:
+            known = key[0] in self.by_locale
+            positions = self.by_locale.get(key[0], [])
+        if key[1] is not None:
+            known = known and key[1] in self.by_gender
+            wanted = set(self.by_gender.get(key[1], []))
+            positions = [i for i in positions if i in wanted]
+
+        body = b"[" + b",".join(self.items[i] for i in positions) + b"]"
+        rendered = (body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+        # Only index values from the catalogue are memoized, so arbitrary
+        # query strings cannot grow the cache.
+        if known:
+            self._rendered[key] = rendered
+        return rendered
+
+
+class VoiceCatalog:
+    """Per-provider voice list cache with stale-while-revalidate refresh.
+
+    The first request for a provider waits for the fetch; if it fails,
+    requests get None without calling upstream until the retry delay has
+    passed. After
+    `ttl_seconds` the cached snapshot is still served while one background
+    refresh replaces it; if that refresh fails the stale snapshot is kept
+    and retried later.
+    """
+
+    def __init__(self, *, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._snapshots: dict[str, VoiceSnapshot] = {}
+        self._refresh_at: dict[str, float] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    async def get(self, provider: SpeechProvider) -> VoiceSnapshot | None:
+        """Return the provider's voices, or None if they could not be fetched."""
+
+        snapshot = self._snapshots.get(provider.name)
+        if snapshot is None:
+            if time.monotonic() < self._refresh_at.get(provider.name, 0.0):
+                # The last fetch failed; wait out the retry delay before trying again.
+                return None
+            # Shielded: a cancelled request must not abort the shared fetch.
+            return await asyncio.shield(self._refresh_in_background(provider))
+        if time.monotonic() >= self._refresh_at.get(provider.name, 0.0):
+            self._refresh_in_background(provider)
+        return snapshot
+
+    def _refresh_in_background(self, provider: SpeechProvider) -> asyncio.Task:
+        task = self._refreshing.get(provider.name)
+        if task is None:
+            task = asyncio.create_task(self._refresh(provider))
+            self._refreshing[provider.name] = task
+            task.add_done_callback(lambda _: self._refreshing.pop(provider.name, None))
+        return task
+
+    async def _refresh(self, provider: SpeechProvider) -> VoiceSnapshot | None:
+        name = provider.name
+        try:
+            raw = await provider.list_voices()
+        except NotImplementedError:
+            raw = []
+        except Exception:
+            logger.warning("Failed to refresh voice list for %s", name, exc_info=True)
+            self._refresh_at[name] = time.monotonic() + min(self.ttl_seconds, _RETRY_SECONDS)
+            return self._snapshots.get(name)
+
+        voices: list[dict] = []
+        for item in raw:
+            if not isinstance(item, dict) or not item.get("name"):
+                continue
+            try:
+                voices.append(VoiceInfo(**item).model_dump())
+            except ValidationError:
+                continue
+
+        snapshot = VoiceSnapshot(voices)
+        self._snapshots[name] = snapshot
+        self._refresh_at[name] = time.monotonic() + self.ttl_seconds
+        return snapshot
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Return True if an If-None-Match header value matches `etag` (weak comparison)."""
+
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+voice_catalog = VoiceCatalog(ttl_seconds=config.VOICE_CATALOG_TTL_SECONDS)
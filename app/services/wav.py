@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import struct
+from typing import NamedTuple
+
+# Canonical 44-byte PCM WAV header (RIFF, fmt and data chunk headers).
+_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+HEADER_SIZE = _HEADER.size
+
+# Size placeholder for streamed WAV whose length is not known up front.
+STREAMING_SIZE = 0xFFFFFFFF
+
+_CHUNK = struct.Struct("<4sI")
+_FMT = struct.Struct("<HHIIHH")
+_PCM = 1
+
+
+class WavFormat(NamedTuple):
+    sample_rate_hz: int
+    channels: int
+    sample_width: int
+    # Byte offset of the PCM data and its declared size (None if streamed).
+    data_offset: int
+    data_size: int | None
+
+
+def wav_header(
+    sample_rate_hz: int,
+    pcm_bytes: int | None = None,
+    *,
+    channels: int = 1,
+    sample_width: int = 2,
+) -> bytes:
+    """Return a 44-byte PCM WAV header; `pcm_bytes=None` marks a streamed body."""
+
+    if pcm_bytes is None:
+        riff_size = data_size = STREAMING_SIZE
+    else:
+        riff_size, data_size = HEADER_SIZE - 8 + pcm_bytes, pcm_bytes
+    block_align = channels * sample_width
+    return _HEADER.pack(
+        b"RIFF",
+        riff_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        _PCM,
+        channels,
+        sample_rate_hz,
+        sample_rate_hz * block_align,
+        block_align,
+        sample_width * 8,
+        b"data",
+        data_size,
+    )
+
+
+def wav_frames(
+    pcm: bytes | bytearray | memoryview,
+    sample_rate_hz: int,
+    *,
+    channels: int = 1,
+    sample_width: int = 2,
+) -> tuple[bytes, memoryview]:
+    """Frame PCM as WAV without copying it: (44-byte header, view of `pcm`).
+
+    Send the two parts as an iterable body (or join them once if a single
+    bytes object is really needed).
+    """
+
+    view = memoryview(pcm).cast("B")
+    header = wav_header(sample_rate_hz, view.nbytes, channels=channels, sample_width=sample_width)
+    return header, view
+
+
+def parse_wav_header(data: bytes | bytearray) -> WavFormat | None:
+    """Parse a PCM WAV header from the start of `data`.
+
+    Returns None if more bytes are needed to reach the data chunk. Raises
+    ValueError for anything that is not uncompressed PCM WAV.
+    """
+
+    if len(data) < 12:
+        return None
+    riff, _, wave = struct.unpack_from("<4sI4s", data, 0)
+    if riff != b"RIFF" or wave != b"WAVE":
+        raise ValueError("not a RIFF/WAVE file")
+
+    fmt: tuple[int, int, int, int, int, int] | None = None
+    offset = 12
+    while offset + _CHUNK.size <= len(data):
+        chunk_id, size = _CHUNK.unpack_from(data, offset)
+        body = offset + _CHUNK.size
+        if chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("WAV data chunk precedes fmt chunk")
+            audio_format, channels, rate, _, _, bits = fmt
+            if audio_format != _PCM:
+                raise ValueError("WAV audio must be uncompressed PCM")
+            return WavFormat(
+                sample_rate_hz=rate,
+                channels=channels,
+                sample_width=bits // 8,
+                data_offset=body,
+                data_size=None if size in (0, STREAMING_SIZE) else size,
+            )
+        if chunk_id == b"fmt ":
+            if size < _FMT.size:
+                raise ValueError("WAV fmt chunk is too short")
+            if body + _FMT.size > len(data):
+                return None
+            fmt = _FMT.unpack_from(data, body)
+        # Chunks are padded to an even size.
+        offset = body + size + (size & 1)
+    return None
@@ -0,0 +1,76 @@
+"""Micro-benchmark: WAV framing via wave+BytesIO vs. header + memoryview.
+
+Usage: python scripts/bench_wav_framing.py [--mb 10] [--rounds 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+import time
+import tracemalloc
+import wave
+from pathlib import Path
+
+
+def _add_repo_root_to_path() -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    sys.path.insert(0, str(repo_root))
+
+
+def frame_with_wave(pcm: bytes, sample_rate_hz: int) -> list[bytes]:
+    # Previous approach: write the frames through wave into a BytesIO, then getvalue().
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate_hz)
+        wf.writeframes(pcm)
+    return [buf.getvalue()]
+
+
+def measure(fn, pcm: bytes, sample_rate_hz: int, rounds: int) -> tuple[float, int]:
+    """Return (mean seconds per call, peak bytes allocated during one call)."""
+
+    tracemalloc.start()
+    parts = fn(pcm, sample_rate_hz)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parts
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(pcm, sample_rate_hz)
+    return (time.perf_counter() - start) / rounds, peak
+
+
+def main() -> None:
+    _add_repo_root_to_path()
+    from app.services.wav import wav_frames
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=float, default=10.0, help="PCM payload size in MB")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    size = int(args.mb * 1_000_000) & ~1
+    pcm = bytes(size)
+    sample_rate_hz = 16000
+
+    old = frame_with_wave(pcm, sample_rate_hz)[0]
+    assert b"".join(wav_frames(pcm, sample_rate_hz)) == old, "framing mismatch"
+    del old
+
+    print(f"PCM payload: {size / 1e6:.1f} MB, {args.rounds} rounds")
+    print(f"{'method':<24}{'time/call':>12}{'peak alloc':>14}{'copies':>8}")
+    for label, fn in (
+        ("wave + BytesIO", frame_with_wave),
+        ("header + memoryview", wav_frames),
+    ):
+        seconds, peak = measure(fn, pcm, sample_rate_hz, args.rounds)
+        print(f"{label:<24}{seconds * 1e3:>10.3f}ms{peak / 1e6:>12.2f}MB{peak / size:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
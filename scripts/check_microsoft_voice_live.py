@@ -35,6 +35,7 @@ async def main() -> None:
     os.environ.setdefault("DATABASE_URL", "sqlite:///./local_test.db")
 
     from app.core import config
+    from app.core.http import http_clients
     from app.providers.microsoft_voice_live_provider import (
         MicrosoftVoiceLiveError,
         MicrosoftVoiceLiveProvider,
@@ -74,6 +75,8 @@ async def main() -> None:
         print(f"MicrosoftVoiceLiveError: {exc}")
     except Exception as exc:
         print(f"Unexpected error: {type(exc).__name__}: {exc}")
+    finally:
+        await http_clients.aclose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,4 @@
+import os
+
+# app.core.config refuses to load without a database URL; tests use in-memory SQLite.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
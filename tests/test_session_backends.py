@@ -0,0 +1,178 @@
+"""SessionBackend contract, run against both backends.
+
+The SQL backend uses an in-memory SQLite database as the stand-in for the
+shared store, so no external database is needed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models import session as _session_models  # noqa: F401  (registers the tables)
+from app.services.session_backend import DEFAULT_STATE, InMemorySessionBackend, new_message
+from app.services.sql_session_backend import SqlSessionBackend
+
+MAX_MESSAGES = 50
+
+
+def _memory_backend(idle_ttl_seconds: float) -> InMemorySessionBackend:
+    return InMemorySessionBackend(
+        max_sessions=100,
+        idle_ttl_seconds=idle_ttl_seconds,
+        max_messages=MAX_MESSAGES,
+        keep_system_messages=True,
+        sweep_interval_seconds=0,
+    )
+
+
+def _sql_backend(idle_ttl_seconds: float) -> SqlSessionBackend:
+    # One shared connection, usable from the worker threads the backend runs in.
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    return SqlSessionBackend(
+        idle_ttl_seconds=idle_ttl_seconds,
+        max_messages=MAX_MESSAGES,
+        sweep_interval_seconds=0,
+        session_factory=sessionmaker(autocommit=False, autoflush=False, bind=engine),
+    )
+
+
+@pytest.fixture(params=[_memory_backend, _sql_backend], ids=["memory", "sql"])
+def make_backend(request):
+    return request.param
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_set_state_creates_session_with_defaults(make_backend):
+    backend = make_backend(3600)
+
+    assert not run(backend.exists("s1"))
+    assert run(backend.get_state("s1")) is None
+
+    run(backend.set_state("s1", {"language": "fr"}))
+
+    assert run(backend.exists("s1"))
+    assert run(backend.get_state("s1")) == {**DEFAULT_STATE, "language": "fr"}
+    assert run(backend.get_messages("s1")) == []
+
+
+def test_update_state_merges_into_existing_session(make_backend):
+    backend = make_backend(3600)
+
+    assert run(backend.update_state("missing", {"persona": "x"})) is False
+    assert run(backend.get_state("missing")) is None
+
+    run(backend.set_state("s1", {}))
+    assert run(backend.update_state("s1", {"persona": "tutor"})) is True
+    assert run(backend.update_state("s1", {"last_response": "hi"})) is True
+
+    state = run(backend.get_state("s1"))
+    assert state["persona"] == "tutor"
+    assert state["last_response"] == "hi"
+    assert state["language"] == DEFAULT_STATE["language"]
+
+
+def test_append_message_is_append_only(make_backend):
+    backend = make_backend(3600)
+
+    assert run(backend.append_message("missing", new_message("user", "hi"))) is False
+
+    run(backend.set_state("s1", {}))
+    for i in range(5):
+        assert run(backend.append_message("s1", new_message("user", f"m{i}")))
+    before = run(backend.get_messages("s1"))
+
+    run(backend.append_message("s1", new_message("assistant", "reply")))
+    after = run(backend.get_messages("s1"))
+
+    assert [m["content"] for m in before] == [f"m{i}" for i in range(5)]
+    # Earlier messages are untouched; the new one is added last.
+    assert after[:-1] == before
+    assert (after[-1]["role"], after[-1]["content"]) == ("assistant", "reply")
+
+
+def test_get_messages_limit_returns_most_recent(make_backend):
+    backend = make_backend(3600)
+    run(backend.set_state("s1", {}))
+    for i in range(10):
+        run(backend.append_message("s1", new_message("user", f"m{i}")))
+
+    assert [m["content"] for m in run(backend.get_messages("s1", limit=3))] == ["m7", "m8", "m9"]
+    assert run(backend.get_messages("s1", limit=0)) == []
+    assert len(run(backend.get_messages("s1", limit=100))) == 10
+    assert run(backend.get_messages("missing", limit=3)) is None
+
+
+def test_delete_removes_session_and_messages(make_backend):
+    backend = make_backend(3600)
+    run(backend.set_state("s1", {}))
+    run(backend.append_message("s1", new_message("user", "hi")))
+
+    run(backend.delete("s1"))
+
+    assert not run(backend.exists("s1"))
+    assert run(backend.get_messages("s1")) is None
+    # Recreating starts from a clean session.
+    run(backend.set_state("s1", {}))
+    assert run(backend.get_messages("s1")) == []
+    # Deleting an unknown session is a no-op.
+    run(backend.delete("missing"))
+
+
+def test_idle_sessions_expire(make_backend):
+    backend = make_backend(0.2)
+    run(backend.set_state("idle", {}))
+    run(backend.append_message("idle", new_message("user", "hi")))
+    run(backend.set_state("active", {}))
+
+    time.sleep(0.15)
+    run(backend.append_message("active", new_message("user", "still here")))
+    time.sleep(0.15)
+
+    assert not run(backend.exists("idle"))
+    assert run(backend.get_messages("idle")) is None
+    assert run(backend.append_message("idle", new_message("user", "late"))) is False
+    assert run(backend.update_state("idle", {"persona": "x"})) is False
+    assert run(backend.exists("active"))
+
+    time.sleep(0.25)
+    assert run(backend.sweep()) >= 1
+    assert not run(backend.exists("active"))
+
+
+def test_append_trims_oldest_messages_keeping_system(make_backend):
+    backend = make_backend(3600)
+    run(backend.set_state("s1", {}))
+    run(backend.append_message("s1", new_message("system", "rules")))
+    for i in range(MAX_MESSAGES + 5):
+        run(backend.append_message("s1", new_message("user", f"m{i}")))
+
+    messages = run(backend.get_messages("s1"))
+    assert len(messages) == MAX_MESSAGES
+    assert messages[0]["content"] == "rules"
+    assert messages[1]["content"] == "m6"
+    assert messages[-1]["content"] == f"m{MAX_MESSAGES + 4}"
+
+
+def test_message_timestamps_are_utc(make_backend):
+    backend = make_backend(3600)
+    run(backend.set_state("s1", {}))
+    run(backend.append_message("s1", new_message("user", "hi")))
+
+    (message,) = run(backend.get_messages("s1"))
+    assert message["timestamp"].utcoffset() == timedelta(0)